@@ -2,8 +2,7 @@
 class AutomationError(Exception):
     
     def __init__(self, *args, **kwargs):
-        super(Exception, self).__init__(*args)
-        AutomationError.__init__(self, *args, **kwargs)
+        super(AutomationError, self).__init__(*args)
 
     def __str__(self):
         return "Automation error is occurred: {0}".format(self.args)
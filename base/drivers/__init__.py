@@ -1,3 +1,26 @@
 import os
+import importlib
 
 drivers_dir = os.path.abspath(os.path.dirname(__file__))
+
+# Public names and their modules, imported on first access so that config_definitions (which needs drivers_dir)
+# and api-only runs do not load selenium, webdriver-manager or testcontainers.
+_exports = {
+    "BrowserProfile": "base.drivers.browser_profiles",
+    "ContainerGrid": "base.drivers.container_grid",
+    "DriverPool": "base.drivers.driver_pool",
+    "DriverResolver": "base.drivers.driver_resolver",
+    "PlatformCapabilities": "base.drivers.platform_capabilities",
+    "WebDriverFactory": "base.drivers.webdriver_factory",
+}
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+    value = globals()[name] = getattr(importlib.import_module(_exports[name]), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
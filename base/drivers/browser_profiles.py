@@ -0,0 +1,136 @@
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from config_definitions import BaseConfig, boolean
+from base.automation_error import AutomationError
+from base.enums import Browsers
+from base.logger import logger, automation_logger
+
+
+class BrowserProfile:
+    """
+    Named set of browser start options read from the [PROFILE_<NAME>] section of config.cfg, e.g. fast (no images,
+    extensions, background work, blocked third party urls) or faithful (browser as users have it).
+    """
+
+    _profiles = {}
+
+    def __init__(self, name, headless=True, w3c=False, images=True, extensions=True, background_throttling=True,
+                 component_update=True, first_run=True, blocked_urls=()):
+        self.name = name
+        self.headless = headless
+        self.w3c = w3c
+        self.images = images
+        self.extensions = extensions
+        self.background_throttling = background_throttling
+        self.component_update = component_update
+        self.first_run = first_run
+        self.blocked_urls = list(blocked_urls)
+
+    def __repr__(self):
+        return "BrowserProfile({0!r})".format(self.name)
+
+    @classmethod
+    @automation_logger(logger)
+    def load(cls, name=None):
+        """
+        :param name: profile name, [PROFILES] default if None.
+        :return: BrowserProfile, read from config once per name.
+        """
+        name = (name or BaseConfig.BROWSER_PROFILE).lower()
+        profile = cls._profiles.get(name)
+        if profile is None:
+            section = "PROFILE_" + name.upper()
+            if not BaseConfig.has_section(section):
+                error = "No such " + name + " browser profile in config.cfg"
+                logger.error(error)
+                raise AutomationError(error)
+            flags = {option: BaseConfig.get(section, option, boolean) for option in (
+                'headless', 'w3c', 'images', 'extensions', 'background_throttling', 'component_update', 'first_run')}
+            blocked_urls = [url.strip() for url in BaseConfig.get(section, 'blocked_urls').split(',') if url.strip()]
+            profile = cls._profiles[name] = cls(name, blocked_urls=blocked_urls, **flags)
+        return profile
+
+    def chrome_options(self, options=None):
+        """
+        :param options: ChromeOptions to extend, new ones if None.
+        :return: ChromeOptions of the profile.
+        """
+        options = options or webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument('--headless')
+            options.add_argument('--disable-gpu')
+        options.add_argument('--no-sandbox')
+        options.add_experimental_option('w3c', self.w3c)
+        if not self.images:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        if not self.extensions:
+            options.add_argument('--disable-extensions')
+        if not self.background_throttling:
+            options.add_argument('--disable-background-timer-throttling')
+            options.add_argument('--disable-backgrounding-occluded-windows')
+            options.add_argument('--disable-renderer-backgrounding')
+        if not self.component_update:
+            options.add_argument('--disable-component-update')
+            options.add_argument('--disable-background-networking')
+            options.add_argument('--disable-default-apps')
+            options.add_argument('--disable-sync')
+        if not self.first_run:
+            options.add_argument('--no-first-run')
+            options.add_argument('--no-default-browser-check')
+        return options
+
+    def firefox_options(self, options=None):
+        """
+        :param options: FirefoxOptions to extend, new ones if None.
+        :return: FirefoxOptions of the profile.
+        """
+        options = options or webdriver.FirefoxOptions()
+        options.headless = self.headless
+        if not self.images:
+            options.set_preference('permissions.default.image', 2)
+        if not self.extensions:
+            options.set_preference('extensions.enabledScopes', 0)
+        if not self.background_throttling:
+            options.set_preference('dom.min_background_timeout_value', 4)
+            options.set_preference('dom.timeout.enable_budget_timer_throttling', False)
+        if not self.component_update:
+            options.set_preference('app.update.auto', False)
+            options.set_preference('extensions.update.enabled', False)
+            options.set_preference('browser.search.update', False)
+            options.set_preference('network.captive-portal-service.enabled', False)
+        if not self.first_run:
+            options.set_preference('browser.startup.homepage_override.mstone', 'ignore')
+            options.set_preference('startup.homepage_welcome_url', 'about:blank')
+            options.set_preference('datareporting.policy.dataSubmissionEnabled', False)
+        return options
+
+    def options(self, browser_name):
+        """
+        :param browser_name: Chrome or Firefox.
+        :return: options of the profile for browser, e.g. for Remote sessions.
+        """
+        if browser_name.lower() == Browsers.FIREFOX.value:
+            return self.firefox_options()
+        return self.chrome_options()
+
+    @automation_logger(logger)
+    def apply(self, driver):
+        """
+        Settings applied to a started browser: blocked url patterns through CDP where the driver supports it.
+        :param driver: web_driver instance.
+        :return: web_driver instance.
+        """
+        if not self.blocked_urls:
+            return driver
+        execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+        if execute_cdp_cmd is None:
+            logger.debug("Blocked urls of {0} profile are not supported by {1}".format(self.name, driver.name))
+            return driver
+        try:
+            execute_cdp_cmd("Network.enable", {})
+            execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+        except WebDriverException as e:
+            logger.error(F"{e.__class__.__name__} blocking urls of {self.name} profile failed: {e}")
+        return driver
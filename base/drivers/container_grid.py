@@ -0,0 +1,299 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import defaultdict, namedtuple
+
+import requests
+
+from config_definitions import BaseConfig, optional
+from base import tests_base
+from base.automation_error import AutomationError
+from base.drivers.browser_profiles import BrowserProfile
+from base.instruments.command_timer import CommandTimer
+from base.logger import logger, automation_logger
+from base.utils.file_lock import FileLock
+from base.utils.lazy_import import LazyImport
+
+Remote = LazyImport("selenium.webdriver", "Remote")
+
+StartTiming = namedtuple("StartTiming", ["browser", "container", "kind", "seconds"])
+
+LABEL = "automation.grid"
+
+
+class GridNode:
+    """
+    One browser container of ContainerGrid with its session bookkeeping.
+    """
+
+    def __init__(self, browser_name, container, name, config_hash, capacity):
+        self.browser_name = browser_name
+        self.container = container
+        self.name = name
+        self.config_hash = config_hash
+        self.capacity = capacity
+        self.active = 0
+        self.healthy = False
+        self.checked_at = 0.0
+        self.url = None
+
+    @property
+    def free(self):
+        return self.capacity - self.active if self.healthy else 0
+
+
+class ContainerGrid:
+    """
+    Fixed set of Selenium browser containers (testcontainers BrowserWebDriverContainer on the local Docker daemon)
+    started once per run on first use of a browser and shared by Remote sessions, each new session going to the
+    healthy container with most free capacity ([GRID] containers x sessions per browser).
+    With [GRID] reuse containers are labeled with a hash of their configuration and left running at shutdown, the
+    next run attaches to them (warm start) instead of creating new ones (cold start); report() gives both timings.
+    """
+
+    lock_file = os.path.join(tests_base, "repository", "container_grid.lock")
+
+    def __init__(self, containers=None, sessions=None, reuse=None, start_timeout=None, health_interval=None):
+        """
+        :param containers: containers per browser, [GRID] containers by default.
+        :param sessions: concurrent sessions per container, [GRID] sessions by default.
+        :param reuse: keep containers between runs, [GRID] reuse by default.
+        :param start_timeout: seconds for a container to become healthy, [GRID] start_timeout by default.
+        :param health_interval: seconds a health check is trusted for, [GRID] health_interval by default.
+        """
+        self.containers = containers or BaseConfig.GRID_CONTAINERS
+        self.sessions = sessions or BaseConfig.GRID_SESSIONS
+        self.reuse = BaseConfig.GRID_REUSE if reuse is None else reuse
+        self.start_timeout = start_timeout or BaseConfig.GRID_START_TIMEOUT
+        self.health_interval = health_interval or BaseConfig.GRID_HEALTH_INTERVAL
+        self.timings = []
+        self._nodes = {}
+        self._drivers = {}
+        self._starting = defaultdict(threading.Lock)
+        self._condition = threading.Condition()
+
+    @automation_logger(logger)
+    def start(self, browser_name):
+        """
+        Start (or attach to) the containers of browser, in parallel, once per grid.
+        :param browser_name: Chrome or Firefox.
+        :return: list of GridNode.
+        """
+        browser_name = browser_name.lower()
+        with self._starting[browser_name]:
+            if browser_name not in self._nodes:
+                nodes = [self._node(browser_name, index) for index in range(self.containers)]
+                threads = [threading.Thread(target=self._start_node, args=(node,), daemon=True) for node in nodes]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                if not any(node.healthy for node in nodes):
+                    error = "No healthy " + browser_name + " container in grid"
+                    logger.error(error)
+                    raise AutomationError(error)
+                with self._condition:
+                    self._nodes[browser_name] = nodes
+        return self._nodes[browser_name]
+
+    @automation_logger(logger)
+    def get_driver(self, browser_name, profile=None):
+        """
+        Remote session on the container of browser with most free capacity, waiting for one to free up.
+        Driver factory compatible with DriverPool: driver_pool.factory = container_grid.get_driver
+        :param browser_name: Chrome or Firefox.
+        :param profile: browser profile name from config.cfg, [PROFILES] default if None.
+        :return: web driver, quit() gives its capacity back.
+        """
+        browser_name = browser_name.lower()
+        nodes = self.start(browser_name)
+        profile = BrowserProfile.load(profile)
+        deadline = time.perf_counter() + BaseConfig.POOL_LEASE_TIMEOUT
+        while True:
+            node = self._acquire(nodes, deadline)
+            if time.perf_counter() - node.checked_at > self.health_interval and not self._check(node):
+                self._release(node)
+                self._recover(node)
+                continue
+            try:
+                driver = Remote(command_executor=node.url, desired_capabilities=dict(node.container.capabilities),
+                                options=profile.options(browser_name))
+            except Exception as e:
+                logger.error(F"{e.__class__.__name__} session on {node.name} failed: {e}")
+                self._release(node)
+                if self._check(node):
+                    raise
+                self._recover(node)
+                continue
+            break
+        quit_session = driver.quit
+
+        def quit_():
+            try:
+                quit_session()
+            finally:
+                leased = self._drivers.pop(id(driver), None)
+                if leased is not None:
+                    self._release(leased)
+
+        driver.quit = quit_
+        CommandTimer.install(driver)
+        self._drivers[id(driver)] = node
+        return driver
+
+    @automation_logger(logger)
+    def report(self):
+        """
+        :return: start timings (cold, warm, resumed, restarted) in seconds and the state of every container.
+        """
+        by_kind = defaultdict(list)
+        for timing in self.timings:
+            by_kind[timing.kind].append(timing.seconds)
+        report = {kind: {"count": len(seconds), "avg": sum(seconds) / len(seconds), "max": max(seconds)}
+                  for kind, seconds in by_kind.items()}
+        with self._condition:
+            report["containers"] = [{"name": node.name, "healthy": node.healthy, "active": node.active,
+                                     "capacity": node.capacity} for nodes in self._nodes.values() for node in nodes]
+        return report
+
+    @automation_logger(logger)
+    def shutdown(self):
+        """
+        Leave reusable containers running for the next run, remove the others.
+        :return: final grid report.
+        """
+        report = self.report()
+        with self._condition:
+            nodes = [node for nodes in self._nodes.values() for node in nodes]
+            self._nodes.clear()
+        for node in nodes:
+            if self.reuse:
+                # Detach, so that testcontainers does not remove the container when the object is collected.
+                node.container._container = None
+                continue
+            try:
+                node.container.stop()
+            except Exception as e:
+                logger.error(F"{e.__class__.__name__} failed to remove container {node.name}: {e}")
+        return report
+
+    @classmethod
+    @automation_logger(logger)
+    def purge(cls):
+        """
+        Remove all grid containers left running by previous runs.
+        :return: number of removed containers.
+        """
+        import docker
+        client = docker.from_env()
+        containers = client.containers.list(all=True, filters={"label": LABEL})
+        for container in containers:
+            container.remove(force=True)
+        return len(containers)
+
+    def _node(self, browser_name, index):
+        from base.drivers.webdriver_factory import WebDriverFactory
+        container = WebDriverFactory.get_webdriver_container(
+            browser_name, BaseConfig.get('GRID', 'image_' + browser_name, optional))
+        for variable in ("NODE_MAX_SESSION", "NODE_MAX_INSTANCES", "SE_NODE_MAX_SESSIONS"):
+            container.with_env(variable, str(self.sessions))
+        container.with_env("SE_NODE_OVERRIDE_MAX_SESSIONS", "true")
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        config = {"image": container.image, "env": container.env, "ports": sorted(container.ports),
+                  "shm_size": BaseConfig.GRID_SHM_SIZE, "browser": browser_name, "worker": worker, "index": index}
+        config_hash = hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()
+        name = "automation-grid-{0}-{1}-{2}-{3}".format(browser_name, worker, index, config_hash[:12])
+        container.with_name(name).with_kwargs(
+            labels={LABEL: "true", LABEL + ".hash": config_hash, LABEL + ".browser": browser_name},
+            shm_size=BaseConfig.GRID_SHM_SIZE)
+        return GridNode(browser_name, container, name, config_hash, self.sessions)
+
+    def _start_node(self, node):
+        start = time.perf_counter()
+        try:
+            with FileLock(self.lock_file):
+                kind = self._attach(node) if self.reuse else None
+                if kind is None:
+                    kind = "cold"
+                    node.container.start()
+            node.url = node.container.get_connection_url()
+            if not self._wait_healthy(node):
+                logger.error("Container {0} is not healthy after {1}s".format(node.name, self.start_timeout))
+                return
+        except Exception as e:
+            logger.error(F"{e.__class__.__name__} failed to start container {node.name}: {e}")
+            return
+        self.timings.append(StartTiming(node.browser_name, node.name, kind, time.perf_counter() - start))
+        logger.info("Container {0} {1} start in {2:.2f}s".format(node.name, kind, self.timings[-1].seconds))
+
+    @staticmethod
+    def _attach(node):
+        client = node.container.get_docker_client().client
+        found = client.containers.list(all=True, filters={"label": LABEL + ".hash=" + node.config_hash})
+        if not found:
+            return None
+        existing = found[0]
+        node.container._container = existing
+        if existing.status == "running":
+            return "warm"
+        existing.start()
+        return "resumed"
+
+    def _wait_healthy(self, node):
+        deadline = time.perf_counter() + self.start_timeout
+        while not self._check(node):
+            if time.perf_counter() > deadline:
+                return False
+            time.sleep(0.5)
+        return True
+
+    @staticmethod
+    def _check(node):
+        try:
+            response = requests.get(node.url + "/status", timeout=2)
+            node.healthy = response.ok and response.json().get("value", {}).get("ready", True) is not False
+        except (requests.RequestException, ValueError):
+            node.healthy = False
+        node.checked_at = time.perf_counter()
+        return node.healthy
+
+    def _recover(self, node):
+        logger.error("Container {0} is unhealthy, restarting it".format(node.name))
+        start = time.perf_counter()
+        try:
+            node.container.get_wrapped_container().restart(timeout=10)
+        except Exception as e:
+            logger.error(F"{e.__class__.__name__} failed to restart container {node.name}: {e}")
+        if self._wait_healthy(node):
+            self.timings.append(StartTiming(node.browser_name, node.name, "restarted", time.perf_counter() - start))
+        with self._condition:
+            self._condition.notify_all()
+
+    def _acquire(self, nodes, deadline):
+        with self._condition:
+            while True:
+                node = max(nodes, key=lambda candidate: candidate.free)
+                if node.free > 0:
+                    node.active += 1
+                    return node
+                if not any(candidate.healthy for candidate in nodes):
+                    error = "No healthy " + nodes[0].browser_name + " container in grid"
+                    logger.error(error)
+                    raise AutomationError(error)
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    error = "No free " + nodes[0].browser_name + " session in grid after " + \
+                            str(BaseConfig.POOL_LEASE_TIMEOUT) + "s"
+                    logger.error(error)
+                    raise AutomationError(error)
+                self._condition.wait(remaining)
+
+    def _release(self, node):
+        with self._condition:
+            node.active = max(0, node.active - 1)
+            self._condition.notify()
+
+
+container_grid = ContainerGrid()
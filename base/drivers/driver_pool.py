@@ -0,0 +1,230 @@
+import time
+import threading
+from collections import defaultdict, deque
+
+from config_definitions import BaseConfig
+from base.automation_error import AutomationError
+from base.instruments.browser import Browser
+from base.logger import logger, automation_logger
+
+
+class PooledSession:
+    """
+    Browser session owned by DriverPool together with its bookkeeping.
+    """
+
+    def __init__(self, driver, key):
+        self.driver = driver
+        self.key = key
+        self.uses = 0
+
+
+class PoolStats:
+    """
+    Counters of DriverPool: hits (idle session lent), misses (new session spawned), recycled/discarded sessions
+    and lease wait times in seconds.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.spawned = 0
+        self.recycled = 0
+        self.discarded = 0
+        self.lease_waits = []
+
+    def report(self):
+        waits = sorted(self.lease_waits)
+        report = {"leases": len(waits), "hits": self.hits, "misses": self.misses, "spawned": self.spawned,
+                  "recycled": self.recycled, "discarded": self.discarded}
+        if waits:
+            report.update({"wait_min": waits[0], "wait_max": waits[-1], "wait_avg": sum(waits) / len(waits),
+                           "wait_p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))]})
+        return report
+
+
+def _start_driver(browser_name, **options):
+    from base.drivers.webdriver_factory import WebDriverFactory
+    return WebDriverFactory.get_driver(browser_name, **options)
+
+
+class DriverPool:
+    """
+    Pool of warm browser sessions keyed by browser name and driver options.
+    Sessions are lent out by lease(), reset and returned by release() and recycled after max_uses leases or as soon
+    as they look unhealthy.
+    """
+
+    def __init__(self, factory=None, size=None, max_uses=None, lease_timeout=None):
+        self.factory = factory or _start_driver
+        self.size = size or BaseConfig.POOL_SIZE
+        self.max_uses = max_uses or BaseConfig.POOL_MAX_USES
+        self.lease_timeout = lease_timeout or BaseConfig.POOL_LEASE_TIMEOUT
+        self.stats = PoolStats()
+        self._idle = defaultdict(deque)
+        self._alive = defaultdict(int)
+        self._leased = {}
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def key_for(browser_name, **options):
+        """
+        Build hashable pool key.
+        :param browser_name: Chrome, Firefox, Edge or IE
+        :param options: keyword options passed to the driver factory.
+        :return: tuple key.
+        """
+        return browser_name.lower(), tuple(sorted(options.items()))
+
+    @automation_logger(logger)
+    def warm_up(self, browser_name, count=None, background=False, **options):
+        """
+        Pre-spawn idle sessions for a key, never above pool size.
+        :param browser_name: Chrome, Firefox, Edge or IE
+        :param count: sessions to have ready, pool size by default.
+        :param background: spawn in daemon threads and return immediately.
+        :param options: keyword options passed to the driver factory.
+        :return: list of spawning threads.
+        """
+        key = self.key_for(browser_name, **options)
+        count = self.size if count is None else min(count, self.size)
+        with self._condition:
+            missing = max(0, count - self._alive[key])
+            self._alive[key] += missing
+        threads = [threading.Thread(target=self._spawn_idle, args=(key, browser_name, options), daemon=True)
+                   for _ in range(missing)]
+        for thread in threads:
+            thread.start()
+        if not background:
+            for thread in threads:
+                thread.join()
+        return threads
+
+    @automation_logger(logger)
+    def lease(self, browser_name, **options):
+        """
+        Lend a session, spawning a new one if none is idle and the pool is not full, waiting otherwise.
+        :param browser_name: Chrome, Firefox, Edge or IE
+        :param options: keyword options passed to the driver factory.
+        :return: web driver.
+        """
+        key = self.key_for(browser_name, **options)
+        start = time.perf_counter()
+        deadline = start + self.lease_timeout
+        session = None
+        while session is None:
+            with self._condition:
+                while not self._idle[key] and self._alive[key] >= self.size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        error = "No free " + browser_name + " session in pool after " + str(self.lease_timeout) + "s"
+                        logger.error(error)
+                        raise AutomationError(error)
+                    self._condition.wait(remaining)
+                if self._idle[key]:
+                    session = self._idle[key].popleft()
+                else:
+                    self._alive[key] += 1
+                    self.stats.misses += 1
+            if session is None:
+                session = PooledSession(self._spawn(key, browser_name, options), key)
+            elif Browser.is_session_alive(session.driver):
+                with self._condition:
+                    self.stats.hits += 1
+            else:
+                self._destroy(session, "recycled")
+                session = None
+        session.uses += 1
+        with self._condition:
+            self._leased[id(session.driver)] = session
+            self.stats.lease_waits.append(time.perf_counter() - start)
+        return session.driver
+
+    @automation_logger(logger)
+    def release(self, driver, healthy=True):
+        """
+        Return leased session: reset it for the next lease or recycle it if worn out or unhealthy.
+        :param driver: leased web driver.
+        :param healthy: False forces recycling (e.g. test failed with a broken session).
+        """
+        with self._condition:
+            session = self._leased.pop(id(driver), None)
+        if session is None:
+            logger.error("Driver {0} is not leased from the pool.".format(driver))
+            return
+        if healthy and session.uses < self.max_uses:
+            try:
+                Browser.reset_session(driver)
+            except Exception as e:
+                logger.error(F"{e.__class__.__name__} session reset failed, recycling: {e}")
+                healthy = False
+        else:
+            healthy = False
+        if healthy:
+            with self._condition:
+                self._idle[session.key].append(session)
+                self._condition.notify()
+        else:
+            self._destroy(session, "recycled")
+
+    @automation_logger(logger)
+    def discard(self, driver):
+        """
+        Drop leased session without returning it to the pool.
+        :param driver: leased web driver.
+        """
+        with self._condition:
+            session = self._leased.pop(id(driver), None)
+        if session is not None:
+            self._destroy(session, "discarded")
+
+    @automation_logger(logger)
+    def shutdown(self):
+        """
+        Quit all idle and leased sessions.
+        :return: final pool stats report.
+        """
+        with self._condition:
+            sessions = [s for idle in self._idle.values() for s in idle] + list(self._leased.values())
+            self._idle.clear()
+            self._leased.clear()
+        for session in sessions:
+            self._destroy(session)
+        with self._condition:
+            return self.stats.report()
+
+    def _spawn(self, key, browser_name, options):
+        try:
+            driver = self.factory(browser_name, **options)
+        except Exception:
+            with self._condition:
+                self._alive[key] -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.stats.spawned += 1
+        return driver
+
+    def _spawn_idle(self, key, browser_name, options):
+        try:
+            session = PooledSession(self._spawn(key, browser_name, options), key)
+        except Exception as e:
+            logger.error(F"{e.__class__.__name__} pool warm up failed: {e}")
+            return
+        with self._condition:
+            self._idle[key].append(session)
+            self._condition.notify()
+
+    def _destroy(self, session, counter=None):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            logger.error(F"{e.__class__.__name__} failed to quit pooled session: {e}")
+        with self._condition:
+            if counter is not None:
+                setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+            self._alive[session.key] -= 1
+            self._condition.notify()
+
+
+driver_pool = DriverPool()
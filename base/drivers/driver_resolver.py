@@ -0,0 +1,126 @@
+import os
+import json
+import threading
+
+from config_definitions import BaseConfig
+from base import tests_base
+from base.automation_error import AutomationError
+from base.drivers.platform_capabilities import PlatformCapabilities
+from base.enums import Browsers, OperationSystem
+from base.logger import logger, automation_logger
+from base.utils.file_lock import FileLock
+from base.utils.lazy_import import LazyImport
+
+ChromeDriverManager = LazyImport("webdriver_manager.chrome", "ChromeDriverManager")
+GeckoDriverManager = LazyImport("webdriver_manager.firefox", "GeckoDriverManager")
+
+
+class DriverResolver:
+    """
+    Resolves driver binaries once per run. Results are memoized in process and persisted in a file-locked json
+    cache keyed by browser, OS and installed browser version, so parallel workers share a single webdriver-manager
+    resolution. In offline mode the binaries from drivers_dir listed in config.cfg are used without any probe.
+    """
+
+    cache_file = os.path.join(tests_base, "repository", "drivers_cache.json")
+    lock_file = cache_file + ".lock"
+
+    local_paths = {
+        (Browsers.CHROME.value, OperationSystem.WINDOWS.value): BaseConfig.W_CHROME_PATH,
+        (Browsers.FIREFOX.value, OperationSystem.WINDOWS.value): BaseConfig.W_FIREFOX_PATH,
+        (Browsers.IE.value, OperationSystem.WINDOWS.value): BaseConfig.W_IE_PATH,
+        (Browsers.EDGE.value, OperationSystem.WINDOWS.value): BaseConfig.W_EDGE_PATH,
+        (Browsers.CHROME.value, OperationSystem.LINUX.value): BaseConfig.L_CHROME_PATH,
+        (Browsers.FIREFOX.value, OperationSystem.LINUX.value): BaseConfig.L_FIREFOX_PATH,
+        (Browsers.CHROME.value, OperationSystem.DARWIN.value): BaseConfig.M_CHROME_PATH,
+        (Browsers.FIREFOX.value, OperationSystem.DARWIN.value): BaseConfig.M_FIREFOX_PATH,
+        (Browsers.OPERA.value, OperationSystem.DARWIN.value): BaseConfig.M_OPERA_PATH,
+    }
+
+    managers = {
+        Browsers.CHROME.value: ChromeDriverManager,
+        Browsers.FIREFOX.value: GeckoDriverManager,
+    }
+
+    _versions = {}
+    _resolved = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    @automation_logger(logger)
+    def resolve(cls, browser_name, os_name, offline=None):
+        """
+        Return path of the driver binary for browser on OS.
+        :param browser_name: Chrome, Firefox, Edge, IE or Opera.
+        :param os_name: OperationSystem value.
+        :param offline: skip webdriver-manager, config.cfg [DRIVERS] offline by default.
+        :return: driver executable path.
+        """
+        offline = BaseConfig.DRIVERS_OFFLINE if offline is None else offline
+        if offline or browser_name not in cls.managers:
+            return cls.local_path(browser_name, os_name)
+        with cls._lock:
+            if browser_name not in cls._versions:
+                cls._versions[browser_name] = cls.browser_version(browser_name)
+            key = "|".join((browser_name, os_name, cls._versions[browser_name]))
+            if key not in cls._resolved:
+                with FileLock(cls.lock_file):
+                    cache = cls._read_cache()
+                    path = cache.get(key)
+                    if path is None or not os.path.isfile(path):
+                        path = cls._install(browser_name)
+                        if path is not None:
+                            cache[key] = path
+                            cls._write_cache(cache)
+                cls._resolved[key] = path or cls.local_path(browser_name, os_name)
+            return cls._resolved[key]
+
+    @classmethod
+    @automation_logger(logger)
+    def local_path(cls, browser_name, os_name):
+        """
+        Driver binary shipped in drivers_dir according to config.cfg.
+        :param browser_name: Chrome, Firefox, Edge, IE or Opera.
+        :param os_name: OperationSystem value.
+        :return: driver executable path.
+        """
+        try:
+            return cls.local_paths[(browser_name, os_name)]
+        except KeyError:
+            error = "No " + browser_name + " driver configured for " + os_name
+            logger.error(error)
+            raise AutomationError(error)
+
+    @staticmethod
+    @automation_logger(logger)
+    def browser_version(browser_name):
+        """
+        Installed browser version, as detected by PlatformCapabilities.
+        :param browser_name: Chrome or Firefox.
+        :return: version string or 'unknown'.
+        """
+        return PlatformCapabilities.browser_version(browser_name) or "unknown"
+
+    @classmethod
+    def _install(cls, browser_name):
+        try:
+            return cls.managers[browser_name]().install()
+        except Exception as e:
+            logger.error(F"{e.__class__.__name__} webdriver-manager failed for {browser_name}, "
+                         F"falling back to drivers_dir: {e}")
+            return None
+
+    @classmethod
+    def _read_cache(cls):
+        try:
+            with open(cls.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _write_cache(cls, cache):
+        tmp_file = cls.cache_file + "." + str(os.getpid())
+        with open(tmp_file, "w") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, cls.cache_file)
@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import time
+import shutil
+import platform
+import threading
+import subprocess
+from collections import namedtuple
+
+from config_definitions import BaseConfig
+from base import tests_base
+from base.enums import Browsers, OperationSystem
+from base.logger import logger, automation_logger
+from base.utils.file_lock import FileLock
+from base.utils.lazy_import import LazyImport
+from base.utils.utils import Utils
+
+chrome_version = LazyImport("webdriver_manager.utils", "chrome_version")
+firefox_version = LazyImport("webdriver_manager.utils", "firefox_version")
+
+Capabilities = namedtuple("Capabilities", ["os", "arch", "browsers", "versions", "drivers"])
+
+VERSION_PATTERN = re.compile(r"\d+(?:\.\d+)+")
+
+# Browser executables looked up on PATH (names) or as absolute paths, environment variables expanded.
+BROWSER_BINARIES = {
+    OperationSystem.LINUX.value: {
+        Browsers.CHROME.value: ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+        Browsers.FIREFOX.value: ["firefox"],
+        Browsers.OPERA.value: ["opera"],
+    },
+    OperationSystem.DARWIN.value: {
+        Browsers.CHROME.value: ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"],
+        Browsers.FIREFOX.value: ["/Applications/Firefox.app/Contents/MacOS/firefox"],
+        Browsers.OPERA.value: ["/Applications/Opera.app/Contents/MacOS/Opera"],
+        Browsers.SAFARI.value: ["/Applications/Safari.app/Contents/MacOS/Safari"],
+    },
+    OperationSystem.WINDOWS.value: {
+        Browsers.CHROME.value: [r"%PROGRAMFILES%\Google\Chrome\Application\chrome.exe",
+                                r"%PROGRAMFILES(X86)%\Google\Chrome\Application\chrome.exe",
+                                r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"],
+        Browsers.FIREFOX.value: [r"%PROGRAMFILES%\Mozilla Firefox\firefox.exe",
+                                 r"%PROGRAMFILES(X86)%\Mozilla Firefox\firefox.exe"],
+        Browsers.EDGE.value: [r"%PROGRAMFILES(X86)%\Microsoft\Edge\Application\msedge.exe",
+                              r"%PROGRAMFILES%\Microsoft\Edge\Application\msedge.exe"],
+        Browsers.IE.value: [r"%PROGRAMFILES%\Internet Explorer\iexplore.exe"],
+    },
+}
+
+DRIVER_BINARIES = {
+    Browsers.CHROME.value: "chromedriver",
+    Browsers.FIREFOX.value: "geckodriver",
+    Browsers.EDGE.value: "msedgedriver",
+    Browsers.IE.value: "IEDriverServer",
+    Browsers.OPERA.value: "operadriver",
+}
+
+# Used where the browser does not print its version (Windows registry lookups of webdriver-manager).
+VERSION_FALLBACKS = {
+    Browsers.CHROME.value: chrome_version,
+    Browsers.FIREFOX.value: firefox_version,
+}
+
+
+class PlatformCapabilities:
+    """
+    What the machine offers to the tests: OS, architecture, installed browsers with their versions and driver
+    binaries. Detected once per process; browser versions, the only part that starts processes, are also kept in
+    base/repository/platform_capabilities.json and reused by later runs and parallel workers until a browser binary
+    changes or [PLATFORM] cache_ttl expires.
+    """
+
+    cache_file = os.path.join(tests_base, "repository", "platform_capabilities.json")
+    lock_file = cache_file + ".lock"
+
+    _capabilities = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def os_name(cls):
+        """
+        :return: OperationSystem value, without detecting browsers.
+        """
+        return Utils.detect_os()
+
+    @classmethod
+    @automation_logger(logger)
+    def detect(cls, refresh=False):
+        """
+        :param refresh: detect again, ignoring process and disk cache.
+        :return: Capabilities(os, arch, browsers {name: path}, versions {name: version}, drivers {name: path}).
+        """
+        with cls._lock:
+            if cls._capabilities is None or refresh:
+                cls._capabilities = cls._detect(refresh)
+                logger.info(F"Platform capabilities: {cls._capabilities}")
+            return cls._capabilities
+
+    @classmethod
+    def browser_version(cls, browser_name):
+        """
+        :param browser_name: Browsers value.
+        :return: installed browser version or None.
+        """
+        return cls.detect().versions.get(browser_name)
+
+    @classmethod
+    def driver_path(cls, browser_name):
+        """
+        :param browser_name: Browsers value.
+        :return: driver binary found in drivers_dir or on PATH, None if there is none.
+        """
+        return cls.detect().drivers.get(browser_name)
+
+    @classmethod
+    def _detect(cls, refresh):
+        os_name = cls.os_name()
+        browsers = {name: cls._locate(candidates) for name, candidates in BROWSER_BINARIES[os_name].items()}
+        fingerprint = {"os": os_name, "arch": cls.arch(), "host": platform.node(),
+                       "browsers": {name: cls._stamp(path) for name, path in browsers.items()}}
+        use_cache = BaseConfig.PLATFORM_CACHE and not refresh
+        with FileLock(cls.lock_file):
+            cached = cls._read_cache() if use_cache else {}
+            if cached.get("fingerprint") == fingerprint and \
+                    os.path.getmtime(cls.cache_file) + BaseConfig.PLATFORM_CACHE_TTL > time.time():
+                versions = cached["versions"]
+            else:
+                versions = {name: cls._version(name, path) for name, path in browsers.items()}
+                if BaseConfig.PLATFORM_CACHE:
+                    cls._write_cache({"fingerprint": fingerprint, "versions": versions})
+        return Capabilities(os_name, fingerprint["arch"], browsers, versions, cls._drivers(os_name))
+
+    @staticmethod
+    def arch():
+        """
+        :return: normalized machine architecture, e.g. x86_64, arm64.
+        """
+        machine = platform.machine().lower()
+        return {"amd64": "x86_64", "x64": "x86_64", "aarch64": "arm64"}.get(machine, machine)
+
+    @staticmethod
+    def _locate(candidates):
+        for candidate in candidates:
+            candidate = os.path.expandvars(candidate)
+            path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+            if path and os.path.isfile(path):
+                return path
+        return None
+
+    @staticmethod
+    def _stamp(path):
+        if path is None:
+            return None
+        stat = os.stat(path)
+        return "{0}|{1}|{2}".format(path, int(stat.st_mtime), stat.st_size)
+
+    @staticmethod
+    def _version(browser_name, path):
+        if path is not None:
+            try:
+                result = subprocess.run([path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                        timeout=10, universal_newlines=True)
+                version = VERSION_PATTERN.search(result.stdout)
+                if version:
+                    return version.group(0)
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.error(F"{e.__class__.__name__} {path} --version failed: {e}")
+        fallback = VERSION_FALLBACKS.get(browser_name)
+        if fallback is not None and (path is not None or Utils.detect_os() == OperationSystem.WINDOWS.value):
+            try:
+                return fallback()
+            except Exception as e:
+                logger.error(F"{e.__class__.__name__} browser version of {browser_name} is not detected: {e}")
+        return None
+
+    @staticmethod
+    def _drivers(os_name):
+        from base.drivers.driver_resolver import DriverResolver
+        drivers = {}
+        for browser_name, binary in DRIVER_BINARIES.items():
+            configured = DriverResolver.local_paths.get((browser_name, os_name))
+            if configured and os.path.isfile(configured):
+                drivers[browser_name] = configured
+            else:
+                drivers[browser_name] = shutil.which(binary)
+        return drivers
+
+    @classmethod
+    def _read_cache(cls):
+        try:
+            with open(cls.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _write_cache(cls, cache):
+        tmp_file = cls.cache_file + "." + str(os.getpid())
+        with open(tmp_file, "w") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, cls.cache_file)
@@ -0,0 +1,283 @@
+import os
+import sys
+import json
+import time
+import ctypes
+import signal
+import threading
+import subprocess
+
+import requests
+
+from config_definitions import BaseConfig
+from base import tests_base
+from base.automation_error import AutomationError
+from base.drivers.browser_profiles import BrowserProfile
+from base.enums import Browsers
+from base.instruments.command_timer import CommandTimer
+from base.logger import logger, automation_logger
+from base.utils import log_drain
+from base.utils.file_lock import FileLock
+from base.utils.lazy_import import LazyImport
+
+Remote = LazyImport("selenium.webdriver", "Remote")
+DesiredCapabilities = LazyImport("selenium.webdriver", "DesiredCapabilities")
+
+DRIVER_PROPERTIES = {
+    Browsers.CHROME.value: "webdriver.chrome.driver",
+    Browsers.FIREFOX.value: "webdriver.gecko.driver",
+    Browsers.IE.value: "webdriver.ie.driver",
+    Browsers.EDGE.value: "webdriver.edge.driver",
+}
+
+CAPABILITIES = {
+    Browsers.CHROME.value: "CHROME",
+    Browsers.FIREFOX.value: "FIREFOX",
+    Browsers.IE.value: "INTERNETEXPLORER",
+    Browsers.EDGE.value: "EDGE",
+}
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        return _windows_pid_alive(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _windows_pid_alive(pid):
+    # os.kill terminates the process on Windows, so ask for its exit code instead.
+    process_query_limited_information, still_active = 0x1000, 259
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    handle = kernel32.OpenProcess(process_query_limited_information, False, pid)
+    if not handle:
+        # Access denied means the process exists but belongs to someone else.
+        return ctypes.get_last_error() == 5
+    try:
+        exit_code = ctypes.c_ulong()
+        return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))) and \
+            exit_code.value == still_active
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+class SeleniumServer:
+    """
+    Selenium standalone server shared by all test processes of a run, parallel workers included.
+    The first process to acquire() starts java -jar selenium-server-standalone in the background, with its output
+    piped to a log drain process (base/utils/log_drain.py) that rotates the log file and outlives the starting test
+    process, and waits for /status to report ready; the others find it through a file-locked state
+    file (base/repository/selenium_server.json). Every process release()s it at the end and the last one stops it.
+    Tests use it through Remote sessions: driver_pool.factory = selenium_server.get_driver, which acquires the server
+    on the first session, so runs without browser tests never start it.
+    """
+
+    state_file = os.path.join(tests_base, "repository", "selenium_server.json")
+    lock_file = state_file + ".lock"
+    log_file = os.path.join(tests_base, "repository", "logs", "selenium_server.log")
+
+    def __init__(self, port=None, start_timeout=None):
+        """
+        :param port: server port, [SERVER] port by default.
+        :param start_timeout: seconds for the server to become ready, [SERVER] start_timeout by default.
+        """
+        self.port = port or BaseConfig.SERVER_PORT
+        self.start_timeout = start_timeout or BaseConfig.SERVER_START_TIMEOUT
+        self.url = "http://127.0.0.1:{0}/wd/hub".format(self.port)
+        self.process = None
+        self.acquired = False
+        self._drain = None
+        self._acquire_lock = threading.Lock()
+
+    @automation_logger(logger)
+    def acquire(self):
+        """
+        Use the running server or start a new one.
+        :return: server url for Remote sessions.
+        :raise AutomationError: server did not become ready in time.
+        """
+        with FileLock(self.lock_file):
+            state = self._read_state()
+            owners = [pid for pid in state.get("owners", []) if _pid_alive(pid)]
+            if state.get("url") != self.url or not self.is_ready():
+                if self.is_ready():
+                    logger.info("Selenium server not started by the tests is running at " + self.url)
+                    owners = []
+                    state = {"url": self.url, "pid": None}
+                else:
+                    state = {"url": self.url, "pid": self.start()}
+                    owners = []
+            state["owners"] = owners + [os.getpid()]
+            self._write_state(state)
+        self.acquired = True
+        return self.url
+
+    @automation_logger(logger)
+    def release(self):
+        """
+        Give the server up; the last process using it stops it.
+        """
+        if not self.acquired:
+            return
+        self.acquired = False
+        with FileLock(self.lock_file):
+            state = self._read_state()
+            owners = [pid for pid in state.get("owners", []) if pid != os.getpid() and _pid_alive(pid)]
+            if owners:
+                state["owners"] = owners
+                self._write_state(state)
+                return
+            self.stop(state.get("pid"))
+            try:
+                os.remove(self.state_file)
+            except OSError:
+                pass
+
+    @automation_logger(logger)
+    def start(self):
+        """
+        Launch the server in the background and wait until it is ready.
+        :return: server process id.
+        """
+        from base.drivers.webdriver_factory import WebDriverFactory
+        start = time.perf_counter()
+        self.process = WebDriverFactory.run_terminal_command(self.command())
+        self._drain = self._start_drain(self.process.stdout)
+        delay = 0.1
+        deadline = start + self.start_timeout
+        while not self.is_ready():
+            if self.process.poll() is not None:
+                error = "Selenium server exited with code {0}, see {1}".format(self.process.returncode, self.log_file)
+                logger.error(error)
+                raise AutomationError(error)
+            if time.perf_counter() > deadline:
+                self.stop()
+                error = "Selenium server is not ready after {0}s, see {1}".format(self.start_timeout, self.log_file)
+                logger.error(error)
+                raise AutomationError(error)
+            time.sleep(delay)
+            delay = min(delay * 1.5, 1.0)
+        logger.info("Selenium server ready at {0} in {1:.2f}s".format(self.url, time.perf_counter() - start))
+        return self.process.pid
+
+    @automation_logger(logger)
+    def stop(self, pid=None, timeout=10.0):
+        """
+        Stop the server started by this process, or by another one if pid is given.
+        :param pid: process id of the server.
+        :param timeout: seconds to wait for the server to exit before it is killed.
+        """
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+            if self._drain is not None:
+                try:
+                    self._drain.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    self._drain.kill()
+                self._drain = None
+        else:
+            self._stop_pid(pid, timeout)
+
+    def is_ready(self):
+        """
+        :return: True if the server answers /status as ready.
+        """
+        try:
+            response = requests.get(self.url + "/status", timeout=2)
+            return response.ok and response.json().get("value", {}).get("ready", True) is not False
+        except (requests.RequestException, ValueError):
+            return False
+
+    def command(self):
+        """
+        :return: argument list starting the server with the driver binaries of [SERVER] browsers.
+        """
+        from base.drivers.driver_resolver import DriverResolver
+        from base.drivers.platform_capabilities import PlatformCapabilities
+        os_name = PlatformCapabilities.os_name()
+        command = [BaseConfig.SERVER_JAVA]
+        for browser_name in BaseConfig.SERVER_BROWSERS:
+            try:
+                command.append("-D{0}={1}".format(DRIVER_PROPERTIES[browser_name],
+                                                  DriverResolver.resolve(browser_name, os_name)))
+            except (KeyError, AutomationError) as e:
+                logger.error(F"{e.__class__.__name__} no {browser_name} driver for selenium server: {e}")
+        return command + ["-jar", BaseConfig.SELENIUM_JAR, "-port", str(self.port)]
+
+    @automation_logger(logger)
+    def get_driver(self, browser_name, profile=None):
+        """
+        Remote session on the server, acquired on the first call. Driver factory compatible with DriverPool.
+        :param browser_name: Chrome, Firefox, Edge or IE
+        :param profile: browser profile name from config.cfg, [PROFILES] default if None.
+        :return: web driver.
+        """
+        if not self.acquired:
+            with self._acquire_lock:
+                if not self.acquired:
+                    self.acquire()
+        browser_name = browser_name.lower()
+        try:
+            capabilities = getattr(DesiredCapabilities, CAPABILITIES[browser_name]).copy()
+        except KeyError:
+            error = "No such " + browser_name + " browser exists"
+            logger.error(error)
+            raise AutomationError(error)
+        profile = BrowserProfile.load(profile)
+        options = profile.options(browser_name) if browser_name in (
+            Browsers.CHROME.value, Browsers.FIREFOX.value) else None
+        driver = Remote(command_executor=self.url, desired_capabilities=capabilities, options=options)
+        return profile.apply(CommandTimer.install(driver))
+
+    def _start_drain(self, stream):
+        """
+        Hand the server output to a separate log drain process, which reads and rotates it for as long as the server
+        runs, also after the test process that started the server has finished.
+        :param stream: server stdout pipe.
+        :return: Popen of the drain.
+        """
+        drain = subprocess.Popen([sys.executable, log_drain.__file__, self.log_file,
+                                  str(BaseConfig.SERVER_LOG_MAX_BYTES), str(BaseConfig.SERVER_LOG_BACKUPS)],
+                                 stdin=stream, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        stream.close()
+        return drain
+
+    def _stop_pid(self, pid, timeout=10.0):
+        if not pid or not _pid_alive(pid):
+            return
+        try:
+            os.kill(pid, signal.SIGTERM)
+            deadline = time.perf_counter() + timeout
+            while _pid_alive(pid) and time.perf_counter() < deadline:
+                time.sleep(0.2)
+            if _pid_alive(pid) and os.name != "nt":
+                os.kill(pid, signal.SIGKILL)
+        except OSError as e:
+            logger.error(F"{e.__class__.__name__} failed to stop selenium server {pid}: {e}")
+
+    def _read_state(self):
+        try:
+            with open(self.state_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state):
+        tmp_file = self.state_file + "." + str(os.getpid())
+        with open(tmp_file, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.state_file)
+
+
+selenium_server = SeleniumServer()
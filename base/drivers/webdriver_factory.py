@@ -1,149 +1,141 @@
 import subprocess
-import multiprocessing
 from selenium import webdriver
 from selenium.webdriver import DesiredCapabilities
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.opera import OperaDriverManager
-from testcontainers.selenium import BrowserWebDriverContainer
 
 from config_definitions import BaseConfig
 from base.automation_error import AutomationError
+from base.drivers.browser_profiles import BrowserProfile
+from base.drivers.driver_resolver import DriverResolver
+from base.drivers.platform_capabilities import PlatformCapabilities
 from base.enums import Browsers, OperationSystem
+from base.instruments.command_timer import CommandTimer
 from base.logger import logger, automation_logger
-from base.utils.utils import Utils
+from base.utils.lazy_import import LazyImport
 
+BrowserWebDriverContainer = LazyImport("testcontainers.selenium", "BrowserWebDriverContainer")
 
-class WebDriverFactory:
-    chrome_options = webdriver.ChromeOptions()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-gpu')
-    # chrome_options.add_argument('--enable-benchmarking')
-    # chrome_options.add_argument('--enable-net-benchmarking')
-    # chrome_options.add_argument('--remote-debugging-port=9222')
-    chrome_options.add_experimental_option('w3c', False)
 
+def _firefox(driver_path, profile):
+    return webdriver.Firefox(executable_path=driver_path, options=profile.firefox_options())
+
+
+def _chrome(driver_path, profile):
+    return profile.apply(webdriver.Chrome(executable_path=driver_path, options=profile.chrome_options()))
+
+
+def _ie(driver_path, profile):
+    return webdriver.Ie(driver_path)
+
+
+def _edge(driver_path, profile):
+    return webdriver.Edge(driver_path)
+
+
+class WebDriverFactory:
     opera_options = webdriver.ChromeOptions()
     opera_options.binary_location = BaseConfig.M_OPERA_PATH
 
+    # OS to the method starting local drivers on it, and browser to the function starting its driver.
+    os_factories = {
+        OperationSystem.WINDOWS.value: "get_driver_win",
+        OperationSystem.LINUX.value: "get_driver_lin",
+        OperationSystem.DARWIN.value: "get_driver_mac",
+    }
+    launchers = {
+        Browsers.FIREFOX.value: _firefox,
+        Browsers.CHROME.value: _chrome,
+        Browsers.IE.value: _ie,
+        Browsers.EDGE.value: _edge,
+    }
+    os_browsers = {
+        OperationSystem.WINDOWS.value: (Browsers.FIREFOX.value, Browsers.CHROME.value, Browsers.IE.value,
+                                        Browsers.EDGE.value),
+        OperationSystem.LINUX.value: (Browsers.FIREFOX.value, Browsers.CHROME.value),
+        OperationSystem.DARWIN.value: (Browsers.FIREFOX.value, Browsers.CHROME.value),
+    }
+
     @classmethod
     @automation_logger(logger)
-    def get_driver(cls, browser_name=None):
+    def get_driver(cls, browser_name=None, profile=None):
         """
         Define Operational System and return driver accordingly.
         :param browser_name: Chrome, Firefox, Edge or IE
+        :param profile: browser profile name from config.cfg (fast, faithful), [PROFILES] default if None.
         :return: web driver.
         """
-        browser_name = browser_name.lower()
-        if browser_name is None:
-            browser_name = Browsers.CHROME.value
-        if Utils.detect_os() == OperationSystem.WINDOWS.value:
-            return cls.get_driver_win(browser_name)
-        elif Utils.detect_os() == OperationSystem.DARWIN.value:
-            return cls.get_driver_mac(browser_name)
-        elif Utils.detect_os() == OperationSystem.LINUX.value:
-            return cls.get_driver_lin(browser_name)
-        else:
+        browser_name = (browser_name or Browsers.CHROME.value).lower()
+        profile = BrowserProfile.load(profile)
+        os_name = PlatformCapabilities.os_name()
+        try:
+            factory = getattr(cls, cls.os_factories[os_name])
+        except KeyError:
             error = "Operational System not detected."
             logger.error(error)
             raise AutomationError(error)
+        return factory(browser_name, profile)
 
     @classmethod
     @automation_logger(logger)
-    def get_driver_win(cls, browser_name):
+    def get_driver_win(cls, browser_name, profile=None):
         """
         Choose needed driver according to Windows OS.
         :param browser_name: Chrome, Firefox, Edge or IE
+        :param profile: BrowserProfile, default profile if None.
         :return: web driver.
         """
-        if browser_name == Browsers.FIREFOX.value:
-            try:
-                return webdriver.Firefox(executable_path=GeckoDriverManager().install())
-            except Exception as e:
-                print(e)
-                return webdriver.Firefox(executable_path=BaseConfig.W_FIREFOX_PATH)
-        elif browser_name == Browsers.CHROME.value:
-            chrome_options = webdriver.ChromeOptions()
-            chrome_options.add_experimental_option('w3c', False)
-            try:
-                return webdriver.Chrome(executable_path=ChromeDriverManager().install(), options=chrome_options)
-            except Exception as e:
-                logger.exception(e)
-                return webdriver.Chrome(executable_path=BaseConfig.W_CHROME_PATH, options=chrome_options)
-        elif browser_name == Browsers.IE.value:
-            return webdriver.Ie(BaseConfig.W_IE_PATH)
-        elif browser_name == Browsers.EDGE.value:
-            return webdriver.Edge(BaseConfig.W_EDGE_PATH)
-        else:
-            error = "No such " + browser_name + " browser exists"
-            logger.exception(error)
-            raise AutomationError(error)
+        return cls.start_local(browser_name, OperationSystem.WINDOWS.value, profile)
 
     @classmethod
     @automation_logger(logger)
-    def get_driver_lin(cls, browser_name):
+    def get_driver_lin(cls, browser_name, profile=None):
         """
         Choose needed driver according to Linux OS.
         :param browser_name: Chrome, Firefox
+        :param profile: BrowserProfile, default profile if None.
         :return: web driver.
         """
-        if browser_name == Browsers.FIREFOX.value:
-            try:
-                return webdriver.Firefox(executable_path=GeckoDriverManager().install())
-            except Exception as e:
-                logger.exception(e)
-                return webdriver.Firefox(executable_path=BaseConfig.L_FIREFOX_PATH)
-        elif browser_name == Browsers.CHROME.value:
-            try:
-                return webdriver.Chrome(executable_path=ChromeDriverManager().install(), options=cls.chrome_options)
-            except Exception as e:
-                logger.exception(e)
-                return webdriver.Chrome(executable_path=BaseConfig.L_CHROME_PATH, options=cls.chrome_options)
-        else:
-            error = "No such " + browser_name + " browser exists"
-            logger.exception(error)
-            raise AutomationError(error)
+        return cls.start_local(browser_name, OperationSystem.LINUX.value, profile)
 
     @classmethod
     @automation_logger(logger)
-    def get_driver_mac(cls, browser_name):
+    def get_driver_mac(cls, browser_name, profile=None):
         """
         Choose needed driver according to Darwin OS.
         :param browser_name: Chrome, Firefox
+        :param profile: BrowserProfile, default profile if None.
         :return: web driver for mac.
         """
-        if browser_name == Browsers.FIREFOX.value:
-            try:
-                return webdriver.Firefox(executable_path=GeckoDriverManager().install())
-            except Exception as e:
-                logger.exception(e)
-                return webdriver.Firefox(executable_path=BaseConfig.M_FIREFOX_PATH)
-        elif browser_name == Browsers.CHROME.value:
-            chrome_options = webdriver.ChromeOptions()
-            chrome_options.add_experimental_option('w3c', False)
-            try:
-                return webdriver.Chrome(executable_path=ChromeDriverManager().install(), options=chrome_options)
-            except Exception as e:
-                logger.exception(e)
-                return webdriver.Chrome(executable_path=BaseConfig.M_CHROME_PATH, options=chrome_options)
-        else:
+        return cls.start_local(browser_name, OperationSystem.DARWIN.value, profile)
+
+    @classmethod
+    def start_local(cls, browser_name, os_name, profile=None):
+        """
+        Start a local driver of browser supported on OS.
+        :param browser_name: Browsers value.
+        :param os_name: OperationSystem value.
+        :param profile: BrowserProfile, default profile if None.
+        :return: web driver.
+        """
+        if browser_name not in cls.os_browsers[os_name]:
             error = "No such " + browser_name + " browser exists"
             logger.exception(error)
             raise AutomationError(error)
+        profile = profile or BrowserProfile.load()
+        return CommandTimer.install(cls.launchers[browser_name](DriverResolver.resolve(browser_name, os_name), profile))
 
     @classmethod
     @automation_logger(logger)
-    def get_webdriver_container(cls, browser_name):
+    def get_webdriver_container(cls, browser_name, image=None):
         """
-        Provides driver as Docker container..
+        Provides driver as Docker container, not started (see ContainerGrid for started and reused ones).
         :param browser_name: Chrome, Firefox
-        :return: web driver.
+        :param image: docker image, testcontainers default of the browser if None.
+        :return: BrowserWebDriverContainer.
         """
         if browser_name == Browsers.FIREFOX.value:
-            return BrowserWebDriverContainer(DesiredCapabilities.FIREFOX)
+            return BrowserWebDriverContainer(DesiredCapabilities.FIREFOX, image)
         elif browser_name == Browsers.CHROME.value:
-            return BrowserWebDriverContainer(DesiredCapabilities.CHROME)
+            return BrowserWebDriverContainer(DesiredCapabilities.CHROME, image)
         else:
             error = "No such " + browser_name + " container exists"
             logger.exception(error)
@@ -151,43 +143,22 @@ class WebDriverFactory:
 
     @classmethod
     @automation_logger(logger)
-    def start_selenium_server(cls, browser_name):
+    def start_selenium_server(cls):
         """
-
-        :param browser_name:
+        Starts selenium-standalone-server.jar in the background, or joins the one already started by another test
+        process, and waits until it is ready. SeleniumServer.release() gives it up.
+        :return: SeleniumServer, its get_driver starts Remote sessions on it.
         """
-        multiprocessing.Process(target=cls.start_server(browser_name)).start()
-
-    @classmethod
-    @automation_logger(logger)
-    def start_server(cls, browser_name):
-        """
-        Calls self method run_command_in to start selenium-standalone-server.jar.
-        :param browser_name:
-        """
-        browser_name = browser_name.lower()
-        if browser_name == Browsers.FIREFOX.value:
-            option = "-Dwebdriver.firefox.driver=" + BaseConfig.W_FIREFOX_PATH
-        elif browser_name == Browsers.CHROME.value:
-            option = "-Dwebdriver.chrome.driver=" + BaseConfig.W_CHROME_PATH
-        elif browser_name == Browsers.IE.value:
-            option = "-Dwebdriver.ie.driver=" + BaseConfig.W_IE_PATH
-        elif browser_name == Browsers.EDGE.value:
-            option = "-Dwebdriver.edge.driver=" + BaseConfig.W_EDGE_PATH
-        else:
-            error = "No such " + browser_name + " browser exists"
-            logger.exception(error)
-            raise AutomationError(error)
-
-        command = ["java", option, "-jar", BaseConfig.SELENIUM_JAR]
-        cls.run_terminal_command(command)
+        from base.drivers.selenium_server import selenium_server
+        selenium_server.acquire()
+        return selenium_server
 
     @staticmethod
     @automation_logger(logger)
     def run_terminal_command(command):
         """
-
-        :param command:
+        Start command in the background, without a shell.
+        :param command: argument list.
+        :return: Popen with stdout and stderr in one pipe, the caller has to read it.
         """
-        subprocess.Popen(
-            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, shell=True)
+        return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
@@ -0,0 +1,26 @@
+import importlib
+
+# Public names and their modules, imported on first access so that e.g. ApiClient loads neither selenium nor aiohttp.
+_exports = {
+    "ActionPipeline": "base.instruments.action_pipeline",
+    "ApiClient": "base.instruments.api_client",
+    "ApiResponse": "base.instruments.api_response",
+    "AsyncApiClient": "base.instruments.async_api_client",
+    "Browser": "base.instruments.browser",
+    "HttpCache": "base.instruments.http_cache",
+    "Locator": "base.instruments.locator",
+    "LocatorTemplate": "base.instruments.locator",
+    "PageReadiness": "base.instruments.page_readiness",
+    "WaitEngine": "base.instruments.wait_engine",
+}
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+    value = globals()[name] = getattr(importlib.import_module(_exports[name]), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
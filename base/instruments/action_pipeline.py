@@ -0,0 +1,140 @@
+import time
+from collections import namedtuple
+from selenium.common.exceptions import TimeoutException
+
+from base.instruments.wait_engine import WaitEngine
+from base.logger import automation_logger, logger
+from base.utils.lazy_import import LazyImport
+
+ActionChains = LazyImport("selenium.webdriver", "ActionChains")
+
+StepTiming = namedtuple("StepTiming", ["step", "seconds"])
+
+
+class ActionPipeline:
+    """
+    Queued browser input with condition based synchronization instead of fixed sleeps.
+    Consecutive clicks, key input and moves are sent together, as one W3C Actions payload where the session speaks
+    W3C (driver.w3c), as one legacy command per action otherwise (e.g. the faithful profile, w3c = false). A sync
+    point (enabled, quiescent, network_idle) sends the queued input, then waits for its condition; a sync point added
+    with required=False logs its timeout instead of raising it. perform() returns the time spent in every input batch
+    and sync point.
+    Usage: ActionPipeline(driver).move_to(element).enabled(element).click(element).quiescent().perform()
+    """
+
+    def __init__(self, driver, timeout=5.0):
+        """
+        :param driver: web_driver instance.
+        :param timeout: default seconds to wait at sync points.
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.timings = []
+        self._steps = []
+
+    def move_to(self, element):
+        return self._input("move", lambda chain: chain.move_to_element(element))
+
+    def click(self, element=None):
+        return self._input("click", lambda chain: chain.click(element))
+
+    def double_click(self, element=None):
+        return self._input("double_click", lambda chain: chain.double_click(element))
+
+    def send_keys(self, *keys):
+        return self._input("keys", lambda chain: chain.send_keys(*keys))
+
+    def send_keys_to(self, element, *keys):
+        return self._input("keys", lambda chain: chain.send_keys_to_element(element, *keys))
+
+    def key_down(self, key, element=None):
+        return self._input("key_down", lambda chain: chain.key_down(key, element))
+
+    def key_up(self, key, element=None):
+        return self._input("key_up", lambda chain: chain.key_up(key, element))
+
+    def enabled(self, target, timeout=None, required=True):
+        """
+        Sync point: wait for element to be enabled.
+        :param target: web element, xpath or Locator; xpath and Locator also wait for the element to be visible.
+        :param timeout: seconds to wait, pipeline timeout by default.
+        :param required: False to log a timeout and go on instead of raising it.
+        """
+        from selenium.webdriver.remote.webelement import WebElement
+        timeout = self.timeout if timeout is None else timeout
+        if isinstance(target, WebElement):
+            return self._sync("enabled", lambda: WaitEngine.poll(target.is_enabled, timeout, "element enabled"),
+                              required)
+        return self._sync("enabled", lambda: WaitEngine.until(self.driver, "clickable", target, timeout), required)
+
+    def quiescent(self, quiet=0.1, timeout=None, required=True):
+        """
+        Sync point: wait for the DOM to stop changing.
+        :param quiet: seconds without DOM mutations.
+        :param timeout: seconds to wait, pipeline timeout by default.
+        :param required: False to log a timeout and go on instead of raising it.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        return self._sync("quiescent", lambda: WaitEngine.dom_quiescent(self.driver, quiet, timeout), required)
+
+    def network_idle(self, idle=0.5, timeout=None, required=True):
+        """
+        Sync point: wait for network requests of the page to stop.
+        :param idle: seconds without network activity.
+        :param timeout: seconds to wait, pipeline timeout by default.
+        :param required: False to log a timeout and go on instead of raising it.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        return self._sync("network_idle", lambda: WaitEngine.network_idle(self.driver, idle, timeout), required)
+
+    @automation_logger(logger)
+    def perform(self):
+        """
+        Send queued input and run sync points in order.
+        :return: list of StepTiming, one per input batch and per sync point.
+        :raise TimeoutException: condition of a required sync point is not met in time.
+        """
+        steps, self._steps, self.timings = self._steps, [], []
+        batch = []
+        for kind, name, step in steps + [("end", None, None)]:
+            if kind == "input":
+                batch.append((name, step))
+                continue
+            if batch:
+                self._measure("actions: " + ", ".join(name for name, _ in batch), self._send, batch)
+                batch = []
+            if kind == "sync":
+                self._measure(name, step)
+        logger.debug("Action pipeline timings: " + ", ".join(
+            "{0} {1:.3f}s".format(timing.step, timing.seconds) for timing in self.timings))
+        return self.timings
+
+    def _input(self, name, step):
+        self._steps.append(("input", name, step))
+        return self
+
+    def _sync(self, name, step, required=True):
+        self._steps.append(("sync", name, step if required else self._best_effort(name, step)))
+        return self
+
+    @staticmethod
+    def _best_effort(name, step):
+        def run():
+            try:
+                step()
+            except TimeoutException as e:
+                logger.warning(F"{e.__class__.__name__} sync point {name} not met, going on: {e}")
+        return run
+
+    def _send(self, batch):
+        chain = ActionChains(self.driver)
+        for _, step in batch:
+            step(chain)
+        chain.perform()
+
+    def _measure(self, name, function, *args):
+        start = time.perf_counter()
+        try:
+            function(*args)
+        finally:
+            self.timings.append(StepTiming(name, time.perf_counter() - start))
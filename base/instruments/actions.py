@@ -0,0 +1,11 @@
+from selenium.webdriver import ActionChains
+
+
+class Actions(ActionChains):
+    def wait(self, delay: float):
+        """
+        Fixed pause inside the chain: W3C pause actions where the session speaks W3C, a sleep between the legacy
+        commands otherwise. Prefer ActionPipeline sync points.
+        :param delay: seconds to pause.
+        """
+        return self.pause(delay)
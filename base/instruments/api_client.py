@@ -1,10 +1,14 @@
-import json
-from json import JSONDecodeError
+import time
+import threading
 
 import requests
+from urllib3.util.retry import Retry
 
 from config_definitions import BaseConfig
 from base.constants import RESPONSE_TEXT
+from base.instruments.api_response import ApiResponse
+from base.instruments.http_cache import HttpCache
+from base.instruments.http_timing import TimedHTTPAdapter
 from base.logger import logger, automation_logger
 
 
@@ -14,21 +18,101 @@ class ApiClient(object):
                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_10_1) AppleWebKit/537.36 '
                              '(KHTML, like Gecko) Chrome/39.0.2171.95 Safari/537.36'}
 
+    def __init__(self, pool_size=None, max_retries=None, backoff_factor=None, timeout=None, cache=None):
+        """
+        :param cache: HttpCache for GET requests, built from config.cfg [API] cache settings when None.
+        """
+        if cache is None and BaseConfig.API_CACHE:
+            cache = HttpCache(BaseConfig.API_CACHE_MAX_BYTES, BaseConfig.API_CACHE_DIR)
+        self.cache = cache
+        self.pool_size = pool_size or BaseConfig.API_POOL_SIZE
+        self.max_retries = BaseConfig.API_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = BaseConfig.API_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self.timeout = timeout or BaseConfig.API_TIMEOUT
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """
+        Keep-alive requests.Session shared by all calls (and threads) of this client, created on first use.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        retries = Retry(total=self.max_retries, backoff_factor=self.backoff_factor,
+                        status_forcelist=BaseConfig.API_RETRY_STATUSES, raise_on_status=False)
+        adapter = TimedHTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                   max_retries=retries, pool_block=True)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     @automation_logger(logger)
-    def get_manifest(self):
-        uri = self.api_url + "manifest.json"
+    def close(self):
+        """
+        Close pooled connections.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    @automation_logger(logger)
+    def request(self, method, path, parse=True, use_cache=True, **kwargs):
+        """
+        Send request to api_url + path through the pooled session.
+        Phase timings in seconds are exposed as response.timings: dns, connect, tls (zero on a reused connection),
+        ttfb (until response headers) and total (body included unless streamed).
+        GET requests go through the client cache if there is one; response.from_cache marks a cached answer.
+        :param method: HTTP method.
+        :param path: path relative to api_url.
+        :param parse: return parsed body, otherwise None and response.body parses it on first access.
+        :param use_cache: False always goes to the network.
+        :param kwargs: requests keyword arguments, headers and timeout default to the client ones.
+        :return: tuple of parsed body (json or text) and ApiResponse.
+        """
+        uri = self.api_url + path
+        kwargs.setdefault("headers", self.headers)
+        kwargs.setdefault("timeout", self.timeout)
         try:
-            _response = requests.get(uri, headers=self.headers)
-            try:
-                body = json.loads(_response.text)
-            except JSONDecodeError as e:
-                logger.error(f"Failed to parse response json: {e}")
-                if _response.text is not None:
-                    body = _response.text
-                else:
-                    body = _response.reason
-            logger.info(RESPONSE_TEXT.format(body))
-            return body, _response
+            if self.cache is not None and use_cache and method.upper() == "GET" and not kwargs.get("stream"):
+                response = self._send_cached(uri, kwargs)
+            else:
+                response = self._send(method, uri, kwargs)
+            logger.info(RESPONSE_TEXT.format(response.log_repr()))
+            return response.body if parse else None, response
         except Exception as e:
-            logger.error(F"{e.__class__.__name__} create_api_token failed with error: {e}")
-            raise e
\ No newline at end of file
+            logger.error(F"{e.__class__.__name__} {method} {uri} failed with error: {e}")
+            raise e
+
+    def _send(self, method, uri, kwargs):
+        start = time.perf_counter()
+        _response = self.session.request(method, uri, **kwargs)
+        timings = dict(getattr(_response, "connection_timings", {}),
+                       ttfb=_response.elapsed.total_seconds(), total=time.perf_counter() - start)
+        return ApiResponse.from_requests(_response, timings, stream=kwargs.get("stream", False))
+
+    def _send_cached(self, uri, kwargs):
+        start = time.perf_counter()
+        with self.cache.flight(uri):
+            entry, fresh = self.cache.lookup(uri)
+            if fresh:
+                return entry.to_response({"total": time.perf_counter() - start})
+            if entry is not None:
+                kwargs["headers"] = dict(kwargs["headers"], **entry.conditional_headers())
+            response = self._send("GET", uri, kwargs)
+            if entry is not None and response.status_code == 304:
+                self.cache.store_revalidated(entry, response.headers)
+                return entry.to_response(response.timings)
+            self.cache.store_response(uri, response)
+            return response
+
+    @automation_logger(logger)
+    def get_manifest(self):
+        return self.request("GET", "manifest.json")
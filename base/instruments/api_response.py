@@ -0,0 +1,140 @@
+import json
+import hashlib
+from json import JSONDecodeError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from config_definitions import BaseConfig
+
+_NOT_PARSED = object()
+
+
+def loads(content):
+    """
+    Parse json straight from bytes, with orjson when it is installed.
+    :param content: json document bytes.
+    :return: parsed object.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            raise JSONDecodeError(str(e), "", 0)
+    return json.loads(content)
+
+
+class ApiResponse(object):
+    """
+    Transport independent response returned by the api clients next to the parsed body.
+    Mirrors the requests.Response attributes the tests rely on. The body is parsed from raw bytes on first access
+    and cached; a streamed response reads nothing until content, body or iter_json is used.
+    """
+
+    def __init__(self, url, status_code, reason, headers, content=None, timings=None, encoding=None, raw=None):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.timings = timings or {}
+        self.encoding = encoding or "utf-8"
+        self.from_cache = False
+        self._content = content
+        self._raw = raw
+        self._body = _NOT_PARSED
+
+    @classmethod
+    def from_requests(cls, response, timings=None, stream=False):
+        """
+        Wrap requests.Response without touching its body.
+        :param response: requests.Response.
+        :param timings: phase timings dict.
+        :param stream: response was requested with stream=True, body is read from response.raw on demand.
+        :return: ApiResponse.
+        """
+        raw = None
+        if stream:
+            raw = response.raw
+            raw.decode_content = True
+        return cls(response.url, response.status_code, response.reason, response.headers,
+                   None if stream else response.content, timings, response.encoding, raw)
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = self._raw.read() if self._raw is not None else b""
+            self._raw = None
+        return self._content
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        """
+        Parsed json document, decoded once and cached.
+        :return: parsed object, raises JSONDecodeError for non json body.
+        """
+        if self._body is _NOT_PARSED:
+            self._body = loads(self.content)
+        return self._body
+
+    @property
+    def body(self):
+        """
+        Parsed json or, if the body is not json, its text or the reason phrase for an empty body.
+        """
+        try:
+            return self.json()
+        except (JSONDecodeError, UnicodeDecodeError):
+            self._body = self.text or self.reason
+            return self._body
+
+    def iter_json(self, prefix="item"):
+        """
+        Iterate over parts of a large json document, e.g. elements of the top level array with prefix 'item'.
+        Parses incrementally from the stream with ijson when installed and the body was not read yet,
+        otherwise falls back to the cached parsed document (simple 'key.key.item' prefixes only).
+        :param prefix: ijson prefix of the objects to yield, '' for the whole document.
+        :return: iterator of parsed objects.
+        """
+        if ijson is not None and self._raw is not None and self._content is None:
+            raw, self._raw = self._raw, None
+            return ijson.items(raw, prefix)
+        document = self.json()
+        if not prefix:
+            return iter([document])
+        keys = prefix.split(".")
+        for key in keys[:-1]:
+            document = document[key]
+        return iter(document) if keys[-1] == "item" else iter([document[keys[-1]]])
+
+    def log_repr(self, limit=None):
+        """
+        Body representation for logs: the text itself up to limit bytes, a size and sha1 digest above it.
+        A streamed body that was not read yet is not read for logging.
+        :param limit: bytes threshold, config.cfg [API] log_body_limit by default.
+        :return: string.
+        """
+        limit = BaseConfig.API_LOG_BODY_LIMIT if limit is None else limit
+        if self._content is None:
+            return "<streamed body>"
+        if len(self._content) <= limit:
+            return self.text
+        head = self._content[:min(limit, 256)].decode(self.encoding, errors="replace")
+        return "<{0} bytes sha1={1}> {2}...".format(len(self._content), hashlib.sha1(self._content).hexdigest(),
+                                                    head)
+
+    def __repr__(self):
+        return "<ApiResponse [{0}] {1}>".format(self.status_code, self.url)
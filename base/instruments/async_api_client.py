@@ -0,0 +1,158 @@
+import time
+import asyncio
+
+import aiohttp
+
+from config_definitions import BaseConfig
+from base.constants import RESPONSE_TEXT
+from base.instruments.api_client import ApiClient
+from base.instruments.api_response import ApiResponse
+from base.logger import logger, automation_logger
+
+
+class AsyncApiClient(object):
+    """
+    asyncio counterpart of ApiClient for high-concurrency sweeps, returns the same (body, response) pairs.
+    Usage: async with AsyncApiClient() as client: ...
+    """
+    api_url = BaseConfig.BASE_URL
+    headers = {key: value for key, value in ApiClient.headers.items() if value is not None}
+
+    def __init__(self, concurrency=None, limit_per_host=None, timeout=None, api_url=None):
+        self.concurrency = concurrency or BaseConfig.ASYNC_API_CONCURRENCY
+        self.limit_per_host = limit_per_host or BaseConfig.ASYNC_API_LIMIT_PER_HOST
+        self.timeout = timeout or BaseConfig.API_TIMEOUT
+        self.api_url = api_url or self.api_url
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def open(self):
+        """
+        Create connection-limited aiohttp session bound to the running event loop.
+        """
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace_config.on_connection_create_start.append(self._on_connect_start)
+        trace_config.on_connection_create_end.append(self._on_connect_end)
+        trace_config.on_request_end.append(self._on_request_end)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.limit_per_host)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                              timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                              trace_configs=[trace_config])
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def request(self, method, path, parse=True, **kwargs):
+        """
+        Send request to api_url + path with bounded concurrency.
+        response.timings holds dns, connect (TLS handshake included, tls is always 0.0), ttfb and total seconds.
+        :param method: HTTP method.
+        :param path: path relative to api_url.
+        :param parse: return parsed body, otherwise None and response.body parses it on first access.
+        :param kwargs: aiohttp request keyword arguments.
+        :return: tuple of parsed body (json or text) and ApiResponse.
+        """
+        uri = self.api_url + path
+        timings = {"dns": 0.0, "connect": 0.0, "tls": 0.0, "reused": True}
+        try:
+            async with self._semaphore:
+                start = time.perf_counter()
+                async with self._session.request(method, uri, trace_request_ctx=timings, **kwargs) as _response:
+                    content = await _response.read()
+                timings["total"] = time.perf_counter() - start
+            response = ApiResponse(str(_response.url), _response.status, _response.reason, _response.headers,
+                                   content, timings, _response.charset)
+            logger.debug(RESPONSE_TEXT.format(response.log_repr()))
+            return response.body if parse else None, response
+        except Exception as e:
+            logger.error(F"{e.__class__.__name__} {method} {uri} failed with error: {e}")
+            raise e
+
+    async def get_manifest(self):
+        return await self.request("GET", "manifest.json")
+
+    async def fetch_many(self, paths, method="GET", parse=True, **kwargs):
+        """
+        Request all paths keeping at most `concurrency` in flight and yield results as they complete.
+        :param paths: iterable of paths relative to api_url.
+        :param method: HTTP method.
+        :param parse: parse bodies eagerly, see request.
+        :param kwargs: aiohttp request keyword arguments.
+        :return: async generator of (path, result), result is (body, response) or the raised exception. Requests
+        still in flight are cancelled when the generator is closed before it is exhausted.
+        """
+        paths = iter(paths)
+        pending = {}
+
+        def schedule():
+            for path in paths:
+                pending[asyncio.ensure_future(self.request(method, path, parse, **kwargs))] = path
+                if len(pending) >= self.concurrency:
+                    break
+
+        schedule()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    path = pending.pop(task)
+                    if task.cancelled():
+                        yield path, asyncio.CancelledError()
+                    else:
+                        yield path, task.exception() or task.result()
+                schedule()
+        finally:
+            # The consumer stopped early (break + aclose, or an error): do not leave requests running.
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    @automation_logger(logger)
+    def run(coroutine):
+        """
+        Run coroutine to completion from synchronous test code.
+        :param coroutine: coroutine object.
+        :return: coroutine result.
+        """
+        return asyncio.run(coroutine)
+
+    @staticmethod
+    async def _on_request_start(session, ctx, params):
+        ctx.trace_request_ctx["start"] = time.perf_counter()
+
+    @staticmethod
+    async def _on_dns_start(session, ctx, params):
+        ctx.trace_request_ctx["dns_start"] = time.perf_counter()
+
+    @staticmethod
+    async def _on_dns_end(session, ctx, params):
+        ctx.trace_request_ctx["dns"] = time.perf_counter() - ctx.trace_request_ctx.pop("dns_start")
+
+    @staticmethod
+    async def _on_connect_start(session, ctx, params):
+        ctx.trace_request_ctx["connect_start"] = time.perf_counter()
+
+    @staticmethod
+    async def _on_connect_end(session, ctx, params):
+        timings = ctx.trace_request_ctx
+        timings["connect"] = time.perf_counter() - timings.pop("connect_start") - timings["dns"]
+        timings["reused"] = False
+
+    @staticmethod
+    async def _on_request_end(session, ctx, params):
+        ctx.trace_request_ctx["ttfb"] = time.perf_counter() - ctx.trace_request_ctx.pop("start")
@@ -1,28 +1,101 @@
-import time
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver import ActionChains
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.select import Select
-from selenium.webdriver.support.wait import WebDriverWait
+import weakref
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
+from config_definitions import BaseConfig
 from base.enums import DriverHelper
+from base.instruments.action_pipeline import ActionPipeline
+from base.instruments.locator import Locator, STRATEGIES
+from base.instruments.page_readiness import PageReadiness
+from base.instruments.wait_engine import WaitEngine
 from base.logger import automation_logger, logger
-from selenium.webdriver.support import expected_conditions as ec
+from base.utils.lazy_import import LazyImport
+
+# selenium.webdriver is imported on first use, so api-only runs never load it.
+By = LazyImport("selenium.webdriver.common.by", "By")
+Keys = LazyImport("selenium.webdriver.common.keys", "Keys")
+Select = LazyImport("selenium.webdriver.support.select", "Select")
+WebDriverWait = LazyImport("selenium.webdriver.support.wait", "WebDriverWait")
+ec = LazyImport("selenium.webdriver.support.expected_conditions")
+Actions = LazyImport("base.instruments.actions", "Actions")
+
+# Shared by find_many and snapshot: resolves {name: [kind, value]} pairs, kind is "xpath" or "css".
+LOCATE_SCRIPT = """
+function locate(kind, value) {
+    try {
+        return kind === 'xpath' ? document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE,
+                                                    null).singleNodeValue : document.querySelector(value);
+    } catch (e) {
+        return null;
+    }
+}
+"""
+
+FIND_MANY_SCRIPT = LOCATE_SCRIPT + """
+var locators = arguments[0], result = {};
+for (var name in locators) { result[name] = locate(locators[name][0], locators[name][1]); }
+return result;
+"""
+
+SNAPSHOT_SCRIPT = LOCATE_SCRIPT + """
+var locators = arguments[0], attributes = arguments[1], result = {};
+for (var name in locators) {
+    var element = locate(locators[name][0], locators[name][1]);
+    if (!element) { result[name] = null; continue; }
+    var style = window.getComputedStyle(element), rect = element.getBoundingClientRect(), values = {};
+    for (var i = 0; i < attributes.length; i++) { values[attributes[i]] = element.getAttribute(attributes[i]); }
+    result[name] = {
+        text: element.innerText !== undefined ? element.innerText : element.textContent,
+        visible: style.display !== 'none' && style.visibility !== 'hidden' && (rect.width > 0 || rect.height > 0),
+        enabled: !element.disabled,
+        attributes: values
+    };
+}
+return result;
+"""
+
+# Locator kinds expressible as css, by DriverHelper / selenium By name. Ids and names are matched as quoted
+# attribute values, so any value By.ID or By.NAME accepts (leading digits, colons, dots) is a valid selector.
+CSS_TEMPLATES = {"id": "[id='{0}']", "name": "[name='{0}']", "class_name": ".{0}", "class name": ".{0}",
+                 "tag_name": "{0}", "tag name": "{0}", "css_selector": "{0}", "css selector": "{0}"}
+CSS_QUOTED = ("id", "name")
 
 
 class Browser:
+    # Drivers with the window already sized, see size_window.
+    _sized_drivers = weakref.WeakSet()
+
     @classmethod
     @automation_logger(logger)
-    def go_to_url(cls, driver, url):
+    def go_to_url(cls, driver, url, readiness=None):
         """
-        Browse the given url by passed driver instance.
+        Browse the given url by passed driver instance and wait for the page to be ready.
         :param driver: web_driver instance.
         :param url: string url to browse.
-        :return: web_driver state.
+        :param readiness: PageReadiness policy: none, load, network_idle or quiescent, [PAGE] readiness by default.
+        :return: True if the page is ready, False otherwise.
         """
+        cls.size_window(driver)
+        PageReadiness.prepare(driver)
         driver.get(url)
-        return driver.maximize_window()
+        Locator.navigated(driver)
+        return PageReadiness.wait(driver, readiness)
+
+    @classmethod
+    @automation_logger(logger)
+    def size_window(cls, driver):
+        """
+        Maximize browser window once per session, [PAGE] maximize = false leaves it as started.
+        :param driver: web_driver instance.
+        """
+        if not BaseConfig.PAGE_MAXIMIZE:
+            return
+        try:
+            if driver in cls._sized_drivers:
+                return
+            cls._sized_drivers.add(driver)
+        except TypeError:
+            pass
+        driver.maximize_window()
 
     @classmethod
     @automation_logger(logger)
@@ -52,6 +125,42 @@ class Browser:
         """
         cls.close_driver_instance(driver)
 
+    @classmethod
+    @automation_logger(logger)
+    def reset_session(cls, driver, blank_url="about:blank"):
+        """
+        Bring reused browser session to a clean state: web storage and cookies cleared, extra tabs closed and
+        blank page opened. Storage is cleared before leaving the page because about:blank has no storage access.
+        :param driver: web_driver instance.
+        :param blank_url: url to leave the session on.
+        """
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException as e:
+            logger.debug(F"{e.__class__.__name__} reset_session skipped storage clearing: {e}")
+        driver.delete_all_cookies()
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get(blank_url)
+        Locator.navigated(driver)
+
+    @classmethod
+    @automation_logger(logger)
+    def is_session_alive(cls, driver):
+        """
+        Cheap health check of a browser session.
+        :param driver: web_driver instance.
+        :return: True if the session answers, False otherwise.
+        """
+        try:
+            return len(driver.window_handles) > 0
+        except WebDriverException as e:
+            logger.error(F"{e.__class__.__name__} is_session_alive raising error: {e}")
+            return False
+
     @classmethod
     @automation_logger(logger)
     def driver_wait(cls, driver, delay):
@@ -115,8 +224,7 @@ class Browser:
         @param attribute: attribute string.
         :return: attribute value.
         """
-        element = cls.find_element(driver, locator)
-        return element.get_attribute(attribute)
+        return cls.act_on_element(driver, locator, lambda element: element.get_attribute(attribute))
 
     @classmethod
     @automation_logger(logger)
@@ -144,6 +252,7 @@ class Browser:
         """
         try:
             driver.find_element_by_tag_name('body').send_keys(Keys.CONTROL + 'w')
+            Locator.navigated(driver)
         except TimeoutException as e:
             logger.error("{0} method close_tab failed with error {0}".format(e.__class__.__name__, e.__cause__),
                                 e)
@@ -178,18 +287,15 @@ class Browser:
     @automation_logger(logger)
     def try_click(cls, driver, element, delay=1.0):
         """
-        Clicks with time delay between actions.
+        Moves to element, waits for it to be enabled, clicks and waits for the page to stop changing. The page
+        settling is best effort: a DOM that keeps changing for delay seconds is logged, not raised.
         :param driver: web_driver instance.
         :param element: web element.
-        :param delay: seconds to wait.
-        :return: browser state with performed actions.
+        :param delay: seconds to wait at every sync point.
+        :return: list of StepTiming of the performed steps (perform() of the former ActionChains returned None).
         """
-        action = Actions(driver)
-        action.move_to_element(element)
-        action.wait(delay)
-        action.click(element)
-        action.wait(delay)
-        return action.perform()
+        return ActionPipeline(driver, delay).move_to(element).enabled(element).click(element) \
+            .quiescent(required=False).perform()
 
     @classmethod
     @automation_logger(logger)
@@ -200,6 +306,7 @@ class Browser:
         """
         try:
             driver.find_element_by_tag_name('body').send_keys(Keys.COMMAND + 'r')
+            Locator.navigated(driver)
         except TimeoutException as e:
             logger.exception(F"{e.__class__.__name__} method refresh_page failed with error {e}")
 
@@ -211,6 +318,7 @@ class Browser:
         :param driver: web_driver instance.
         """
         driver.refresh()
+        Locator.navigated(driver)
 
     @classmethod
     @automation_logger(logger)
@@ -220,6 +328,7 @@ class Browser:
         :param driver: web_driver instance.
         """
         driver.navigate().back()
+        Locator.navigated(driver)
 
     @classmethod
     @automation_logger(logger)
@@ -229,6 +338,7 @@ class Browser:
         :param driver: web_driver instance.
         """
         driver.navigate().forward()
+        Locator.navigated(driver)
 
     @classmethod
     @automation_logger(logger)
@@ -238,6 +348,7 @@ class Browser:
         :param driver: web_driver instance.
         """
         driver.execute_script("window.history.go(-1)")
+        Locator.navigated(driver)
 
     @classmethod
     @automation_logger(logger)
@@ -295,8 +406,7 @@ class Browser:
         :param attribute: attribute string.
         :return: attribute value.
         """
-        element = cls.find_element(driver, locator)
-        return element.get_attribute(attribute)
+        return cls.act_on_element(driver, locator, lambda element: element.get_attribute(attribute))
 
     @classmethod
     @automation_logger(logger)
@@ -309,7 +419,7 @@ class Browser:
         :return: web element.
         """
         try:
-            return cls.driver_wait(driver, delay).until(lambda x: x.find_element_by_xpath(locator))
+            return WaitEngine.until(driver, "present", locator, delay)
         except TimeoutException as e:
             logger.error(F"{e.__class__.__name__} search_element raising error: {e}")
             return False
@@ -393,7 +503,7 @@ class Browser:
         :return: web element if element presented and False otherwise.
         """
         try:
-            return cls.driver_wait(driver, delay).until_not(ec.presence_of_element_located((By.XPATH, locator)))
+            return WaitEngine.until(driver, "absent", locator, delay)
         except TimeoutException as e:
             logger.error(F"{e.__class__.__name__} check_element_not_presented raising error: {e}")
             return False
@@ -425,7 +535,7 @@ class Browser:
         :return: True if matches condition and False otherwise.
         """
         try:
-            return cls.driver_wait(driver, delay).until(ec.url_contains(url))
+            return WaitEngine.until(driver, "url_contains", url, delay)
         except TimeoutException as e:
             logger.error(F"{e.__class__.__name__} wait_url_contains raising error: {e}")
             return False
@@ -457,7 +567,7 @@ class Browser:
         :return: web element.
         """
         try:
-            return cls.driver_wait(driver, delay).until(ec.visibility_of_element_located((By.XPATH, locator)))
+            return WaitEngine.until(driver, "visible", locator, delay)
         except TimeoutException as e:
             logger.error(F"{e.__class__.__name__} wait_element_visible raising error: {e}")
             return False
@@ -473,7 +583,7 @@ class Browser:
         :return: web element.
         """
         try:
-            return cls.driver_wait(driver, delay).until(ec.presence_of_element_located((By.XPATH, locator)))
+            return WaitEngine.until(driver, "present", locator, delay)
         except TimeoutException as e:
             logger.error(F"{e.__class__.__name__} wait_element_presented raising error: {e}")
             return False
@@ -505,7 +615,7 @@ class Browser:
         :return: web element.
         """
         try:
-            return cls.driver_wait(driver, delay).until(ec.element_to_be_clickable((By.XPATH, locator)))
+            return WaitEngine.until(driver, "clickable", locator, delay)
         except Exception as e:
             logger.error(F"{e.__class__.__name__} wait_element_clickable raising error: {e}")
             return False
@@ -516,11 +626,29 @@ class Browser:
         """
         Find a web element without waiting by locator.
         :param driver: web_driver instance.
-        :param locator: xpath of a element.
+        :param locator: xpath of a element or Locator, which returns its remembered element of the current page.
+        The element may turn stale when the page re-renders, act on it through act_on_element to look it up again.
         :return: web element.
         """
+        if isinstance(locator, Locator):
+            return locator.find(driver)
         return driver.find_element_by_xpath(locator)
 
+    @classmethod
+    @automation_logger(logger)
+    def act_on_element(cls, driver, locator, action):
+        """
+        Find a web element and call action with it. A remembered element of a Locator that turned stale (e.g. the
+        page re-rendered it) is forgotten and looked up again once.
+        :param driver: web_driver instance.
+        :param locator: xpath of a element or Locator.
+        :param action: callable taking web element.
+        :return: result of action.
+        """
+        if isinstance(locator, Locator):
+            return locator.use(driver, action)
+        return action(driver.find_element_by_xpath(locator))
+
     @classmethod
     @automation_logger(logger)
     def find_element_by(cls, driver, locator, by):
@@ -531,24 +659,8 @@ class Browser:
         :param by: selenium option to search web element.
         :return: web element.
         """
-        by = by.lower()
         try:
-            if by == DriverHelper.ID.value:
-                return driver.find_element(By.ID, locator)
-            elif by == DriverHelper.NAME.value:
-                return driver.find_element(By.NAME, locator)
-            elif by == DriverHelper.CLASS_NAME.value:
-                return driver.find_element(By.CLASS_NAME, locator)
-            elif by == DriverHelper.TAG_NAME.value:
-                return driver.find_element(By.TAG_NAME, locator)
-            elif by == DriverHelper.LINK_TEXT.value:
-                return driver.find_element(By.LINK_TEXT, locator)
-            elif by == DriverHelper.CSS_SELECTOR.value:
-                return driver.find_element(By.CSS_SELECTOR)
-            elif by == DriverHelper.PARTIAL_LINK_TEXT.value:
-                return driver.find_element(By.PARTIAL_LINK_TEXT, locator)
-            else:
-                return driver.find_element(By.XPATH, locator)
+            return driver.find_element(STRATEGIES.get(by.lower(), By.XPATH), locator)
         except Exception as e:
             logger.error(e)
             return False
@@ -564,8 +676,52 @@ class Browser:
         """
         return [i for i in driver.find_elements_by_xpath(locator)]
 
+    @classmethod
+    @automation_logger(logger)
+    def find_many(cls, driver, locators):
+        """
+        Find many web elements in one WebDriver round trip.
+        :param driver: web_driver instance.
+        :param locators: dict of name to xpath or to (by, selector) tuple, by is xpath, css_selector, id, name,
+        class_name or tag_name.
+        :return: dict of name to web element, None for elements not found.
+        """
+        elements = driver.execute_script(FIND_MANY_SCRIPT, cls._script_locators(locators))
+        for name, locator in locators.items():
+            if isinstance(locator, Locator) and elements.get(name) is not None:
+                locator.remember(driver, elements[name])
+        return elements
+
+    @classmethod
+    @automation_logger(logger)
+    def snapshot(cls, driver, locators, attributes=()):
+        """
+        Read state of many web elements in one WebDriver round trip.
+        :param driver: web_driver instance.
+        :param locators: dict of name to locator, as for find_many.
+        :param attributes: names of attributes to read from every element.
+        :return: dict of name to {"text", "visible", "enabled", "attributes"}, None for elements not found.
+        """
+        return driver.execute_script(SNAPSHOT_SCRIPT, cls._script_locators(locators), list(attributes))
+
+    @staticmethod
+    def _script_locators(locators):
+        pairs = {}
+        for name, locator in locators.items():
+            if isinstance(locator, Locator):
+                by, value = locator.selector
+            elif isinstance(locator, str):
+                by, value = DriverHelper.XPATH.value, locator
+            else:
+                by, value = locator
+            by = by.lower()
+            if by == DriverHelper.XPATH.value:
+                pairs[name] = ["xpath", value]
+            elif by in CSS_TEMPLATES:
+                if by in CSS_QUOTED:
+                    value = value.replace("\\", "\\\\").replace("'", "\\'")
+                pairs[name] = ["css", CSS_TEMPLATES[by].format(value)]
+            else:
+                raise ValueError(F"find_many supports xpath and css expressible locators, got {by} for {name}")
+        return pairs
 
-class Actions(ActionChains):
-    def wait(self, delay: float):
-        self._actions.append(lambda: time.sleep(delay))
-        return self
@@ -0,0 +1,149 @@
+import sys
+import bisect
+import threading
+
+from base.instruments import browser
+
+# Upper bounds of histogram buckets in ms, the last bucket is unbounded.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+DIRECT = "(not in Browser)"
+
+
+class Histogram:
+    """
+    Latency histogram with fixed log-scale buckets; percentiles are estimated as the bucket upper bound.
+    """
+
+    def __init__(self, count=0, total=0.0, maximum=0.0, failed=0, buckets=None):
+        self.count = count
+        self.total = total
+        self.maximum = maximum
+        self.failed = failed
+        self.buckets = list(buckets or [0] * (len(BUCKETS_MS) + 1))
+
+    def add(self, seconds, failed=False):
+        ms = seconds * 1000
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, ms)
+        self.failed += failed
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+        self.failed += other.failed
+        self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, other.buckets)]
+
+    def percentile(self, fraction):
+        """
+        :param fraction: 0.5 for median, 0.95 for p95.
+        :return: upper bound of the bucket in ms, maximum for the unbounded bucket.
+        """
+        rank, seen = fraction * self.count, 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(BUCKETS_MS[index], self.maximum) if index < len(BUCKETS_MS) else self.maximum
+        return 0.0
+
+    def to_dict(self):
+        return {"count": self.count, "total_s": self.total, "mean_ms": self.total * 1000 / self.count if self.count
+                else 0.0, "p50_ms": self.percentile(0.5), "p95_ms": self.percentile(0.95), "max_ms": self.maximum,
+                "failed": self.failed, "buckets": self.buckets}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["count"], data["total_s"], data["max_ms"], data["failed"], data["buckets"])
+
+
+class CommandStats:
+    """
+    Run-wide latency histograms of WebDriver commands, per command (findElement, clickElement, get, executeScript...)
+    and per Browser helper method the command was sent from (the outermost Browser frame on the stack).
+    Fed by CommandTimer: CommandTimer.add_listener(command_stats.record)
+    """
+
+    browser_file = browser.__file__
+
+    def __init__(self):
+        self.commands = {}
+        self.helpers = {}
+        self._lock = threading.Lock()
+
+    def record(self, driver, command, seconds, failed):
+        """
+        CommandTimer listener.
+        :param driver: web_driver instance.
+        :param command: WebDriver command name.
+        :param seconds: command latency.
+        :param failed: True if the command raised.
+        """
+        helper = self.helper_of(sys._getframe(1))
+        with self._lock:
+            self._histogram(self.commands, command).add(seconds, failed)
+            self._histogram(self.helpers, helper).add(seconds, failed)
+
+    @classmethod
+    def helper_of(cls, frame):
+        """
+        :param frame: stack frame to start at.
+        :return: "Browser.<method>" of the outermost Browser frame, DIRECT if there is none.
+        """
+        helper = None
+        while frame is not None:
+            if frame.f_code.co_filename == cls.browser_file and not frame.f_code.co_name.startswith("<"):
+                helper = frame.f_code.co_name
+            frame = frame.f_back
+        return "Browser." + helper if helper else DIRECT
+
+    @property
+    def total(self):
+        """
+        :return: seconds spent in WebDriver commands.
+        """
+        return sum(histogram.total for histogram in self.commands.values())
+
+    def merge(self, data):
+        """
+        Add stats exported by to_dict(), e.g. of a parallel worker.
+        :param data: result of to_dict().
+        """
+        with self._lock:
+            for attribute in ("commands", "helpers"):
+                for name, histogram in data.get(attribute, {}).items():
+                    self._histogram(getattr(self, attribute), name).merge(Histogram.from_dict(histogram))
+
+    def to_dict(self):
+        with self._lock:
+            return {"buckets_ms": list(BUCKETS_MS), "command_s": self.total,
+                    "commands": {name: histogram.to_dict() for name, histogram in sorted(self.commands.items())},
+                    "helpers": {name: histogram.to_dict() for name, histogram in sorted(self.helpers.items())}}
+
+    def table(self, attribute, top=10):
+        """
+        :param attribute: commands or helpers.
+        :param top: number of rows, by total time.
+        :return: text lines of the hot spot table.
+        """
+        with self._lock:
+            rows = sorted(getattr(self, attribute).items(), key=lambda item: item[1].total, reverse=True)[:top]
+        lines = ["{0:<44}{1:>8}{2:>10}{3:>10}{4:>10}{5:>10}{6:>10}".format(
+            attribute, "count", "total s", "mean ms", "p50 ms", "p95 ms", "max ms")]
+        for name, histogram in rows:
+            data = histogram.to_dict()
+            lines.append("{0:<44}{1:>8}{2:>10.3f}{3:>10.1f}{4:>10.1f}{5:>10.1f}{6:>10.1f}".format(
+                name[:43], data["count"], data["total_s"], data["mean_ms"], data["p50_ms"], data["p95_ms"],
+                data["max_ms"]))
+        return lines
+
+    @staticmethod
+    def _histogram(histograms, name):
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram()
+        return histogram
+
+
+command_stats = CommandStats()
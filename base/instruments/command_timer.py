@@ -0,0 +1,54 @@
+import time
+import threading
+
+
+class CommandTimer:
+    """
+    Times every WebDriver protocol command of a driver by wrapping its execute method, once per driver.
+    Listeners are called with (driver, command, seconds, failed) after every command, e.g. PerfCapture.
+    """
+
+    _listeners = []
+    _lock = threading.Lock()
+
+    @classmethod
+    def install(cls, driver):
+        """
+        Wrap driver.execute, a no-op if it is wrapped already.
+        :param driver: web_driver instance.
+        :return: web_driver instance.
+        """
+        with cls._lock:
+            execute = driver.execute
+            if getattr(execute, "_command_timer", False):
+                return driver
+
+            def timed_execute(driver_command, params=None):
+                start = time.perf_counter()
+                failed = True
+                try:
+                    result = execute(driver_command, params)
+                    failed = False
+                    return result
+                finally:
+                    seconds = time.perf_counter() - start
+                    for listener in cls._listeners:
+                        listener(driver, driver_command, seconds, failed)
+
+            timed_execute._command_timer = True
+            driver.execute = timed_execute
+        return driver
+
+    @classmethod
+    def add_listener(cls, listener):
+        """
+        :param listener: callable(driver, command, seconds, failed).
+        """
+        with cls._lock:
+            if listener not in cls._listeners:
+                cls._listeners = cls._listeners + [listener]
+
+    @classmethod
+    def remove_listener(cls, listener):
+        with cls._lock:
+            cls._listeners = [item for item in cls._listeners if item != listener]
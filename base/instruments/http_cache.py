@@ -0,0 +1,248 @@
+import os
+import re
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from email.utils import parsedate_to_datetime
+from requests.structures import CaseInsensitiveDict
+
+from base.instruments.api_response import ApiResponse
+from base.logger import logger, automation_logger
+
+
+class CacheEntry(object):
+    """
+    Stored response together with its freshness lifetime and validators.
+    """
+
+    def __init__(self, url, status_code, reason, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.refresh(headers)
+
+    def refresh(self, headers):
+        """
+        Recompute freshness from (revalidation) response headers.
+        :param headers: response headers.
+        """
+        self.headers.update({key: value for key, value in headers.items()
+                             if key.lower() in ("cache-control", "expires", "etag", "last-modified", "date")})
+        directives = parse_cache_control(self.headers.get("Cache-Control", ""))
+        self.stored_at = time.time()
+        self.no_cache = "no-cache" in directives
+        self.etag = self.headers.get("ETag")
+        self.last_modified = self.headers.get("Last-Modified")
+        if "max-age" in directives:
+            self.max_age = directives["max-age"]
+        elif self.headers.get("Expires"):
+            self.max_age = _seconds_until(self.headers["Expires"])
+        else:
+            self.max_age = 0
+
+    @property
+    def fresh(self):
+        return not self.no_cache and time.time() - self.stored_at < self.max_age
+
+    @property
+    def size(self):
+        return len(self.content)
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, timings=None):
+        response = ApiResponse(self.url, self.status_code, self.reason, self.headers, self.content, timings)
+        response.from_cache = True
+        return response
+
+
+def parse_cache_control(value):
+    """
+    Parse Cache-Control header into {directive: seconds or True}.
+    :param value: header value.
+    :return: dict of directives.
+    """
+    directives = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if not name:
+            continue
+        argument = argument.strip('"')
+        directives[name.lower()] = int(argument) if re.fullmatch(r"\d+", argument) else True
+    return directives
+
+
+def _seconds_until(http_date):
+    try:
+        return parsedate_to_datetime(http_date).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return 0
+
+
+class MemoryStore(object):
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def put(self, key, entry):
+        self._entries[key] = entry
+
+    def delete(self, key):
+        self._entries.pop(key, None)
+
+    def sizes(self):
+        return []
+
+
+class DiskStore(object):
+    """
+    Entries pickled into directory, one file per url, least recently used first when listed.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".entry")
+
+    def get(self, key):
+        return self._load(self._path(key))
+
+    def put(self, key, entry):
+        path = self._path(key)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def sizes(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".entry"):
+                path = os.path.join(self.directory, name)
+                entry = self._load(path)
+                if entry is not None:
+                    entries.append((os.path.getmtime(path), entry.url, entry.size))
+        return [(url, size) for _, url, size in sorted(entries)]
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+
+class HttpCache(object):
+    """
+    Size-bounded LRU cache of GET responses honoring Cache-Control (no-store, no-cache, max-age) and Expires.
+    Stale entries with ETag / Last-Modified are revalidated with conditional requests.
+    Entries live in memory or, with directory, on disk so they survive between runs.
+    Thread safe: counters change under the cache lock and flight(url) lets one request per url go to the network at a
+    time, so concurrent misses on a url are fetched once.
+    """
+
+    def __init__(self, max_bytes, directory=None):
+        self.max_bytes = max_bytes
+        self.store = DiskStore(directory) if directory else MemoryStore()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lru = OrderedDict(self.store.sizes())
+        self._lock = threading.Lock()
+        self._flights = defaultdict(threading.Lock)
+
+    def flight(self, url):
+        """
+        :param url: request url.
+        :return: lock to hold from lookup until the response is stored, one per url.
+        """
+        with self._lock:
+            return self._flights[url]
+
+    def lookup(self, url):
+        """
+        Stored entry of url; a fresh one counts as a hit.
+        :param url: request url.
+        :return: (stored CacheEntry or None, True if the entry is fresh).
+        """
+        with self._lock:
+            if url not in self._lru:
+                return None, False
+            entry = self.store.get(url)
+            if entry is None:
+                del self._lru[url]
+                return None, False
+            self._lru.move_to_end(url)
+            fresh = entry.fresh
+            if fresh:
+                self.hits += 1
+            return entry, fresh
+
+    def store_response(self, url, response):
+        """
+        Count a miss and store 200 response unless it is marked no-store or exceeds the cache size.
+        :param url: request url.
+        :param response: ApiResponse fetched from the network.
+        :return: stored CacheEntry or None.
+        """
+        directives = parse_cache_control(response.headers.get("Cache-Control", ""))
+        if response.status_code != 200 or "no-store" in directives or len(response.content) > self.max_bytes:
+            with self._lock:
+                self.misses += 1
+            return None
+        entry = CacheEntry(url, response.status_code, response.reason, response.headers, response.content)
+        with self._lock:
+            self.misses += 1
+            self.store.put(url, entry)
+            self._lru[url] = entry.size
+            self._lru.move_to_end(url)
+            self._evict()
+        return entry
+
+    def store_revalidated(self, entry, headers):
+        """
+        Count a revalidation and extend the freshness of an entry confirmed by a 304 response.
+        :param entry: CacheEntry.
+        :param headers: 304 response headers.
+        """
+        with self._lock:
+            self.revalidations += 1
+            entry.refresh(headers)
+            self.store.put(entry.url, entry)
+
+    def _evict(self):
+        total = sum(self._lru.values())
+        while total > self.max_bytes and self._lru:
+            url, size = self._lru.popitem(last=False)
+            self.store.delete(url)
+            total -= size
+
+    @automation_logger(logger)
+    def report(self):
+        """
+        :return: dict of cache counters.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "revalidations": self.revalidations,
+                    "entries": len(self._lru), "bytes": sum(self._lru.values())}
@@ -0,0 +1,84 @@
+import time
+import socket
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+
+class _TimedConnectionMixin:
+    """
+    Resolves the host separately from the TCP connect so both phases can be timed. Timings of a new connection are
+    kept until the response built on top of it reads them, a reused keep-alive connection reports none.
+    """
+
+    timings = None
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host.strip("[]"), self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.error as e:
+            raise NewConnectionError(self, "Failed to establish a new connection: %s" % e)
+        resolved = time.perf_counter()
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address[4][0]
+                try:
+                    conn = super(_TimedConnectionMixin, self)._new_conn()
+                except NewConnectionError as e:
+                    error = e
+                    continue
+                self.timings = {"dns": resolved - start, "connect": time.perf_counter() - resolved}
+                return conn
+        finally:
+            self._dns_host = host
+        raise error
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+
+    def connect(self):
+        start = time.perf_counter()
+        super(TimedHTTPSConnection, self).connect()
+        if self.timings is not None:
+            self.timings["tls"] = time.perf_counter() - start - self.timings["dns"] - self.timings["connect"]
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    requests adapter exposing connection phase timings as response.connection_timings:
+    dns, connect and tls seconds for a new connection, empty dict with reused=True for a keep-alive one.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(TimedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+    def build_response(self, req, resp):
+        response = super(TimedHTTPAdapter, self).build_response(req, resp)
+        connection = getattr(resp, "_connection", None)
+        timings = getattr(connection, "timings", None)
+        if timings is None:
+            response.connection_timings = {"dns": 0.0, "connect": 0.0, "tls": 0.0, "reused": True}
+        else:
+            connection.timings = None
+            response.connection_timings = dict({"tls": 0.0, "reused": False}, **timings)
+        return response
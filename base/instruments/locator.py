@@ -0,0 +1,146 @@
+import weakref
+from selenium.common.exceptions import StaleElementReferenceException
+
+from base.enums import DriverHelper
+
+# DriverHelper names and selenium By values to selenium By values (the WebDriver protocol strategy names), spelled
+# out so that locators are defined without importing selenium.webdriver.
+XPATH = "xpath"
+STRATEGIES = {
+    DriverHelper.ID.value: "id",
+    DriverHelper.XPATH.value: XPATH,
+    DriverHelper.CLASS_NAME.value: "class name",
+    DriverHelper.NAME.value: "name",
+    DriverHelper.TAG_NAME.value: "tag name",
+    DriverHelper.LINK_TEXT.value: "link text",
+    DriverHelper.CSS_SELECTOR.value: "css selector",
+    DriverHelper.PARTIAL_LINK_TEXT.value: "partial link text",
+}
+STRATEGIES.update({by: by for by in list(STRATEGIES.values())})
+
+
+def strategy(by):
+    """
+    :param by: DriverHelper name or selenium By value, any case.
+    :return: selenium By value.
+    :raise ValueError: unknown strategy.
+    """
+    try:
+        return STRATEGIES[by.lower()]
+    except KeyError:
+        raise ValueError(F"Unknown locator strategy: {by}")
+
+
+class Locator(str):
+    """
+    Locator string with its selenium strategy resolved once, usable wherever an xpath string is expected.
+    The last element found by every driver is remembered until the driver navigates (see navigated) or the element
+    turns stale, so repeated lookups within one page state do not reach the driver.
+    """
+
+    # Navigation counter of every driver; remembered elements of an older navigation are not used.
+    _epochs = weakref.WeakKeyDictionary()
+
+    def __new__(cls, value, by=XPATH, name=None):
+        locator = super(Locator, cls).__new__(cls, value)
+        locator.by = strategy(by)
+        locator.name = name
+        locator._elements = weakref.WeakKeyDictionary()
+        return locator
+
+    def __repr__(self):
+        return "Locator({0!r}, by={1!r})".format(str(self), self.by)
+
+    @property
+    def selector(self):
+        """
+        :return: (by, value) tuple as accepted by selenium expected conditions.
+        """
+        return self.by, str(self)
+
+    @classmethod
+    def navigated(cls, driver):
+        """
+        Forget elements remembered for driver by all locators.
+        :param driver: web_driver instance.
+        """
+        try:
+            cls._epochs[driver] = cls._epochs.get(driver, 0) + 1
+        except TypeError:
+            pass
+
+    @classmethod
+    def _epoch(cls, driver):
+        try:
+            return cls._epochs.get(driver, 0)
+        except TypeError:
+            return None
+
+    def remember(self, driver, element):
+        """
+        Remember element found for this locator by other means (e.g. Browser.find_many).
+        :param driver: web_driver instance.
+        :param element: web element.
+        """
+        epoch = self._epoch(driver)
+        if epoch is not None:
+            self._elements[driver] = (epoch, element)
+
+    def forget(self, driver):
+        """
+        :param driver: web_driver instance.
+        """
+        try:
+            self._elements.pop(driver, None)
+        except TypeError:
+            pass
+
+    def find(self, driver):
+        """
+        Remembered element of the current page state or a new driver lookup.
+        :param driver: web_driver instance.
+        :return: web element.
+        """
+        epoch = self._epoch(driver)
+        remembered = self._elements.get(driver) if epoch is not None else None
+        if remembered is not None and remembered[0] == epoch:
+            return remembered[1]
+        element = driver.find_element(self.by, str(self))
+        self.remember(driver, element)
+        return element
+
+    def use(self, driver, action):
+        """
+        Call action with the element, looking it up again once if the remembered one is stale.
+        :param driver: web_driver instance.
+        :param action: callable taking web element.
+        :return: result of action.
+        """
+        try:
+            return action(self.find(driver))
+        except StaleElementReferenceException:
+            self.forget(driver)
+            return action(self.find(driver))
+
+
+class LocatorTemplate(object):
+    """
+    Parametrized locator, e.g. BOARD_CELL(2, 3). Every distinct set of arguments gives the same Locator instance,
+    so elements remembered by it are shared between lookups.
+    """
+
+    def __init__(self, pattern, by=XPATH, name=None):
+        self.pattern = pattern
+        self.by = strategy(by)
+        self.name = name
+        self._locators = {}
+
+    def __call__(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        locator = self._locators.get(key)
+        if locator is None:
+            locator = self._locators[key] = Locator(self.pattern.format(*args, **kwargs), self.by, self.name)
+        return locator
+
+    def __repr__(self):
+        return "LocatorTemplate({0!r}, by={1!r})".format(self.pattern, self.by)
@@ -0,0 +1,113 @@
+import weakref
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from config_definitions import BaseConfig
+from base.instruments.wait_engine import WaitEngine
+from base.logger import automation_logger, logger
+
+# Counts in-flight fetch / XHR requests of the page. Installed before page scripts run where CDP is available,
+# otherwise right after navigation; installing twice is a no-op. Animation frames are not tracked: pages with a
+# continuous requestAnimationFrame loop (spinners, carousels, charts) would never be idle.
+TRACKER_SCRIPT = """
+(function () {
+    if (window.__pageTracker) return;
+    var tracker = window.__pageTracker = {requests: 0, lastActivity: Date.now()};
+    function touch(delta, key) { tracker[key] = Math.max(0, tracker[key] + delta); tracker.lastActivity = Date.now(); }
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            touch(1, 'requests');
+            return fetch.apply(this, arguments).then(
+                function (response) { touch(-1, 'requests'); return response; },
+                function (error) { touch(-1, 'requests'); throw error; });
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        touch(1, 'requests');
+        this.addEventListener('loadend', function () { touch(-1, 'requests'); });
+        return send.apply(this, arguments);
+    };
+})();
+"""
+
+# Resolves true when the document is loaded, no tracked request is in flight and nothing happened
+# for idle ms (with quiet_dom also no DOM mutation), false on timeout. Installs the tracker if it is missing.
+READY_SCRIPT = TRACKER_SCRIPT + """
+var idle = arguments[0], timeout = arguments[1], quietDom = arguments[2], done = arguments[arguments.length - 1];
+var started = Date.now(), lastMutation = Date.now();
+var observer = new MutationObserver(function () { lastMutation = Date.now(); });
+if (quietDom) observer.observe(document.documentElement || document, {childList: true, subtree: true,
+                                                                       attributes: true, characterData: true});
+var interval = setInterval(function () {
+    var tracker = window.__pageTracker || {requests: 0, lastActivity: 0}, now = Date.now();
+    var last = Math.max(tracker.lastActivity, quietDom ? lastMutation : 0);
+    var ready = document.readyState === 'complete' && tracker.requests === 0 && now - last >= idle;
+    if (ready || now - started >= timeout) { clearInterval(interval); observer.disconnect(); done(ready); }
+}, 25);
+"""
+
+POLICIES = ("none", "load", "network_idle", "quiescent")
+
+
+class PageReadiness:
+    """
+    Decides when a navigated page is ready for interaction according to a policy:
+    none - right after navigation, load - document.readyState complete, network_idle - loaded and no in-flight
+    fetch / XHR for idle seconds, quiescent - network_idle and no DOM mutations.
+    """
+
+    # Drivers with the tracker registered to run on every new document.
+    _preinstalled = weakref.WeakSet()
+
+    @classmethod
+    def prepare(cls, driver):
+        """
+        Register the tracker to run before page scripts of every document, where the driver supports CDP.
+        :param driver: web_driver instance.
+        :return: True if the tracker is registered.
+        """
+        try:
+            if driver in cls._preinstalled:
+                return True
+        except TypeError:
+            return False
+        execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+        if execute_cdp_cmd is None:
+            return False
+        try:
+            execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": TRACKER_SCRIPT})
+        except WebDriverException as e:
+            logger.debug(F"{e.__class__.__name__} page tracker injected after navigation instead: {e}")
+            return False
+        cls._preinstalled.add(driver)
+        return True
+
+    @classmethod
+    @automation_logger(logger)
+    def wait(cls, driver, policy=None, timeout=None, idle=None):
+        """
+        Wait for the current page to be ready.
+        :param driver: web_driver instance.
+        :param policy: none, load, network_idle or quiescent, configured [PAGE] readiness by default.
+        :param timeout: seconds to wait.
+        :param idle: seconds without activity for network_idle and quiescent.
+        :return: True if ready, False on timeout.
+        """
+        policy = policy or BaseConfig.PAGE_READINESS
+        timeout = BaseConfig.PAGE_TIMEOUT if timeout is None else timeout
+        idle = BaseConfig.PAGE_IDLE if idle is None else idle
+        if policy not in POLICIES:
+            raise ValueError(F"Unknown readiness policy: {policy}, expected one of {POLICIES}")
+        if policy == "none":
+            return True
+        try:
+            if policy == "load":
+                return bool(WaitEngine.poll(
+                    lambda: driver.execute_script("return document.readyState") == "complete", timeout, "page load"))
+            WaitEngine.ensure_script_timeout(driver, timeout + 1.0)
+            return bool(driver.execute_async_script(READY_SCRIPT, int(idle * 1000), int(timeout * 1000),
+                                                    policy == "quiescent"))
+        except TimeoutException as e:
+            logger.error(F"{e.__class__.__name__} page is not ready by policy {policy}: {e}")
+            return False
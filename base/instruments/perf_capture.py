@@ -0,0 +1,138 @@
+import weakref
+from selenium.common.exceptions import WebDriverException
+
+from base.instruments.command_timer import CommandTimer
+from base.logger import automation_logger, logger
+
+# Keeps the largest contentful paint and long tasks (main thread busy over 50 ms) of the page in window.__perfEntries.
+# Registered before page scripts run where CDP is available; buffered observers also pick up earlier entries where
+# the browser buffers them. Installing twice is a no-op.
+OBSERVER_SCRIPT = """
+(function () {
+    if (window.__perfEntries || !window.PerformanceObserver) return;
+    var entries = window.__perfEntries = {lcp: null, longTasks: []};
+    function observe(type, callback) {
+        try { new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+            .observe({type: type, buffered: true}); } catch (e) {}
+    }
+    observe('largest-contentful-paint', function (entry) {
+        entries.lcp = {start: entry.startTime, size: entry.size,
+                       element: entry.element ? entry.element.tagName.toLowerCase() : null};
+    });
+    observe('longtask', function (entry) {
+        entries.longTasks.push({start: entry.startTime, duration: entry.duration, name: entry.name});
+    });
+})();
+"""
+
+# Navigation Timing (level 2, level 1 as fallback) in ms from navigation start, paint timing and observed entries.
+COLLECT_SCRIPT = OBSERVER_SCRIPT + """
+var done = arguments[arguments.length - 1];
+setTimeout(function () {
+    var navigation = null, entry = performance.getEntriesByType ? performance.getEntriesByType('navigation')[0] : null;
+    if (entry) {
+        navigation = {type: entry.type, redirect: entry.redirectEnd - entry.redirectStart,
+                      dns: entry.domainLookupEnd - entry.domainLookupStart, connect: entry.connectEnd - entry.connectStart,
+                      ttfb: entry.responseStart, response: entry.responseEnd - entry.responseStart,
+                      dom_interactive: entry.domInteractive, dom_content_loaded: entry.domContentLoadedEventEnd,
+                      load: entry.loadEventEnd, transfer_size: entry.transferSize, duration: entry.duration};
+    } else if (performance.timing) {
+        var t = performance.timing, start = t.navigationStart;
+        function since(value) { return value ? value - start : 0; }
+        navigation = {type: null, redirect: t.redirectEnd - t.redirectStart,
+                      dns: t.domainLookupEnd - t.domainLookupStart, connect: t.connectEnd - t.connectStart,
+                      ttfb: since(t.responseStart), response: t.responseEnd - t.responseStart,
+                      dom_interactive: since(t.domInteractive), dom_content_loaded: since(t.domContentLoadedEventEnd),
+                      load: since(t.loadEventEnd), transfer_size: null, duration: since(t.loadEventEnd)};
+    }
+    var paint = {};
+    (performance.getEntriesByType ? performance.getEntriesByType('paint') : []).forEach(function (item) {
+        paint[item.name] = item.startTime;
+    });
+    var observed = window.__perfEntries || {lcp: null, longTasks: []};
+    done({url: location.href, navigation: navigation, fp: paint['first-paint'] || null,
+          fcp: paint['first-contentful-paint'] || null, lcp: observed.lcp, long_tasks: observed.longTasks});
+}, 50);
+"""
+
+SLOWEST_COMMANDS = 10
+
+
+class PerfCapture:
+    """
+    Performance timeline of one test: Navigation Timing, paint timing (FP, FCP, LCP) and long tasks of the page the
+    test ends on, and latency of every WebDriver command the test sent.
+    Usage: PerfCapture.start(driver); ...test...; record = PerfCapture.stop(driver)
+    """
+
+    # Commands recorded per driver while a capture runs.
+    _commands = weakref.WeakKeyDictionary()
+    _preinstalled = weakref.WeakSet()
+
+    @classmethod
+    @automation_logger(logger)
+    def start(cls, driver):
+        """
+        Start recording command latencies of driver and register the page observers for the next documents.
+        :param driver: web_driver instance.
+        """
+        CommandTimer.add_listener(cls._record)
+        CommandTimer.install(driver)
+        cls._commands[driver] = []
+        cls._prepare(driver)
+
+    @classmethod
+    @automation_logger(logger)
+    def stop(cls, driver):
+        """
+        Stop recording and read the page timeline from the browser.
+        :param driver: web_driver instance.
+        :return: dict with url, navigation, fp, fcp, lcp, long_tasks (ms) and commands summary.
+        """
+        commands = cls._commands.pop(driver, [])
+        try:
+            page = driver.execute_async_script(COLLECT_SCRIPT) or {}
+        except WebDriverException as e:
+            logger.error(F"{e.__class__.__name__} performance timeline is not available: {e}")
+            page = {}
+        record = {key: page.get(key) for key in ("url", "navigation", "fp", "fcp", "lcp")}
+        record["long_tasks"] = page.get("long_tasks") or []
+        record["commands"] = cls.summarize(commands)
+        return record
+
+    @staticmethod
+    def summarize(commands):
+        """
+        :param commands: list of (command, seconds, failed).
+        :return: count, total and per command count / total / max in ms and the slowest commands.
+        """
+        by_command = {}
+        for command, seconds, failed in commands:
+            stats = by_command.setdefault(command, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "failed": 0})
+            stats["count"] += 1
+            stats["total_ms"] += seconds * 1000
+            stats["max_ms"] = max(stats["max_ms"], seconds * 1000)
+            stats["failed"] += failed
+        slowest = sorted(commands, key=lambda item: item[1], reverse=True)[:SLOWEST_COMMANDS]
+        return {"count": len(commands), "total_ms": sum(item[1] for item in commands) * 1000,
+                "by_command": by_command,
+                "slowest": [{"command": command, "ms": seconds * 1000} for command, seconds, _ in slowest]}
+
+    @classmethod
+    def _record(cls, driver, command, seconds, failed):
+        commands = cls._commands.get(driver)
+        if commands is not None:
+            commands.append((command, seconds, failed))
+
+    @classmethod
+    def _prepare(cls, driver):
+        if driver in cls._preinstalled:
+            return
+        execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+        if execute_cdp_cmd is None:
+            return
+        try:
+            execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVER_SCRIPT})
+            cls._preinstalled.add(driver)
+        except WebDriverException as e:
+            logger.debug(F"{e.__class__.__name__} performance observers installed at collection instead: {e}")
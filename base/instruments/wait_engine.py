@@ -0,0 +1,216 @@
+import time
+import random
+import weakref
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, \
+    WebDriverException
+
+from config_definitions import BaseConfig
+from base.logger import logger
+from base.utils.lazy_import import LazyImport
+
+By = LazyImport("selenium.webdriver.common.by", "By")
+ec = LazyImport("selenium.webdriver.support.expected_conditions")
+
+# Resolves the async script callback as soon as the condition holds: checked at once, then on DOM mutations
+# (coalesced to one check per animation frame) and on a 100 ms interval, because rAF is paused in background tabs
+# and url changes are not DOM mutations.
+WAIT_SCRIPT = """
+var condition = arguments[0], target = arguments[1], timeout = arguments[2], done = arguments[arguments.length - 1];
+function byXpath(xpath) {
+    return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function isVisible(element) {
+    if (!element || !element.isConnected) return false;
+    var style = window.getComputedStyle(element), rect = element.getBoundingClientRect();
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0' &&
+        (rect.width > 0 || rect.height > 0);
+}
+var checks = {
+    present: function () { return byXpath(target); },
+    visible: function () { var element = byXpath(target); return isVisible(element) ? element : null; },
+    clickable: function () { var element = byXpath(target); return isVisible(element) && !element.disabled ? element : null; },
+    absent: function () { return byXpath(target) ? null : true; },
+    url_contains: function () { return window.location.href.indexOf(target) !== -1 ? true : null; }
+};
+var check = checks[condition], finished = false, observer = null, frame = null, interval = null, timer = null;
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    if (frame) cancelAnimationFrame(frame);
+    clearInterval(interval);
+    clearTimeout(timer);
+    done(result);
+}
+function evaluate() {
+    frame = null;
+    var value;
+    try { value = check(); } catch (e) { return finish({error: String(e)}); }
+    if (value) finish({value: value});
+}
+function schedule() { if (!frame && !finished) frame = requestAnimationFrame(evaluate); }
+evaluate();
+if (!finished) {
+    observer = new MutationObserver(schedule);
+    observer.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true,
+                                                             characterData: true});
+    interval = setInterval(evaluate, 100);
+    timer = setTimeout(function () { finish({timeout: true}); }, timeout);
+}
+"""
+
+# Resolves true once quiet ms pass without DOM mutations, false on timeout.
+QUIESCENT_SCRIPT = """
+var quiet = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var observer = null, settle = null, timer = null;
+function finish(result) { if (observer) observer.disconnect(); clearTimeout(settle); clearTimeout(timer); done(result); }
+function restart() { clearTimeout(settle); settle = setTimeout(function () { finish(true); }, quiet); }
+observer = new MutationObserver(restart);
+observer.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true,
+                                                         characterData: true});
+timer = setTimeout(function () { finish(false); }, timeout);
+restart();
+"""
+
+# Resolves true once quiet ms pass without a resource timing entry (and with no request in flight when the page
+# tracker of PageReadiness is installed), false on timeout.
+NETWORK_IDLE_SCRIPT = """
+var quiet = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var count = -1, idleSince = Date.now(), started = Date.now();
+var interval = setInterval(function () {
+    var tracker = window.__pageTracker, current = performance.getEntriesByType('resource').length;
+    if (current !== count || (tracker && tracker.requests > 0)) { count = current; idleSince = Date.now(); }
+    if (Date.now() - idleSince >= quiet) { clearInterval(interval); done(true); }
+    else if (Date.now() - started >= timeout) { clearInterval(interval); done(false); }
+}, 50);
+"""
+
+
+class WaitEngine:
+    """
+    Waits resolved inside the browser in a single execute_async_script round trip instead of WebDriverWait polling
+    every 0.5 s. When the script cannot run (javascript disabled, page unloaded during the wait, driver without
+    async script support) the rest of the wait falls back to polling with exponential, jittered intervals.
+    Conditions: present, visible, clickable, absent (xpath target) and url_contains (url fragment target).
+    """
+
+    # Script timeout last set on every driver, so it is raised only when a longer wait comes.
+    _script_timeouts = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def until(cls, driver, condition, target, delay):
+        """
+        Wait for condition to become true.
+        :param driver: web_driver instance.
+        :param condition: present, visible, clickable, absent or url_contains.
+        :param target: xpath of a element or url fragment for url_contains.
+        :param delay: seconds to wait.
+        :return: web element for element conditions, True for absent and url_contains.
+        :raise TimeoutException: condition is not true within delay.
+        """
+        delay = float(delay)
+        deadline = time.monotonic() + delay
+        if BaseConfig.WAIT_EVENT_DRIVEN:
+            try:
+                return cls._wait_in_browser(driver, condition, target, delay)
+            except TimeoutException:
+                raise
+            except WebDriverException as e:
+                logger.debug(F"{e.__class__.__name__} event driven wait for {condition} fell back to polling: {e}")
+        return cls._poll(driver, condition, target, deadline)
+
+    @classmethod
+    def _wait_in_browser(cls, driver, condition, target, delay):
+        cls.ensure_script_timeout(driver, delay + 1.0)
+        result = driver.execute_async_script(WAIT_SCRIPT, condition, target, int(delay * 1000))
+        if not isinstance(result, dict) or "error" in result:
+            raise WebDriverException(F"wait script failed: {result}")
+        if result.get("timeout"):
+            raise TimeoutException(F"{condition} {target} not satisfied in {delay} seconds")
+        return result["value"]
+
+    @classmethod
+    def ensure_script_timeout(cls, driver, seconds):
+        try:
+            if cls._script_timeouts.get(driver, 0) >= seconds:
+                return
+            driver.set_script_timeout(seconds)
+            cls._script_timeouts[driver] = seconds
+        except TypeError:
+            driver.set_script_timeout(seconds)
+
+    @classmethod
+    def _poll(cls, driver, condition, target, deadline):
+        check = cls._python_check(condition, target)
+        return cls.poll(lambda: check(driver), deadline - time.monotonic(), F"{condition} {target}")
+
+    @classmethod
+    def poll(cls, check, delay, description="condition"):
+        """
+        Call check with exponentially growing, jittered intervals until it returns a true value.
+        :param check: callable without arguments, element lookup errors count as false.
+        :param delay: seconds to wait.
+        :param description: text for the timeout error.
+        :return: the true value returned by check.
+        :raise TimeoutException: check is not true within delay.
+        """
+        deadline = time.monotonic() + delay
+        interval = BaseConfig.WAIT_POLL_INITIAL
+        while True:
+            try:
+                value = check()
+            except (NoSuchElementException, StaleElementReferenceException):
+                value = False
+            if value:
+                return value
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(F"{description} not satisfied in time")
+            time.sleep(min(remaining, interval * random.uniform(0.8, 1.2)))
+            interval = min(interval * BaseConfig.WAIT_POLL_FACTOR, BaseConfig.WAIT_POLL_MAX)
+
+    @classmethod
+    def dom_quiescent(cls, driver, quiet=0.1, delay=5.0):
+        """
+        Wait until the document has had no DOM mutations for quiet seconds.
+        :param driver: web_driver instance.
+        :param quiet: seconds without mutations.
+        :param delay: seconds to wait.
+        :return: True.
+        :raise TimeoutException: the document keeps changing for delay seconds.
+        """
+        return cls._settle(driver, QUIESCENT_SCRIPT, "DOM quiescence", quiet, delay)
+
+    @classmethod
+    def network_idle(cls, driver, idle=0.5, delay=10.0):
+        """
+        Wait until no resource has finished loading for idle seconds.
+        :param driver: web_driver instance.
+        :param idle: seconds without network activity.
+        :param delay: seconds to wait.
+        :return: True.
+        :raise TimeoutException: network stays busy for delay seconds.
+        """
+        return cls._settle(driver, NETWORK_IDLE_SCRIPT, "network idle", idle, delay)
+
+    @classmethod
+    def _settle(cls, driver, script, description, quiet, delay):
+        cls.ensure_script_timeout(driver, delay + 1.0)
+        result = driver.execute_async_script(script, int(quiet * 1000), int(delay * 1000))
+        if not result:
+            raise TimeoutException(F"{description} not reached in {delay} seconds")
+        return True
+
+    @staticmethod
+    def _python_check(condition, target):
+        if condition == "present":
+            return ec.presence_of_element_located((By.XPATH, target))
+        if condition == "visible":
+            return ec.visibility_of_element_located((By.XPATH, target))
+        if condition == "clickable":
+            return ec.element_to_be_clickable((By.XPATH, target))
+        if condition == "absent":
+            return lambda driver: not driver.find_elements(By.XPATH, target)
+        if condition == "url_contains":
+            return ec.url_contains(target)
+        raise ValueError(F"Unknown wait condition: {condition}")
@@ -0,0 +1,143 @@
+import queue
+import logging
+import threading
+from logging.handlers import QueueHandler
+
+
+class _FlushRequest:
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class AsyncLogSink:
+    """
+    Bounded in-memory queue of log records drained by a background thread into batched handler writes.
+    When the queue is full the producer waits up to block_timeout (backpressured) and then drops the record.
+    """
+
+    def __init__(self, handlers, capacity=10000, batch_size=256, flush_interval=0.5, block_timeout=0.05):
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.backpressured = 0
+        self._queue = queue.Queue(capacity)
+        self._thread = threading.Thread(target=self._drain, name="AsyncLogSink", daemon=True)
+        self._thread.start()
+
+    def put(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.backpressured += 1
+            try:
+                self._queue.put(record, timeout=self.block_timeout)
+            except queue.Full:
+                self.dropped += 1
+
+    def flush(self, timeout=5.0):
+        """
+        Block until every record queued so far is written.
+        :param timeout: seconds to wait for the writer thread.
+        :return: True if flushed in time.
+        """
+        if not self._thread.is_alive():
+            return False
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def stop(self, timeout=5.0):
+        """
+        Flush pending records, report counters and stop the writer thread.
+        :param timeout: seconds to wait for the writer thread.
+        """
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self.dropped or self.backpressured:
+            record = logging.makeLogRecord({"msg": "Log sink: {0} records dropped, {1} backpressured".format(
+                self.dropped, self.backpressured), "levelno": logging.WARNING, "levelname": "WARNING"})
+            self._write([record])
+
+    def _drain(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch, requests, stop = [], [], False
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _FlushRequest):
+                    requests.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for request in requests:
+                request.done.set()
+            if stop:
+                return
+
+    def _write(self, records):
+        if not records:
+            return
+        for handler in self.handlers:
+            stream = getattr(handler, "stream", None)
+            if stream is None:
+                for record in records:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+                continue
+            lines = [handler.format(record) + handler.terminator for record in records
+                     if record.levelno >= handler.level]
+            handler.acquire()
+            try:
+                stream.write("".join(lines))
+                stream.flush()
+            except Exception:
+                handler.handleError(records[-1])
+            finally:
+                handler.release()
+
+
+class AsyncLogHandler(QueueHandler):
+    """
+    Logging handler feeding AsyncLogSink. Records at flush_level or above are written synchronously together with
+    everything queued before them, so the lines around a failure are never lost.
+    """
+
+    def __init__(self, sink, flush_level=logging.ERROR):
+        super(AsyncLogHandler, self).__init__(None)
+        self.sink = sink
+        self.flush_level = flush_level
+
+    def enqueue(self, record):
+        self.sink.put(record)
+
+    def emit(self, record):
+        super(AsyncLogHandler, self).emit(record)
+        if record.levelno >= self.flush_level:
+            self.sink.flush()
+
+    def flush(self):
+        self.sink.flush()
+
+    def close(self):
+        self.sink.stop()
+        for handler in self.sink.handlers:
+            handler.close()
+        super(AsyncLogHandler, self).close()
@@ -2,29 +2,34 @@ import os
 import errno
 import logging
 import datetime
-import inspect
+import threading
 import functools
 
+from config_definitions import BaseConfig
 from base import tests_base
+from base.log_sink import AsyncLogSink, AsyncLogHandler
 
 
-def automation_logger(logger_):
+def automation_logger(logger_, enabled=None):
+    """
+    Log the call of decorated function as "Class --> function" on INFO and any exception it throws on FATAL.
+    The label is resolved once at decoration time and nothing is formatted when INFO is filtered out.
+    :param logger_: logger instance.
+    :param enabled: False returns decorated function untouched, config.cfg [LOGGER] automation_logger by default.
+    """
+    enabled = BaseConfig.AUTOMATION_LOGGER if enabled is None else enabled
 
     def decorator(func):
+        if not enabled:
+            return func
+        cls_name = _get_defining_class_name(func)
+        f_name = getattr(func, "__name__", '')
 
         @functools.wraps(func)
         def log_wrapper(*args, **kwargs):
-            cls_ = _get_class_that_defined_method(func)
+            if logger_.isEnabledFor(logging.INFO):
+                logger_.info(" %s --> %s", cls_name, f_name)
             try:
-                cls_name = cls_.__name__
-            except AttributeError:
-                cls_name = ''
-            try:
-                f_name = func.__name__
-            except AttributeError:
-                f_name = ''
-            try:
-                logger_.info(" {0} --> {1}".format(cls_name, f_name))
                 return func(*args, **kwargs)
             except Exception as e:
                 err = f_name + f" The {f_name} throws an exception: {e.__class__.__name__} {e.__cause__}"
@@ -36,20 +41,25 @@ def automation_logger(logger_):
     return decorator
 
 
-def _get_class_that_defined_method(method):
-    if inspect.ismethod(method):
-        for cls in inspect.getmro(method.__self__.__class__):
-            if cls.__dict__.get(method.__name__) is method:
-                return cls
-        method = method.__func__
-    if inspect.isfunction(method):
-        cls = getattr(inspect.getmodule(method),
-                      method.__qualname__.split('.<locals>', 1)[0].rsplit('.', 1)[0])
-        if isinstance(cls, type):
-            return cls
+def _get_defining_class_name(func):
+    """
+    Name of the class the function is defined in, taken from its qualified name since at decoration time the
+    class body is still being executed.
+    """
+    qualname = getattr(func, "__qualname__", '').split('.<locals>', 1)[0]
+    parts = qualname.rsplit('.', 1)
+    return parts[0].rsplit('.', 1)[-1] if len(parts) == 2 else ''
 
 
-def create_logger(name='TEST_GAME', level='DEBUG'):
+def create_logger(name='TEST_GAME', level='DEBUG', async_sink=None):
+    """
+    Logger writing into per-run log file and console.
+    :param name: logger name, root logger if None.
+    :param level: logging level.
+    :param async_sink: write through AsyncLogSink background thread, config.cfg [LOGGER] async_sink by default.
+    :return: logger instance.
+    """
+    async_sink = BaseConfig.LOG_ASYNC_SINK if async_sink is None else async_sink
     log_file = _create_log_file()
     logger_ = logging.getLogger() if name is None else logging.getLogger(name)
     logger_.setLevel(level)
@@ -58,17 +68,34 @@ def create_logger(name='TEST_GAME', level='DEBUG'):
     log_file = logging.FileHandler(log_file)
     log_file.setFormatter(formatter)
     log_file.setLevel(level)
-    logger_.addHandler(log_file)
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     console_handler.setLevel(level)
-    logger_.addHandler(console_handler)
+    if async_sink:
+        sink = AsyncLogSink([log_file, console_handler], capacity=BaseConfig.LOG_QUEUE_SIZE,
+                            batch_size=BaseConfig.LOG_BATCH_SIZE, flush_interval=BaseConfig.LOG_FLUSH_INTERVAL)
+        sink_handler = AsyncLogHandler(sink)
+        sink_handler.setLevel(level)
+        logger_.addHandler(sink_handler)
+    else:
+        logger_.addHandler(log_file)
+        logger_.addHandler(console_handler)
     return logger_
 
 
+def flush_logger(logger_):
+    """
+    Write out everything the logger handlers still buffer.
+    :param logger_: logger instance.
+    """
+    for handler in logger_.handlers:
+        handler.flush()
+
+
 def _create_log_file():
     cur_time_stamp = int(datetime.datetime.today().timestamp())
-    filename = str(cur_time_stamp) + "_automation_test.log"
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    filename = str(cur_time_stamp) + ("_" + worker if worker else "") + "_automation_test.log"
     path = tests_base + "/repository/logs/"
     message = " --- AUTOMATION LOG STARTED: "
     cur_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
@@ -85,4 +112,29 @@ def _create_log_file():
     return path + filename
 
 
-logger = create_logger()
+class LazyLogger:
+    """
+    Stand-in for a logger created on first use, so importing this module creates no log file or handlers.
+    Methods of the created logger are bound once and then looked up directly.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._logger = None
+        self._lock = threading.Lock()
+
+    def _get_logger(self):
+        if self._logger is None:
+            with self._lock:
+                if self._logger is None:
+                    self._logger = self._factory()
+        return self._logger
+
+    def __getattr__(self, name):
+        value = getattr(self._get_logger(), name)
+        if callable(value):
+            setattr(self, name, value)
+        return value
+
+
+logger = LazyLogger(create_logger)
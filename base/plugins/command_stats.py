@@ -0,0 +1,75 @@
+"""
+WebDriver command hot spots: $ pytest -m ui --command-stats (or [PERF] command_stats = true)
+Every WebDriver command of the run is timed and aggregated into histograms per command and per Browser helper
+method, parallel workers included. The session ends with the top hot spots by total time, the share of test time
+spent in WebDriver commands, and base/repository/command_stats/<run>_commands.json for diffing runs.
+"""
+import os
+import json
+import datetime
+
+import pytest
+
+from config_definitions import BaseConfig
+from base import tests_base
+from base.instruments.command_stats import command_stats
+from base.instruments.command_timer import CommandTimer
+
+stats_dir = os.path.join(tests_base, "repository", "command_stats")
+
+
+class CommandStatsReporter:
+    """
+    Collects command stats of the workers and reports them in the controlling (or only) process.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.call_seconds = 0.0
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            self.call_seconds += report.duration
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput"):
+            self.config.workeroutput["automation_command_stats"] = command_stats.to_dict()
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        data = getattr(node, "workeroutput", {}).get("automation_command_stats")
+        if data:
+            command_stats.merge(data)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if hasattr(self.config, "workerinput") or not command_stats.commands:
+            return
+        report = command_stats.to_dict()
+        report["test_call_s"] = self.call_seconds
+        os.makedirs(stats_dir, exist_ok=True)
+        stats_file = os.path.join(stats_dir, datetime.datetime.now().strftime("%Y%m%d_%H%M%S") + "_commands.json")
+        with open(stats_file, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        top = self.config.getoption("--command-stats-top")
+        terminalreporter.section("WebDriver command hot spots")
+        share = report["command_s"] / self.call_seconds * 100 if self.call_seconds else 0.0
+        terminalreporter.write_line("WebDriver commands {0:.3f} s of {1:.3f} s test call time ({2:.0f}%)".format(
+            report["command_s"], self.call_seconds, share))
+        for attribute in ("commands", "helpers"):
+            terminalreporter.write_line("")
+            for line in command_stats.table(attribute, top):
+                terminalreporter.write_line(line)
+        terminalreporter.write_line("written to " + stats_file)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--command-stats", action="store_true", default=BaseConfig.PERF_COMMAND_STATS,
+                     help="Time every WebDriver command and report hot spots per command and Browser helper.")
+    parser.addoption("--command-stats-top", action="store", type=int, default=15,
+                     help="Rows of the command hot spot tables.")
+
+
+def pytest_configure(config):
+    if config.getoption("--command-stats") and not config.option.collectonly:
+        CommandTimer.add_listener(command_stats.record)
+        config.pluginmanager.register(CommandStatsReporter(config), "command_stats_reporter")
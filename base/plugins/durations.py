@@ -0,0 +1,92 @@
+"""
+Duration history of the suite in base/repository/durations.sqlite3 (see DurationStore), recorded by the controlling
+(or only) process at the end of every run, per test and browser parameter:
+- tests whose call duration regressed beyond the [DURATIONS] statistical threshold are listed at the end of the run,
+  with --duration-gate (or [DURATIONS] gate = true) they fail the run,
+- --duration-order slowest|fastest|fail-fast runs tests in that order of their recent history,
+- parallel runs hand tests out to workers by the same history (base/plugins/parallel.py).
+"""
+import os
+import time
+
+import pytest
+
+from config_definitions import BaseConfig
+from base.logger import logger
+from base.utils.duration_store import DurationStore, ORDERS
+
+
+class DurationCollector:
+    """
+    Collects durations and outcomes of every test from its setup, call and teardown reports and stores them.
+    """
+
+    def __init__(self, config, store):
+        self.config = config
+        self.store = store
+        self.started = time.time()
+        self.results = {}
+        self.regressions = []
+
+    def pytest_runtest_logreport(self, report):
+        properties = dict(report.user_properties)
+        result = self.results.setdefault(report.nodeid, {
+            "nodeid": report.nodeid, "browser": properties.get("browser"), "worker": properties.get("worker"),
+            "outcome": "passed", "setup": 0.0, "call": 0.0, "teardown": 0.0})
+        result[report.when] = report.duration
+        if report.failed:
+            result["outcome"] = "failed" if report.when == "call" else "error"
+        elif report.skipped and result["outcome"] == "passed":
+            result["outcome"] = "skipped"
+
+    def pytest_sessionfinish(self, session):
+        if not self.results:
+            return
+        results = list(self.results.values())
+        run_id = self.store.record_run(results, self.started, getattr(self.config.option, "numprocesses", 0) or 0)
+        self.regressions = self.store.regressions(results, before_run=run_id)
+        for regression in self.regressions:
+            logger.error("Duration regression {0}: {1:.3f}s, recent mean {2:.3f}s +- {3:.3f}s".format(
+                regression.nodeid, regression.duration, regression.mean, regression.stdev))
+        if self.regressions and self.config.getoption("--duration-gate") and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.regressions:
+            return
+        terminalreporter.section("duration regressions")
+        terminalreporter.write_line("{0:<80}{1:>10}{2:>10}{3:>10}{4:>8}".format(
+            "test", "call s", "mean s", "stdev s", "runs"))
+        for regression in self.regressions:
+            terminalreporter.write_line("{0:<80}{1:>10.3f}{2:>10.3f}{3:>10.3f}{4:>8}".format(
+                regression.nodeid[-79:], regression.duration, regression.mean, regression.stdev, regression.samples))
+
+
+def pytest_addoption(parser):
+    parser.addoption("--duration-order", action="store", default=BaseConfig.DURATIONS_ORDER, choices=ORDERS,
+                     help="Order tests by recent durations: slowest or fastest first, or fail-fast - most often "
+                          "failing first, quicker first among equals.")
+    parser.addoption("--duration-gate", action="store_true", default=BaseConfig.DURATIONS_GATE,
+                     help="Fail the run if the call duration of a test regressed ([DURATIONS] thresholds).")
+
+
+def pytest_configure(config):
+    if not hasattr(config, "workerinput") and not config.option.collectonly:
+        config.pluginmanager.register(DurationCollector(config, DurationStore()), "duration_collector")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None and "web_driver" in callspec.params:
+        item.user_properties.append(("browser", callspec.params["web_driver"]))
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker:
+        item.user_properties.append(("worker", worker))
+
+
+def pytest_collection_modifyitems(config, items):
+    order = config.getoption("--duration-order")
+    if order != "none":
+        key = DurationStore().sort_key(order)
+        items.sort(key=lambda item: key(item.nodeid))
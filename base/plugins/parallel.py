@@ -0,0 +1,63 @@
+"""
+Parallel execution support on top of pytest-xdist: $ pytest -n auto --alluredir=allure_results
+- every worker process has its own driver pool and log file,
+- tests are dispatched longest first according to durations of previous runs (DurationStore), unless
+  --duration-order fastest or fail-fast asks for that order,
+- all workers write allure results into the same --alluredir, only the controller cleans it,
+- workers take the configuration of the controller (environment overrides and overlays included) as a snapshot.
+"""
+import pytest
+
+from config_definitions import BaseConfig
+from base.utils.duration_store import DurationStore
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:
+    LoadScheduling = None
+
+
+if LoadScheduling is not None:
+
+    class DurationScheduling(LoadScheduling):
+        """
+        xdist load scheduling that hands out the longest tests first (LPT), so slow tests do not end up last on a
+        single worker while the others idle.
+        """
+
+        def __init__(self, config, log=None):
+            super(DurationScheduling, self).__init__(config, log)
+            self.store = DurationStore()
+            self.longest_first = config.getoption("--duration-order", "none") in ("none", "slowest")
+            self._ordered = False
+
+        def _send_tests(self, node, num):
+            if not self._ordered:
+                if self.longest_first:
+                    self.pending.sort(key=lambda index: self.store.expected_duration(self.collection[index]),
+                                      reverse=True)
+                self._ordered = True
+            super(DurationScheduling, self)._send_tests(node, num)
+
+
+def _is_worker(config):
+    return hasattr(config, "workerinput")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduling(config, log):
+    if config.getoption("dist") == "load":
+        return DurationScheduling(config, log)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["automation_config"] = BaseConfig.snapshot()
+
+
+def pytest_configure(config):
+    if _is_worker(config):
+        if "automation_config" in config.workerinput:
+            BaseConfig.load_snapshot(config.workerinput["automation_config"])
+        if getattr(config.option, "clean_alluredir", False):
+            config.option.clean_alluredir = False
@@ -0,0 +1,85 @@
+"""
+Per-test performance capture: $ pytest -m ui --perf-capture (or [PERF] enabled = true)
+Every test using web_driver gets a record of the page it ends on - Navigation Timing, paint timing (FP, FCP, LCP),
+long tasks - and of its WebDriver command latencies. Records of the whole run, parallel workers included, are
+appended to one JSON Lines file base/repository/perf/<run>_perf.jsonl and attached to the allure report of the test.
+"""
+import os
+import json
+import time
+import datetime
+
+import pytest
+
+from config_definitions import BaseConfig
+from base import tests_base
+from base.instruments.perf_capture import PerfCapture
+from base.logger import logger
+from base.utils.file_lock import FileLock
+
+perf_dir = os.path.join(tests_base, "repository", "perf")
+
+
+class PerfRecorder:
+    """
+    Captures the performance record around the call of every test using web_driver and appends it to the run file.
+    """
+
+    def __init__(self, perf_file, attach=True):
+        self.perf_file = perf_file
+        self.lock_file = perf_file + ".lock"
+        self.attach = attach
+        self.records = 0
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        driver = getattr(item, "funcargs", {}).get("web_driver")
+        if driver is None:
+            yield
+            return
+        PerfCapture.start(driver)
+        outcome = yield
+        record = {"test": item.nodeid, "browser": item.callspec.params.get("web_driver"),
+                  "worker": os.environ.get("PYTEST_XDIST_WORKER"), "time": time.time(),
+                  "passed": outcome.excinfo is None}
+        record.update(PerfCapture.stop(driver))
+        self.write(record)
+
+    def write(self, record):
+        """
+        :param record: performance record of one test.
+        """
+        line = json.dumps(record, sort_keys=True)
+        with FileLock(self.lock_file):
+            with open(self.perf_file, "a") as f:
+                f.write(line + "\n")
+        self.records += 1
+        if self.attach:
+            import allure
+            allure.attach(json.dumps(record, indent=2, sort_keys=True), name="performance",
+                          attachment_type=allure.attachment_type.JSON)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.records:
+            logger.info("Performance of {0} tests written to {1}".format(self.records, self.perf_file))
+
+
+def pytest_addoption(parser):
+    parser.addoption("--perf-capture", action="store_true", default=BaseConfig.PERF_ENABLED,
+                     help="Record browser performance timeline and command latencies of every ui test.")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["automation_perf_file"] = node.config.perf_file
+
+
+def pytest_configure(config):
+    if hasattr(config, "workerinput"):
+        config.perf_file = config.workerinput.get("automation_perf_file")
+    else:
+        run = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        config.perf_file = os.path.join(perf_dir, run + "_perf.jsonl")
+    if config.getoption("--perf-capture") and config.perf_file and not config.option.collectonly:
+        os.makedirs(os.path.dirname(config.perf_file), exist_ok=True)
+        config.pluginmanager.register(PerfRecorder(config.perf_file, BaseConfig.PERF_ATTACH), "perf_recorder")
@@ -0,0 +1,113 @@
+"""
+Startup profiling: $ pytest -p base.plugins.startup_profile -m api
+Loaded with -p the plugin is imported before conftest files and test modules, times every first import of a module
+from then on and reports the slowest imports, collection time and time to the first test in the terminal summary
+and in base/repository/startup_profile.json.
+"""
+import os
+import sys
+import json
+import time
+import builtins
+import threading
+
+from base import tests_base
+
+TOP = 15
+report_file = os.path.join(tests_base, "repository", "startup_profile.json")
+
+_original_import = builtins.__import__
+_local = threading.local()
+_imports = {}
+_marks = {"plugin_loaded": time.time()}
+
+
+def _process_start():
+    """
+    :return: epoch seconds the interpreter process started at (Linux /proc), None elsewhere.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/stat") as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        return boot_time + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration, AttributeError):
+        return None
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    stack = _local.__dict__.setdefault("stack", [])
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        _imports[name] = (elapsed - children, elapsed)
+
+
+builtins.__import__ = _timed_import
+
+
+def pytest_collection(session):
+    _marks.setdefault("collection_start", time.time())
+
+
+def pytest_collection_finish(session):
+    _marks["collection_finish"] = time.time()
+
+
+def pytest_runtest_logstart(nodeid, location):
+    if "first_test" not in _marks:
+        _marks["first_test"] = time.time()
+        builtins.__import__ = _original_import
+
+
+def pytest_unconfigure(config):
+    builtins.__import__ = _original_import
+
+
+def build_report():
+    """
+    :return: dict of startup phases in seconds and the slowest module imports.
+    """
+    origin = _process_start()
+    origin_name = "process start" if origin else "plugin load"
+    origin = origin or _marks["plugin_loaded"]
+    phases = {"plugin_loaded": _marks["plugin_loaded"] - origin}
+    if "collection_start" in _marks and "collection_finish" in _marks:
+        phases["collection"] = _marks["collection_finish"] - _marks["collection_start"]
+    if "first_test" in _marks:
+        phases["time_to_first_test"] = _marks["first_test"] - origin
+    slowest = sorted(_imports.items(), key=lambda item: item[1][0], reverse=True)[:TOP]
+    return {
+        "measured_from": origin_name,
+        "phases": phases,
+        "imports_total": sum(self_time for self_time, _ in _imports.values()),
+        "modules_imported": len(_imports),
+        "slowest_imports": [{"module": name, "self": self_time, "cumulative": cumulative}
+                            for name, (self_time, cumulative) in slowest],
+    }
+
+
+def pytest_terminal_summary(terminalreporter):
+    report = build_report()
+    os.makedirs(os.path.dirname(report_file), exist_ok=True)
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=2)
+    write = terminalreporter.write_line
+    terminalreporter.section("startup profile (from {0})".format(report["measured_from"]))
+    for phase, seconds in report["phases"].items():
+        write("{0:<24}{1:>10.3f} s".format(phase, seconds))
+    write("{0:<24}{1:>10.3f} s in {2} modules".format("imports", report["imports_total"],
+                                                       report["modules_imported"]))
+    write("{0:<48}{1:>10}{2:>12}".format("slowest imports", "self s", "cumul. s"))
+    for item in report["slowest_imports"]:
+        write("{0:<48}{1:>10.3f}{2:>12.3f}".format(item["module"], item["self"], item["cumulative"]))
+    write("written to " + report_file)
@@ -0,0 +1,192 @@
+import os
+import time
+import sqlite3
+import platform
+import statistics
+from collections import namedtuple
+
+from config_definitions import BaseConfig
+from base import tests_base
+
+TestStats = namedtuple("TestStats", ["nodeid", "samples", "mean", "stdev", "fail_rate", "last_outcome"])
+Regression = namedtuple("Regression", ["nodeid", "duration", "mean", "stdev", "samples"])
+
+ORDERS = ("none", "slowest", "fastest", "fail-fast")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    finished REAL NOT NULL,
+    host TEXT,
+    workers INTEGER,
+    tests INTEGER,
+    failed INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL,
+    test TEXT NOT NULL,
+    browser TEXT,
+    outcome TEXT NOT NULL,
+    setup REAL NOT NULL,
+    call REAL NOT NULL,
+    teardown REAL NOT NULL,
+    duration REAL NOT NULL,
+    worker TEXT
+);
+CREATE INDEX IF NOT EXISTS results_nodeid ON results (nodeid, run_id);
+"""
+
+
+class DurationStore:
+    """
+    Durations and outcomes of every test, per browser parameter, of previous runs in a local SQLite database
+    (base/repository/durations.sqlite3). Gives duration statistics per test for ordering and scheduling, and flags
+    tests whose call duration regressed beyond mean + [DURATIONS] sigma standard deviations of their recent passes.
+    """
+
+    db_file = os.path.join(tests_base, "repository", "durations.sqlite3")
+
+    def __init__(self, db_file=None, window=None):
+        """
+        :param db_file: database path, base/repository/durations.sqlite3 by default.
+        :param window: number of recent runs of a test statistics are taken from, [DURATIONS] window by default.
+        """
+        self.db_file = db_file or self.db_file
+        self.window = window or BaseConfig.DURATIONS_WINDOW
+        self._stats = None
+        self._default = 0.0
+
+    def connect(self):
+        """
+        :return: sqlite3 connection with the schema in place.
+        """
+        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+        connection = sqlite3.connect(self.db_file, timeout=30)
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def record_run(self, results, started, workers=0):
+        """
+        Store results of a run and drop runs older than [DURATIONS] keep_runs.
+        :param results: list of dicts with nodeid, browser, outcome, setup, call, teardown and worker.
+        :param started: epoch seconds the run started at.
+        :param workers: number of parallel workers, 0 without xdist.
+        :return: id of the stored run.
+        """
+        connection = self.connect()
+        try:
+            with connection:
+                run_id = connection.execute(
+                    "INSERT INTO runs (started, finished, host, workers, tests, failed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (started, time.time(), platform.node(), workers, len(results),
+                     sum(result["outcome"] in ("failed", "error") for result in results))
+                ).lastrowid
+                connection.executemany(
+                    "INSERT INTO results (run_id, nodeid, test, browser, outcome, setup, call, teardown, duration, "
+                    "worker) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, result["nodeid"], result["nodeid"].split("[", 1)[0], result.get("browser"),
+                      result["outcome"], result["setup"], result["call"], result["teardown"],
+                      result["setup"] + result["call"] + result["teardown"], result.get("worker"))
+                     for result in results])
+                connection.execute("DELETE FROM runs WHERE id <= ?", (run_id - BaseConfig.DURATIONS_KEEP_RUNS,))
+        finally:
+            connection.close()
+        self._stats = None
+        return run_id
+
+    def stats(self):
+        """
+        :return: dict of nodeid to TestStats of total duration (setup + call + teardown) over the recent window of
+                 runs the test was not skipped in, failure rate included.
+        """
+        if self._stats is None:
+            if not os.path.isfile(self.db_file):
+                self._stats = {}
+                return self._stats
+            connection = self.connect()
+            try:
+                rows = connection.execute("SELECT nodeid, outcome, duration FROM results WHERE outcome != 'skipped' "
+                                          "ORDER BY run_id DESC").fetchall()
+            finally:
+                connection.close()
+            recent = {}
+            for nodeid, outcome, duration in rows:
+                samples = recent.setdefault(nodeid, [])
+                if len(samples) < self.window:
+                    samples.append((outcome, duration))
+            self._stats = {nodeid: self._summarize(nodeid, samples) for nodeid, samples in recent.items()}
+            self._default = statistics.mean(item.mean for item in self._stats.values()) if self._stats else 0.0
+        return self._stats
+
+    def regressions(self, results, before_run=None):
+        """
+        Passed tests of a run whose call duration is above mean + sigma * stdev of their recent passes, and by at
+        least [DURATIONS] min_ratio of the mean and min_seconds.
+        :param results: result dicts as given to record_run.
+        :param before_run: compare with runs before this run id, all stored runs if None.
+        :return: list of Regression, largest excess first.
+        """
+        history = self._call_history(before_run)
+        regressions = []
+        for result in results:
+            calls = history.get(result["nodeid"], [])
+            if result["outcome"] != "passed" or len(calls) < BaseConfig.DURATIONS_MIN_SAMPLES:
+                continue
+            mean, stdev = statistics.mean(calls), statistics.pstdev(calls)
+            duration = result["call"]
+            if duration > mean + BaseConfig.DURATIONS_SIGMA * stdev and \
+                    duration > mean * (1 + BaseConfig.DURATIONS_MIN_RATIO) and \
+                    duration - mean > BaseConfig.DURATIONS_MIN_SECONDS:
+                regressions.append(Regression(result["nodeid"], duration, mean, stdev, len(calls)))
+        return sorted(regressions, key=lambda item: item.duration - item.mean, reverse=True)
+
+    def expected_duration(self, nodeid):
+        """
+        :param nodeid: test node id.
+        :return: mean recent duration, mean of all known tests for a new one.
+        """
+        stats = self.stats()
+        return stats[nodeid].mean if nodeid in stats else self._default
+
+    def sort_key(self, order):
+        """
+        :param order: none, slowest, fastest or fail-fast (most failing first, quicker first among equals).
+        :return: key function of nodeid.
+        """
+        if order not in ORDERS:
+            raise ValueError(F"Unknown duration order: {order}, expected one of {ORDERS}")
+        stats = self.stats()
+        if order == "none":
+            return lambda nodeid: 0
+        if order == "slowest":
+            return lambda nodeid: -self.expected_duration(nodeid)
+        if order == "fastest":
+            return self.expected_duration
+        return lambda nodeid: (-(stats[nodeid].fail_rate if nodeid in stats else 0.0), self.expected_duration(nodeid))
+
+    @staticmethod
+    def _summarize(nodeid, samples):
+        durations = [duration for _, duration in samples]
+        failed = sum(outcome != "passed" for outcome, _ in samples)
+        return TestStats(nodeid, len(samples), statistics.mean(durations),
+                         statistics.pstdev(durations) if len(durations) > 1 else 0.0,
+                         failed / len(samples), samples[0][0])
+
+    def _call_history(self, before_run):
+        if not os.path.isfile(self.db_file):
+            return {}
+        connection = self.connect()
+        try:
+            rows = connection.execute("SELECT nodeid, call FROM results WHERE outcome = 'passed' AND run_id < ? "
+                                      "ORDER BY run_id DESC", (before_run or 2 ** 62,)).fetchall()
+        finally:
+            connection.close()
+        history = {}
+        for nodeid, call in rows:
+            calls = history.setdefault(nodeid, [])
+            if len(calls) < self.window:
+                calls.append(call)
+        return history
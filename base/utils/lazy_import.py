@@ -0,0 +1,34 @@
+import importlib
+import threading
+
+
+class LazyImport:
+    """
+    Module, or attribute of a module, imported on first use: attribute access and calls are forwarded to the
+    imported object. Keeps heavy packages (selenium.webdriver, testcontainers, webdriver_manager) out of runs that
+    never use them, e.g.: By = LazyImport("selenium.webdriver.common.by", "By"); By.XPATH imports it.
+    Not usable where a real class is required (base class, isinstance) - import there at the place of use.
+    """
+
+    def __init__(self, module, attribute=None):
+        self._module = module
+        self._attribute = attribute
+        self._target = None
+        self._lock = threading.Lock()
+
+    def _resolve(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    target = importlib.import_module(self._module)
+                    self._target = getattr(target, self._attribute) if self._attribute else target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return "LazyImport({0!r}, {1!r})".format(self._module, self._attribute)
@@ -0,0 +1,35 @@
+"""
+Copies its standard input, line by line, into a size-rotated log file until end of input:
+$ server | python base/utils/log_drain.py <log_file> <max_bytes> <backups>
+Used as a separate process so that the output of a long-running child (e.g. the shared selenium server) is read and
+rotated for as long as the child lives, whichever test process started it. Standard library only, run as a script.
+"""
+import os
+import sys
+import logging
+from logging.handlers import RotatingFileHandler
+
+
+def drain(stream, log_file, max_bytes, backups):
+    """
+    :param stream: binary input stream.
+    :param log_file: log file path.
+    :param max_bytes: size the log file is rotated at.
+    :param backups: rotated files kept.
+    """
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log = logging.getLogger("log_drain")
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    try:
+        for line in iter(stream.readline, b""):
+            log.info(line.decode(errors="replace").rstrip())
+    finally:
+        handler.close()
+
+
+if __name__ == "__main__":
+    drain(sys.stdin.buffer, sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
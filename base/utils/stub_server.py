@@ -0,0 +1,81 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHttpServer:
+    """
+    Local stand-in HTTP/1.1 server for api client tests, serving canned responses from a routes dict:
+    {"/path": (status, headers_dict, body_bytes)}. Unknown paths answer 404, a matching If-None-Match answers 304.
+    Counts requests per path and the highest number of requests served concurrently.
+    Usage: with StubHttpServer(routes) as server: server.url
+    """
+
+    def __init__(self, routes=None, host="127.0.0.1", port=0, delay=0.0):
+        self.routes = routes or {}
+        self.delay = delay
+        self.hits = {}
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return "http://{0}:{1}/".format(host, port)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub._serve(self)
+
+            def do_HEAD(self):
+                stub._serve(self, with_body=False)
+
+            def log_message(self, format_, *args):
+                pass
+
+        return Handler
+
+    def _serve(self, handler, with_body=True):
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            self.hits[handler.path] = self.hits.get(handler.path, 0) + 1
+        try:
+            if self.delay:
+                threading.Event().wait(self.delay)
+            status, headers, body = self.routes.get(handler.path, (404, {}, b"Not Found"))
+            etag = headers.get("ETag")
+            if etag is not None and handler.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+            handler.send_response(status)
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            if with_body:
+                handler.wfile.write(body)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
@@ -1,4 +1,7 @@
 import platform
+from functools import lru_cache
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
 from base.automation_error import AutomationError
 from base.enums import OperationSystem
 from base.logger import logger, automation_logger
@@ -7,10 +10,11 @@ from base.logger import logger, automation_logger
 class Utils:
 
     @staticmethod
+    @lru_cache(maxsize=None)
     @automation_logger(logger)
     def detect_os():
         """
-        Detects the OS on which Python tests will run.
+        Detects the OS on which Python tests will run, once per process.
         :return: enum string value of OS name.
         """
         current_platform = platform.system().lower()
@@ -23,4 +27,33 @@ class Utils:
         else:
             e = AutomationError("The OS is not detected!")
             logger.exception(e)
-            raise e
\ No newline at end of file
+            raise e
+
+    @staticmethod
+    @automation_logger(logger)
+    def extract_static_assets(html):
+        """
+        Collects same-origin static resources referenced by a page: scripts, stylesheets, icons, manifest, images.
+        :param html: page source.
+        :return: list of paths relative to the site root, in document order without duplicates.
+        """
+        parser = _AssetParser()
+        parser.feed(html)
+        return list(dict.fromkeys(parser.assets))
+
+
+class _AssetParser(HTMLParser):
+    attributes = {"script": "src", "link": "href", "img": "src"}
+
+    def __init__(self):
+        super(_AssetParser, self).__init__()
+        self.assets = []
+
+    def handle_starttag(self, tag, attrs):
+        value = dict(attrs).get(self.attributes.get(tag))
+        if not value:
+            return
+        url = urlsplit(value)
+        if url.scheme or url.netloc or value.startswith("data:"):
+            return
+        self.assets.append(url.path.lstrip("/"))
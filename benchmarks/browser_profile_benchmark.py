@@ -0,0 +1,42 @@
+"""
+Browser start-up and page load time of every browser profile in config.cfg.
+Run from the project root, with the application under test up: python -m benchmarks.browser_profile_benchmark
+Optional arguments: browser names (default chrome), e.g. python -m benchmarks.browser_profile_benchmark chrome firefox
+"""
+import sys
+import time
+
+from config_definitions import BaseConfig
+from base.drivers.webdriver_factory import WebDriverFactory
+from base.instruments.browser import Browser
+
+PROFILES = [section[len("PROFILE_"):].lower() for section in BaseConfig.sections()
+            if section.startswith("PROFILE_")]
+ROUNDS = 3
+
+
+def measure(browser_name, profile):
+    start = time.perf_counter()
+    driver = WebDriverFactory.get_driver(browser_name, profile=profile)
+    started = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        Browser.go_to_url(driver, BaseConfig.BASE_URL, "load")
+        loaded = time.perf_counter() - start
+    finally:
+        driver.quit()
+    return started, loaded
+
+
+def main(browsers):
+    print("{0:<10}{1:<12}{2:>14}{3:>14}".format("browser", "profile", "start-up s", "page load s"))
+    for browser_name in browsers:
+        for profile in PROFILES:
+            results = [measure(browser_name, profile) for _ in range(ROUNDS)]
+            started = sorted(result[0] for result in results)[ROUNDS // 2]
+            loaded = sorted(result[1] for result in results)[ROUNDS // 2]
+            print("{0:<10}{1:<12}{2:>14.3f}{3:>14.3f}".format(browser_name, profile, started, loaded))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["chrome"])
@@ -0,0 +1,43 @@
+"""
+Cold and warm start time of the docker container grid ([GRID] section of config.cfg) and session start time on it.
+Run from the project root, with a local Docker daemon: python -m benchmarks.container_grid_benchmark
+Optional arguments: browser names (default chrome), e.g. python -m benchmarks.container_grid_benchmark chrome firefox
+Grid containers of previous runs are removed first and left running at the end for the next warm start.
+"""
+import sys
+import time
+
+from base.drivers.container_grid import ContainerGrid
+
+SESSIONS = 3
+
+
+def measure(browser_name):
+    results = {}
+    for run in ("cold", "warm"):
+        grid = ContainerGrid(reuse=True)
+        start = time.perf_counter()
+        grid.start(browser_name)
+        results[run] = time.perf_counter() - start
+        sessions = []
+        for _ in range(SESSIONS):
+            start = time.perf_counter()
+            driver = grid.get_driver(browser_name)
+            sessions.append(time.perf_counter() - start)
+            driver.quit()
+        results[run + " session"] = sorted(sessions)[SESSIONS // 2]
+        grid.shutdown()
+    return results
+
+
+def main(browsers):
+    print("Removed {0} grid containers".format(ContainerGrid.purge()))
+    print("{0:<10}{1:>14}{2:>14}{3:>14}{4:>14}".format("browser", "cold s", "warm s", "session s", "warm ses. s"))
+    for browser_name in browsers:
+        results = measure(browser_name)
+        print("{0:<10}{1:>14.3f}{2:>14.3f}{3:>14.3f}{4:>14.3f}".format(
+            browser_name, results["cold"], results["warm"], results["cold session"], results["warm session"]))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["chrome"])
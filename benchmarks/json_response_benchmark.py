@@ -0,0 +1,77 @@
+"""
+CPU time and peak memory of handling multi-MB json responses: previous ApiClient path (text decode, json.loads of
+the text, whole body formatted into the log line) against ApiResponse (lazy parse from bytes, bounded log repr) and
+against iterating a streamed body with iter_json (incremental ijson parse, the body is never held in full).
+Run from the project root: python -m benchmarks.json_response_benchmark
+"""
+import io
+import json
+import time
+import tracemalloc
+
+from base.constants import RESPONSE_TEXT
+from base.instruments import api_response
+from base.instruments.api_response import ApiResponse
+
+SIZES_MB = (1, 8, 32)
+
+
+def make_payload(size_mb):
+    item = {"id": 0, "name": "icon-192x192.png", "sizes": "192x192", "type": "image/png", "tags": ["a", "b", "c"]}
+    count = size_mb * 1024 * 1024 // len(json.dumps(item))
+    return json.dumps([dict(item, id=i) for i in range(count)]).encode("utf-8")
+
+
+def legacy_path(content):
+    text = content.decode("utf-8")
+    body = json.loads(text)
+    log_line = RESPONSE_TEXT.format(body)
+    return body, log_line
+
+
+def lazy_status_only(content):
+    response = ApiResponse("http://localhost/", 200, "OK", {}, content)
+    log_line = RESPONSE_TEXT.format(response.log_repr())
+    return response.status_code, log_line
+
+
+def lazy_parsed(content):
+    response = ApiResponse("http://localhost/", 200, "OK", {}, content)
+    log_line = RESPONSE_TEXT.format(response.log_repr())
+    return response.body, log_line
+
+
+def streamed_items(content):
+    response = ApiResponse("http://localhost/", 200, "OK", {}, raw=io.BytesIO(content))
+    log_line = RESPONSE_TEXT.format(response.log_repr())
+    return sum(1 for _ in response.iter_json("item")), log_line
+
+
+def measure(function, content):
+    tracemalloc.start()
+    start = time.process_time()
+    function(content)
+    cpu = time.process_time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak / 1024 / 1024
+
+
+def main():
+    cases = (("legacy text + log of body", legacy_path), ("ApiResponse, status only", lazy_status_only),
+             ("ApiResponse, body parsed", lazy_parsed))
+    if api_response.ijson is not None:
+        cases += (("ApiResponse, iter_json streamed", streamed_items),)
+        print("ijson backend: " + api_response.ijson.backend)
+    else:
+        print("ijson is not installed, iter_json falls back to parsing the whole body: not measured")
+    print("{0:>6}  {1:<32}{2:>10}{3:>14}".format("MB", "case", "cpu s", "peak MB"))
+    for size_mb in SIZES_MB:
+        content = make_payload(size_mb)
+        for name, function in cases:
+            cpu, peak = measure(function, content)
+            print("{0:>6}  {1:<32}{2:>10.3f}{3:>14.1f}".format(size_mb, name, cpu, peak))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Per-call overhead of automation_logger.
+Run from the project root: python -m benchmarks.logger_overhead_benchmark
+"""
+import inspect
+import logging
+import functools
+import timeit
+
+from base.logger import automation_logger
+
+CALLS = 200000
+
+
+def legacy_automation_logger(logger_):
+    """
+    Decorator as it was before label caching: class resolved and message formatted on every call.
+    """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def log_wrapper(*args, **kwargs):
+            cls_ = _get_class_that_defined_method(func)
+            try:
+                cls_name = cls_.__name__
+            except AttributeError:
+                cls_name = ''
+            try:
+                f_name = func.__name__
+            except AttributeError:
+                f_name = ''
+            try:
+                logger_.info(" {0} --> {1}".format(cls_name, f_name))
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger_.fatal(e, exc_info=True)
+                raise e
+
+        return log_wrapper
+
+    return decorator
+
+
+def _get_class_that_defined_method(method):
+    if inspect.ismethod(method):
+        for cls in inspect.getmro(method.__self__.__class__):
+            if cls.__dict__.get(method.__name__) is method:
+                return cls
+        method = method.__func__
+    if inspect.isfunction(method):
+        cls = getattr(inspect.getmodule(method),
+                      method.__qualname__.split('.<locals>', 1)[0].rsplit('.', 1)[0])
+        if isinstance(cls, type):
+            return cls
+
+
+def _build_logger(level):
+    logger_ = logging.getLogger("LOGGER_BENCHMARK_" + logging.getLevelName(level))
+    logger_.propagate = False
+    logger_.addHandler(logging.NullHandler())
+    logger_.setLevel(level)
+    return logger_
+
+
+def _make_target(decorator):
+
+    class Target:
+        @classmethod
+        @decorator
+        def method(cls, value):
+            return value
+
+    return Target
+
+
+def _per_call_ns(target):
+    seconds = min(timeit.repeat(lambda: target.method(1), number=CALLS, repeat=5))
+    return seconds / CALLS * 1e9
+
+
+def main():
+    cases = [("undecorated", lambda f: f)]
+    for level in (logging.INFO, logging.WARNING):
+        logger_ = _build_logger(level)
+        level_name = logging.getLevelName(level)
+        cases.append(("legacy, logger at " + level_name, legacy_automation_logger(logger_)))
+        cases.append(("cached label, logger at " + level_name, automation_logger(logger_, enabled=True)))
+    cases.append(("pass-through (disabled)", automation_logger(_build_logger(logging.INFO), enabled=False)))
+
+    print("{0:<36}{1:>14}".format("case", "ns per call"))
+    for name, decorator in cases:
+        print("{0:<36}{1:>14.1f}".format(name, _per_call_ns(_make_target(decorator))))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,263 @@
 import os
+import copy
+import threading
 import configparser
 from base.drivers import drivers_dir
 
+ENV_PREFIX = "AUTOMATION_"
+
 
 def get_parser(config):
     parser = configparser.ConfigParser()
-    with open(config, mode='r', buffering=-1, closefd=True):
-        parser.read(config)
-        return parser
+    with open(config, mode='r', buffering=-1, closefd=True) as f:
+        parser.read_file(f, source=config)
+    return parser
+
+
+def boolean(value):
+    try:
+        return configparser.ConfigParser.BOOLEAN_STATES[value.strip().lower()]
+    except KeyError:
+        raise ValueError("Not a boolean: " + value)
+
+
+def int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def str_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def optional(value):
+    return value or None
+
+
+def driver_path(value):
+    return drivers_dir + value
+
+
+class Option:
+    """
+    Typed value of one config.cfg option, converted on first access and cached until the config changes.
+    """
+
+    def __init__(self, section, option, kind=str):
+        self.section = section
+        self.option = option
+        self.kind = kind
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        try:
+            return owner._resolved[self.name]
+        except KeyError:
+            return owner.resolve(self)
+
+
+class _Parser:
+
+    def __get__(self, instance, owner):
+        return owner.load_parser()
 
 
 class BaseConfig:
+    """
+    Configuration from config.cfg, parsed once on first use. Every value is resolved lazily and typed.
+    Precedence: overlay (BaseConfig.overlay) > environment variable AUTOMATION_<SECTION>_<OPTION>, e.g.
+    AUTOMATION_ARGS_UI_DELAY=5 > config.cfg. BaseConfig.snapshot() gives plain data that another process (e.g. a
+    parallel worker) uses through BaseConfig.load_snapshot() without reading the file.
+    """
 
     config_file = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'config.cfg')
-    parser = get_parser(config_file)
+    parser = _Parser()
+
+    _lock = threading.RLock()
+    _parser = None
+    _raw = None
+    _overlays = {}
+    _resolved = {}
+
+    BASE_URL = Option('BASE_URL', 'base_url')
+
+    UI_DELAY = Option('ARGS', 'ui_delay', float)
+
+    API_POOL_SIZE = Option('API', 'pool_size', int)
+    API_MAX_RETRIES = Option('API', 'max_retries', int)
+    API_BACKOFF_FACTOR = Option('API', 'backoff_factor', float)
+    API_RETRY_STATUSES = Option('API', 'retry_statuses', int_list)
+    API_TIMEOUT = Option('API', 'timeout', float)
+    ASYNC_API_CONCURRENCY = Option('API', 'concurrency', int)
+    ASYNC_API_LIMIT_PER_HOST = Option('API', 'limit_per_host', int)
+    API_LOG_BODY_LIMIT = Option('API', 'log_body_limit', int)
+    API_CACHE = Option('API', 'cache', boolean)
+    API_CACHE_MAX_BYTES = Option('API', 'cache_max_bytes', int)
+    API_CACHE_DIR = Option('API', 'cache_dir', optional)
+
+    W_CHROME_PATH = Option('WEB_DRIVER_WIN', 'w_chrome', driver_path)
+    W_FIREFOX_PATH = Option('WEB_DRIVER_WIN', 'w_firefox', driver_path)
+    W_IE_PATH = Option('WEB_DRIVER_WIN', 'w_ie', driver_path)
+    W_EDGE_PATH = Option('WEB_DRIVER_WIN', 'w_edge', driver_path)
+    W_JS_PATH = Option('WEB_DRIVER_WIN', 'w_js', driver_path)
+
+    L_CHROME_PATH = Option('WEB_DRIVER_LIN', 'l_chrome', driver_path)
+    L_FIREFOX_PATH = Option('WEB_DRIVER_LIN', 'l_firefox', driver_path)
+
+    M_CHROME_PATH = Option('WEB_DRIVER_MAC', 'm_chrome', driver_path)
+    M_FIREFOX_PATH = Option('WEB_DRIVER_MAC', 'm_firefox', driver_path)
+    M_OPERA_PATH = Option('WEB_DRIVER_MAC', 'm_opera', driver_path)
+
+    SELENIUM_JAR = Option('DATA', 'selenium_jar', driver_path)
+
+    AUTOMATION_LOGGER = Option('LOGGER', 'automation_logger', boolean)
+    LOG_ASYNC_SINK = Option('LOGGER', 'async_sink', boolean)
+    LOG_QUEUE_SIZE = Option('LOGGER', 'queue_size', int)
+    LOG_BATCH_SIZE = Option('LOGGER', 'batch_size', int)
+    LOG_FLUSH_INTERVAL = Option('LOGGER', 'flush_interval', float)
+
+    DRIVERS_OFFLINE = Option('DRIVERS', 'offline', boolean)
+
+    GRID_ENABLED = Option('GRID', 'enabled', boolean)
+    GRID_CONTAINERS = Option('GRID', 'containers', int)
+    GRID_SESSIONS = Option('GRID', 'sessions', int)
+    GRID_REUSE = Option('GRID', 'reuse', boolean)
+    GRID_START_TIMEOUT = Option('GRID', 'start_timeout', float)
+    GRID_HEALTH_INTERVAL = Option('GRID', 'health_interval', float)
+    GRID_SHM_SIZE = Option('GRID', 'shm_size')
+
+    SERVER_ENABLED = Option('SERVER', 'enabled', boolean)
+    SERVER_PORT = Option('SERVER', 'port', int)
+    SERVER_JAVA = Option('SERVER', 'java')
+    SERVER_BROWSERS = Option('SERVER', 'browsers', str_list)
+    SERVER_START_TIMEOUT = Option('SERVER', 'start_timeout', float)
+    SERVER_LOG_MAX_BYTES = Option('SERVER', 'log_max_bytes', int)
+    SERVER_LOG_BACKUPS = Option('SERVER', 'log_backups', int)
+
+    PLATFORM_CACHE = Option('PLATFORM', 'cache', boolean)
+    PLATFORM_CACHE_TTL = Option('PLATFORM', 'cache_ttl', float)
+
+    POOL_SIZE = Option('POOL', 'pool_size', int)
+    POOL_MAX_USES = Option('POOL', 'max_uses', int)
+    POOL_LEASE_TIMEOUT = Option('POOL', 'lease_timeout', float)
+    POOL_PRE_SPAWN = Option('POOL', 'pre_spawn', int)
+    DRIVER_SCOPE = Option('POOL', 'driver_scope')
+    DRIVER_ISOLATION = Option('POOL', 'isolation')
+
+    WAIT_EVENT_DRIVEN = Option('WAITS', 'event_driven', boolean)
+    WAIT_POLL_INITIAL = Option('WAITS', 'poll_initial', float)
+    WAIT_POLL_MAX = Option('WAITS', 'poll_max', float)
+    WAIT_POLL_FACTOR = Option('WAITS', 'poll_factor', float)
+
+    PAGE_READINESS = Option('PAGE', 'readiness')
+    PAGE_IDLE = Option('PAGE', 'idle', float)
+    PAGE_TIMEOUT = Option('PAGE', 'timeout', float)
+    PAGE_MAXIMIZE = Option('PAGE', 'maximize', boolean)
+
+    BROWSER_PROFILE = Option('PROFILES', 'default')
+
+    PERF_ENABLED = Option('PERF', 'enabled', boolean)
+    PERF_ATTACH = Option('PERF', 'attach', boolean)
+    PERF_COMMAND_STATS = Option('PERF', 'command_stats', boolean)
+
+    DURATIONS_ORDER = Option('DURATIONS', 'order')
+    DURATIONS_GATE = Option('DURATIONS', 'gate', boolean)
+    DURATIONS_WINDOW = Option('DURATIONS', 'window', int)
+    DURATIONS_KEEP_RUNS = Option('DURATIONS', 'keep_runs', int)
+    DURATIONS_MIN_SAMPLES = Option('DURATIONS', 'min_samples', int)
+    DURATIONS_SIGMA = Option('DURATIONS', 'sigma', float)
+    DURATIONS_MIN_RATIO = Option('DURATIONS', 'min_ratio', float)
+    DURATIONS_MIN_SECONDS = Option('DURATIONS', 'min_seconds', float)
+
+    @classmethod
+    def load_parser(cls):
+        """
+        :return: ConfigParser of config.cfg, read once.
+        """
+        with cls._lock:
+            if cls._parser is None:
+                cls._parser = get_parser(cls.config_file)
+            return cls._parser
+
+    @classmethod
+    def raw(cls):
+        """
+        :return: {section: {option: string value}} of config.cfg with environment overrides applied.
+        """
+        with cls._lock:
+            if cls._raw is None:
+                parser = cls.load_parser()
+                cls._raw = {section: {option: os.environ.get(ENV_PREFIX + section.upper() + "_" + option.upper(),
+                                                             value)
+                                      for option, value in parser.items(section)}
+                            for section in parser.sections()}
+            return cls._raw
+
+    @classmethod
+    def get(cls, section, option, kind=str):
+        """
+        :param section: config.cfg section.
+        :param option: option of the section.
+        :param kind: callable converting the string value, e.g. int, float, boolean, int_list.
+        :return: typed value.
+        :raise configparser.Error: missing section or option.
+        """
+        try:
+            value = cls.raw()[section][option]
+        except KeyError:
+            if section not in cls.raw():
+                raise configparser.NoSectionError(section)
+            raise configparser.NoOptionError(option, section)
+        return kind(value)
 
-    BASE_URL = parser.get('BASE_URL', 'base_url')
+    @classmethod
+    def sections(cls):
+        return list(cls.raw())
 
-    UI_DELAY = parser.get('ARGS', 'ui_delay')
+    @classmethod
+    def has_section(cls, section):
+        return section in cls.raw()
 
-    W_CHROME_PATH = drivers_dir + parser.get('WEB_DRIVER_WIN', 'w_chrome')
-    W_FIREFOX_PATH = drivers_dir + parser.get('WEB_DRIVER_WIN', 'w_firefox')
-    W_IE_PATH = drivers_dir + parser.get('WEB_DRIVER_WIN', 'w_ie')
-    W_EDGE_PATH = drivers_dir + parser.get('WEB_DRIVER_WIN', 'w_edge')
-    W_JS_PATH = drivers_dir + parser.get('WEB_DRIVER_WIN', 'w_js')
+    @classmethod
+    def resolve(cls, option):
+        with cls._lock:
+            if option.name in cls._overlays:
+                value = cls._overlays[option.name]
+            else:
+                value = cls.get(option.section, option.option, option.kind)
+            cls._resolved[option.name] = value
+            return value
 
-    L_CHROME_PATH = drivers_dir + parser.get('WEB_DRIVER_LIN', 'l_chrome')
-    L_FIREFOX_PATH = drivers_dir + parser.get('WEB_DRIVER_LIN', 'l_firefox')
+    @classmethod
+    def overlay(cls, **values):
+        """
+        Override typed values in this process, e.g. per parallel worker: BaseConfig.overlay(POOL_SIZE=1).
+        :param values: attribute name to value.
+        """
+        with cls._lock:
+            for name in values:
+                if not isinstance(cls.__dict__.get(name), Option):
+                    raise AttributeError("BaseConfig has no option " + name)
+            cls._overlays.update(values)
+            cls._resolved.clear()
 
-    M_CHROME_PATH = drivers_dir + parser.get('WEB_DRIVER_MAC', 'm_chrome')
-    M_FIREFOX_PATH = drivers_dir + parser.get('WEB_DRIVER_MAC', 'm_firefox')
-    M_OPERA_PATH = drivers_dir + parser.get('WEB_DRIVER_MAC', 'm_opera')
+    @classmethod
+    def snapshot(cls):
+        """
+        :return: plain data copy of the configuration (file, environment and overlays), see load_snapshot.
+        """
+        with cls._lock:
+            return {"raw": copy.deepcopy(cls.raw()), "overlays": copy.deepcopy(cls._overlays)}
 
-    SELENIUM_JAR = drivers_dir + parser.get('DATA', 'selenium_jar')
+    @classmethod
+    def load_snapshot(cls, snapshot):
+        """
+        Use configuration taken by snapshot() instead of config.cfg.
+        :param snapshot: result of snapshot().
+        """
+        with cls._lock:
+            cls._raw = copy.deepcopy(snapshot["raw"])
+            cls._overlays = copy.deepcopy(snapshot["overlays"])
+            cls._resolved = {}
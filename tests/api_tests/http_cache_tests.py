@@ -0,0 +1,94 @@
+import allure
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from base.instruments.api_client import ApiClient
+from base.instruments.http_cache import HttpCache
+from base.logger import automation_logger, logger
+from base.utils.stub_server import StubHttpServer
+
+test_case = "TestHttpCache"
+
+
+@allure.testcase(test_case)
+@allure.severity(allure.severity_level.NORMAL)
+@allure.description("""
+    API Test against local stand-in server.
+    1. Check that fresh responses are served from cache and bypass goes to the network.
+    2. Check that stale responses are revalidated with If-None-Match.
+    3. Check that no-store responses are never cached.
+    4. Check that concurrent requests through one client are counted once each and a url is fetched once.
+    """)
+@pytest.mark.api
+class TestHttpCache(object):
+    manifest = b'{"short_name": "React App"}'
+    routes = {
+        "/fresh.json": (200, {"Cache-Control": "max-age=60", "ETag": '"v1"'}, manifest),
+        "/stale.json": (200, {"Cache-Control": "no-cache", "ETag": '"v1"'}, manifest),
+        "/private.json": (200, {"Cache-Control": "no-store"}, manifest),
+    }
+
+    @pytest.fixture()
+    def stub(self):
+        with StubHttpServer(self.routes) as server:
+            client = ApiClient(cache=HttpCache(1024 * 1024))
+            client.api_url = server.url
+            yield server, client
+            client.close()
+
+    @automation_logger(logger)
+    def test_fresh_hit_and_bypass(self, stub):
+        allure.step("Verify cache hit for fresh response and bypass per call.")
+        server, client = stub
+        body, first = client.request("GET", "fresh.json")
+        _, second = client.request("GET", "fresh.json")
+        _, bypassed = client.request("GET", "fresh.json", use_cache=False)
+        assert body == {"short_name": "React App"}
+        assert not first.from_cache and second.from_cache and not bypassed.from_cache
+        assert second.body == body
+        assert server.hits["/fresh.json"] == 2
+        assert client.cache.report()["hits"] == 1
+
+        logger.info(F"============ TEST CASE {test_case} / 1 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_revalidation(self, stub):
+        allure.step("Verify revalidation with ETag.")
+        server, client = stub
+        client.request("GET", "stale.json")
+        body, revalidated = client.request("GET", "stale.json")
+        assert revalidated.status_code == 200 and revalidated.from_cache
+        assert body == {"short_name": "React App"}
+        assert server.hits["/stale.json"] == 2
+        assert client.cache.report()["revalidations"] == 1
+
+        logger.info(F"============ TEST CASE {test_case} / 2 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_no_store(self, stub):
+        allure.step("Verify no-store response is not cached.")
+        server, client = stub
+        client.request("GET", "private.json")
+        _, response = client.request("GET", "private.json")
+        assert not response.from_cache
+        assert server.hits["/private.json"] == 2
+        assert client.cache.report()["entries"] == 0
+
+        logger.info(F"============ TEST CASE {test_case} / 3 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_concurrent_requests(self, stub):
+        allure.step("Verify cache counters under concurrent requests.")
+        server, client = stub
+        requests = 40
+        paths = ["fresh.json", "stale.json", "private.json"] * requests
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            responses = list(executor.map(lambda path: client.request("GET", path)[1], paths))
+        report = client.cache.report()
+        assert all(response.status_code == 200 for response in responses)
+        assert report["hits"] + report["misses"] + report["revalidations"] == len(paths)
+        assert server.hits["/fresh.json"] == 1
+        assert report["hits"] == requests - 1
+        assert report["revalidations"] == requests - 1
+        assert report["misses"] == 2 + requests
+
+        logger.info(F"============ TEST CASE {test_case} / 4 PASSED ===========")
@@ -0,0 +1,90 @@
+import json
+import asyncio
+import allure
+import pytest
+from base.instruments.async_api_client import AsyncApiClient
+from base.logger import automation_logger, logger
+from base.utils.stub_server import StubHttpServer
+from base.utils.utils import Utils
+
+test_case = "TestStaticSweep"
+
+
+@allure.testcase(test_case)
+@allure.severity(allure.severity_level.NORMAL)
+@allure.description("""
+    API Test.
+    1. Check that every static resource referenced by index page and manifest.json is served with 200 OK.
+    2. Check that AsyncApiClient.fetch_many streams all results and respects the concurrency limit.
+    3. Check that closing fetch_many early cancels the requests in flight.
+    """)
+@pytest.mark.api
+class TestStaticSweep(object):
+
+    @staticmethod
+    async def sweep(client):
+        index, _ = await client.request("GET", "")
+        manifest, _ = await client.get_manifest()
+        paths = ["", "manifest.json"] + Utils.extract_static_assets(index)
+        paths += [icon["src"].lstrip("/") for icon in manifest.get("icons", [])]
+        return [result async for result in client.fetch_many(dict.fromkeys(paths), parse=False)]
+
+    @staticmethod
+    async def fetch_all(url, paths, concurrency):
+        async with AsyncApiClient(concurrency=concurrency, api_url=url) as client:
+            return [result async for result in client.fetch_many(paths)]
+
+    @staticmethod
+    async def fetch_first(url, paths, concurrency):
+        async with AsyncApiClient(concurrency=concurrency, api_url=url) as client:
+            results = client.fetch_many(paths)
+            first = await results.__anext__()
+            await results.aclose()
+            return first, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    @automation_logger(logger)
+    def test_static_assets(self):
+        allure.step("Verify that all static resources return 200 OK.")
+
+        async def run():
+            async with AsyncApiClient() as client:
+                return await self.sweep(client)
+
+        results = AsyncApiClient.run(run())
+        assert len(results) > 2
+        for path, result in results:
+            assert not isinstance(result, Exception), path
+            assert result[1].status_code == 200, path
+
+        logger.info(F"============ TEST CASE {test_case} / 1 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_fetch_many_concurrency(self):
+        allure.step("Verify fetch_many against local stand-in server.")
+        manifest = json.dumps({"icons": [{"src": "favicon.ico"}]}).encode()
+        routes = {"/manifest.json": (200, {"Content-Type": "application/json"}, manifest)}
+        routes.update({"/static/{0}.js".format(i): (200, {}, b"x" * 1024) for i in range(200)})
+        paths = [path.lstrip("/") for path in routes] + ["missing.css"]
+        with StubHttpServer(routes, delay=0.01) as server:
+            results = AsyncApiClient.run(self.fetch_all(server.url, paths, 10))
+        statuses = {path: result[1].status_code for path, result in results}
+        assert sorted(statuses) == sorted(paths)
+        assert statuses.pop("missing.css") == 404
+        assert set(statuses.values()) == {200}
+        assert dict(results)["manifest.json"][0] == {"icons": [{"src": "favicon.ico"}]}
+        assert 1 < server.max_in_flight <= 10
+
+        logger.info(F"============ TEST CASE {test_case} / 2 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_fetch_many_early_stop(self):
+        allure.step("Verify requests in flight are cancelled when the consumer stops.")
+        routes = {"/static/{0}.js".format(i): (200, {}, b"x") for i in range(50)}
+        paths = [path.lstrip("/") for path in routes]
+        with StubHttpServer(routes, delay=0.2) as server:
+            (path, result), running = AsyncApiClient.run(self.fetch_first(server.url, paths, 5))
+            assert path in paths and result[1].status_code == 200
+            assert running == []
+            assert sum(server.hits.values()) <= 10
+
+        logger.info(F"============ TEST CASE {test_case} / 3 PASSED ===========")
@@ -1,9 +1,71 @@
 import time
 import pytest
-from base.drivers.webdriver_factory import WebDriverFactory
+from config_definitions import BaseConfig
+from base.automation_error import AutomationError
+from base.drivers.driver_pool import driver_pool
 from base.instruments.api_client import ApiClient
 from base.instruments.browser import Browser
-from base.logger import automation_logger, logger
+from base.logger import automation_logger, logger, flush_logger
+
+pytest_plugins = ["base.plugins.parallel", "base.plugins.perf_capture", "base.plugins.command_stats",
+                  "base.plugins.durations"]
+
+DRIVER_SCOPES = ("function", "class", "module", "session")
+ISOLATION_LEVELS = ("fresh", "reset", "shared")
+_scoped_drivers = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption("--driver-scope", action="store", default=BaseConfig.DRIVER_SCOPE, choices=DRIVER_SCOPES,
+                     help="Scope a browser session is kept for, reset between tests (default from config.cfg).")
+    parser.addoption("--browser-profile", action="store", default=BaseConfig.BROWSER_PROFILE,
+                     help="Browser profile from config.cfg the browsers are started with: fast, faithful.")
+    parser.addoption("--grid", action="store_true", default=BaseConfig.GRID_ENABLED,
+                     help="Run browsers in the docker container grid ([GRID] section of config.cfg).")
+    parser.addoption("--no-grid", action="store_false", dest="grid", default=BaseConfig.GRID_ENABLED,
+                     help="Run browsers locally even if [GRID] enabled = true.")
+    parser.addoption("--selenium-server", action="store_true", default=BaseConfig.SERVER_ENABLED,
+                     help="Run browsers through one selenium standalone server shared by all workers ([SERVER]).")
+    parser.addoption("--no-selenium-server", action="store_false", dest="selenium_server",
+                     default=BaseConfig.SERVER_ENABLED,
+                     help="Run browsers locally even if [SERVER] enabled = true.")
+
+
+def pytest_configure(config):
+    if config.getoption("--grid"):
+        from base.drivers.container_grid import container_grid
+        driver_pool.factory = container_grid.get_driver
+    elif config.getoption("--selenium-server"):
+        from base.drivers.selenium_server import selenium_server
+        driver_pool.factory = selenium_server.get_driver
+
+
+def pytest_unconfigure(config):
+    if config.getoption("--selenium-server") and not config.getoption("--grid"):
+        from base.drivers.selenium_server import selenium_server
+        selenium_server.release()
+
+
+def pytest_collection_finish(session):
+    if session.config.option.collectonly:
+        return
+    browsers = {item.callspec.params["web_driver"].lower() for item in session.items
+                if hasattr(item, "callspec") and "web_driver" in item.callspec.params}
+    for browser_name in browsers:
+        driver_pool.warm_up(browser_name, BaseConfig.POOL_PRE_SPAWN, background=True,
+                            profile=session.config.getoption("--browser-profile"))
+
+
+def pytest_runtest_logreport(report):
+    if report.failed:
+        flush_logger(logger)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    logger.info("DRIVER POOL STATS: {0}".format(driver_pool.shutdown()))
+    if session.config.getoption("--grid"):
+        from base.drivers.container_grid import container_grid
+        logger.info("CONTAINER GRID STATS: {0}".format(container_grid.shutdown()))
 
 
 @pytest.fixture(scope="class")
@@ -15,10 +77,8 @@ def r_time_count(request):
     def stop_counter():
         end_time = time.perf_counter()
         logger.info(F"END TIME: {end_time}")
-        average_time = time.strptime(time.ctime(end_time - start_time), "%a %b %d %H:%M:%S %Y")
-        min_ = average_time.tm_min
-        sec_ = average_time.tm_sec
-        logger.info("AVERAGE OF THE TEST CASE RUN TIME: {0} minutes {1} seconds".format(min_, sec_))
+        minutes, seconds = divmod(end_time - start_time, 60)
+        logger.info("AVERAGE OF THE TEST CASE RUN TIME: {0} minutes {1:.3f} seconds".format(int(minutes), seconds))
 
     request.addfinalizer(stop_counter)
 
@@ -26,19 +86,68 @@ def r_time_count(request):
 @pytest.fixture()
 @automation_logger(logger)
 def web_driver(request):
+    """
+    Browser session for parametrized browser name. Sessions are kept for --driver-scope and reused by all tests of
+    that scope and browser. The isolation marker selects what a test gets:
+    fresh - new browser started for the test only, reset (default) - reused session reset before the test,
+    shared - reused session as the previous test left it.
+    """
+    marker = request.node.get_closest_marker("isolation")
+    isolation = marker.args[0] if marker else BaseConfig.DRIVER_ISOLATION
+    if isolation not in ISOLATION_LEVELS:
+        error = "Unknown isolation level " + isolation
+        logger.error(error)
+        raise AutomationError(error)
+    scope = request.config.getoption("--driver-scope")
+    logger.info("Driver is: {0}, scope: {1}, isolation: {2}".format(request.param, scope, isolation))
+
+    if isolation == "fresh":
+        driver = driver_pool.factory(request.param, profile=request.config.getoption("--browser-profile"))
+        request.addfinalizer(lambda: Browser.close_browser(driver))
+    elif scope == "function":
+        driver = _lease_driver(request, request.param)
+    else:
+        driver = _scoped_driver(request, scope, isolation)
+    request.cls.driver = driver
+    return driver
+
+
+def _lease_driver(node, browser_name):
 
     def stop_driver():
-        logger.info("TEST STOP -> Closing browser... {0}".format(driver.name))
-        Browser.close_browser(driver)
+        logger.info("TEST STOP -> Returning browser to pool... {0}".format(driver.name))
+        driver_pool.release(driver)
 
-    logger.info("Driver is: {0}".format(request.param))
-    driver = WebDriverFactory.get_driver(request.param)
-    request.cls.driver = driver
-    request.addfinalizer(stop_driver)
+    driver = driver_pool.lease(browser_name, profile=node.config.getoption("--browser-profile"))
+    node.addfinalizer(stop_driver)
     return driver
 
 
-@pytest.fixture(scope="class")
+def _scoped_driver(request, scope, isolation):
+    if scope == "session":
+        node = request.session
+    else:
+        node = request.node.getparent(pytest.Class if scope == "class" else pytest.Module) or \
+            request.node.getparent(pytest.Module)
+    key = (node.nodeid, request.param.lower())
+    driver = _scoped_drivers.get(key)
+    if driver is None:
+        driver = _scoped_drivers[key] = _lease_driver(node, request.param)
+        node.addfinalizer(lambda: _scoped_drivers.pop(key, None))
+    elif isolation == "reset":
+        Browser.reset_session(driver)
+    return driver
+
+
+@pytest.fixture(scope="session")
 @automation_logger(logger)
-def api_client():
-    return ApiClient()
+def api_client(request):
+
+    def stop_client():
+        if client.cache is not None:
+            logger.info("API CACHE STATS: {0}".format(client.cache.report()))
+        client.close()
+
+    client = ApiClient()
+    request.addfinalizer(stop_client)
+    return client
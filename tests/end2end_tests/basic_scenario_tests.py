@@ -1,60 +1,51 @@
 import allure
 import pytest
-from base.drivers.webdriver_factory import WebDriverFactory
-from base.instruments.browser import Browser
 from base.logger import automation_logger, logger
 from tests.ui_tests.ui_tests_base.base_page import BasePage
 
 test_case = "TestBasicScenario"
 
+# Two players alternate starting with X, moves are (row, column) counted from 1.
+SCENARIOS = {
+    "x_wins_column": ([(2, 2), (3, 3), (3, 2), (2, 3), (1, 2)], "X"),
+    "o_wins_row": ([(1, 1), (2, 1), (1, 2), (2, 2), (3, 3), (2, 3)], "O"),
+    "draw": ([(1, 1), (1, 2), (1, 3), (2, 2), (2, 1), (2, 3), (3, 2), (3, 1), (3, 3)], None),
+}
+
+
+def expected_board(moves):
+    board = [["", "", ""] for _ in range(3)]
+    for index, (row, col) in enumerate(moves):
+        board[row - 1][col - 1] = "X" if index % 2 == 0 else "O"
+    return board
+
 
 @allure.testcase(test_case)
 @allure.severity(allure.severity_level.NORMAL)
 @pytest.mark.usefixtures("web_driver")
 @allure.description("""
     UI Parameterized Test run with Chrome and Firefox browsers.
-    1. Simulate basic scenario with two players.
+    1. Simulate scenarios with two players and check the board, the status and the winner.
     """)
 @pytest.mark.e2e
 class TestBasicScenario(object):
     base_page = BasePage()
 
-    @pytest.fixture()
-    @automation_logger(logger)
-    def web_driver(self, request):
-        def stop_driver():
-            logger.info("TEST STOP -> Closing browser... {0}".format(driver.name))
-            Browser.close_browser(driver)
-
-        logger.info("Driver is: {0}".format(request.param))
-        driver = WebDriverFactory.get_driver(request.param)
-        request.cls.driver = driver
-        request.addfinalizer(stop_driver)
-        return driver
-
     @automation_logger(logger)
+    @pytest.mark.parametrize("scenario", sorted(SCENARIOS))
     @pytest.mark.parametrize("web_driver", ["Chrome", "Firefox", ], indirect=True)
-    def test_basic_scenario(self, web_driver):
+    def test_basic_scenario(self, web_driver, scenario):
         allure.step("Start playing.")
+        moves, winner = SCENARIOS[scenario]
         result = self.base_page.open_base_page(web_driver)
         assert result is True
 
-        cell1 = self.base_page.find_element(web_driver, self.base_page.locators.BOARD_ROWS + "[2]/button[2]")
-        self.base_page.click_on_element(cell1)
-
-        cell2 = self.base_page.find_element(web_driver, self.base_page.locators.BOARD_ROWS + "[3]/button[3]")
-        self.base_page.click_on_element(cell2)
-
-        cell3 = self.base_page.find_element(web_driver, self.base_page.locators.BOARD_ROWS + "[3]/button[2]")
-        self.base_page.click_on_element(cell3)
-
-        cell4 = self.base_page.find_element(web_driver, self.base_page.locators.BOARD_ROWS + "[2]/button[3]")
-        self.base_page.click_on_element(cell4)
-
-        cell5 = self.base_page.find_element(web_driver, self.base_page.locators.BOARD_ROWS + "[1]/button[2]")
-        self.base_page.click_on_element(cell5)
+        self.base_page.play_moves(web_driver, moves)
 
-        result = self.base_page.wait_element_clickable(web_driver, cell5, 5.0)
-        assert result is False
+        state = self.base_page.read_board(web_driver)
+        assert state["board"] == expected_board(moves)
+        assert state["winner"] == winner
+        if winner is not None:
+            assert state["status"] == "Winner: " + winner
 
         logger.info(F"============ TEST CASE {test_case} PASSED ===========")
@@ -0,0 +1,105 @@
+import allure
+import pytest
+from base.automation_error import AutomationError
+from base.instruments.browser import FIND_MANY_SCRIPT
+from base.logger import automation_logger, logger
+from tests.ui_tests.ui_tests_base.base_page import BasePage, BOARD_STATE_SCRIPT
+
+test_case = "TestBoard"
+
+
+class FakeCell(object):
+
+    def __init__(self):
+        self.clicks = 0
+
+    def click(self):
+        self.clicks += 1
+
+
+class FakeDriver(object):
+    """
+    Stand-in driver answering the board state script with a fixed state and find_many with the given cells.
+    """
+
+    def __init__(self, board=(), status=None, cells=None):
+        self.state = {"board": [list(row) for row in board], "status": status}
+        self.cells = cells or {}
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if script == BOARD_STATE_SCRIPT:
+            return dict(self.state)
+        assert script == FIND_MANY_SCRIPT
+        return {name: self.cells.get(name) for name in args[0]}
+
+
+@allure.testcase(test_case)
+@allure.severity(allure.severity_level.NORMAL)
+@allure.description("""
+    Framework Test of the game page object with a stand-in driver.
+    1. Check that the status line is parsed into the next player or the winner.
+    2. Check that a full row, column or diagonal wins and a draw or short board has no winner.
+    3. Check that moves are played in order and a missing cell fails before any move is played.
+    """)
+@pytest.mark.framework
+class TestBoard(object):
+    draw = [["X", "O", "X"], ["X", "O", "O"], ["O", "X", "X"]]
+
+    @pytest.fixture()
+    def page(self):
+        return BasePage()
+
+    @automation_logger(logger)
+    def test_read_board_status(self, page):
+        allure.step("Verify status line parsing.")
+        empty = [[""] * 3 for _ in range(3)]
+        state = page.read_board(FakeDriver(empty, "Next player: X"))
+        assert state["board"] == empty
+        assert state["next_player"] == "X" and state["winner"] is None
+
+        state = page.read_board(FakeDriver([["O", "O", "O"], ["X", "X", ""], ["", "", ""]], "Winner: O"))
+        assert state["next_player"] is None and state["winner"] == "O"
+
+        for status in ("", None):
+            state = page.read_board(FakeDriver(empty, status))
+            assert state["next_player"] is None and state["winner"] is None
+
+        state = page.read_board(FakeDriver([["X", "O", ""], ["X", "O", ""], ["X", "", ""]], None))
+        assert state["winner"] == "X"
+
+        logger.info(F"============ TEST CASE {test_case} / 1 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_line_winner(self):
+        allure.step("Verify winning lines, draw and short boards.")
+        assert BasePage.line_winner([["", "", ""], ["O", "O", "O"], ["X", "X", ""]]) == "O"
+        assert BasePage.line_winner([["X", "O", ""], ["X", "O", ""], ["", "O", "X"]]) == "O"
+        assert BasePage.line_winner([["X", "O", ""], ["O", "X", ""], ["", "", "X"]]) == "X"
+        assert BasePage.line_winner([["O", "X", "X"], ["O", "X", ""], ["X", "", "O"]]) == "X"
+        assert BasePage.line_winner(self.draw) is None
+        assert BasePage.line_winner([["", "", ""]] * 3) is None
+        assert BasePage.line_winner([]) is None
+        assert BasePage.line_winner([["X", "X", "X"]]) == "X"
+        assert BasePage.line_winner([["X"], ["X"]]) is None
+        assert BasePage.line_winner([["O", "X"], ["O", "X"], ["O"]]) == "O"
+
+        logger.info(F"============ TEST CASE {test_case} / 2 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_play_moves(self, page):
+        allure.step("Verify moves are clicked and a missing cell raises AutomationError.")
+        cells = {"{0}{1}".format(row, col): FakeCell() for row in range(1, 4) for col in range(1, 4)}
+        driver = FakeDriver(cells=cells)
+        page.play_moves(driver, [(1, 1), (2, 2), (3, 3)])
+        assert driver.scripts == [FIND_MANY_SCRIPT]
+        assert [cells[key].clicks for key in ("11", "22", "33", "12")] == [1, 1, 1, 0]
+
+        del cells["23"]
+        with pytest.raises(AutomationError) as error:
+            page.play_moves(driver, [(1, 2), (2, 3)])
+        assert "(2, 3)" in str(error.value)
+        assert cells["12"].clicks == 0
+
+        logger.info(F"============ TEST CASE {test_case} / 3 PASSED ===========")
@@ -0,0 +1,91 @@
+import json
+import allure
+import pytest
+from config_definitions import BaseConfig
+from base.logger import automation_logger, logger
+
+test_case = "TestBaseConfig"
+
+
+@allure.testcase(test_case)
+@allure.severity(allure.severity_level.NORMAL)
+@allure.description("""
+    Framework Test.
+    1. Check that config.cfg values are converted to their declared types.
+    2. Check that AUTOMATION_<SECTION>_<OPTION> environment variables override config.cfg.
+    3. Check that overlays override environment variables and config.cfg.
+    4. Check that a snapshot restores file, environment and overlay values in a clean process state.
+    """)
+@pytest.mark.framework
+class TestBaseConfig(object):
+
+    @pytest.fixture(autouse=True)
+    def config_state(self):
+        state = (BaseConfig._raw, dict(BaseConfig._overlays), dict(BaseConfig._resolved))
+        yield
+        BaseConfig._raw, BaseConfig._overlays, BaseConfig._resolved = state
+
+    @staticmethod
+    def reload():
+        BaseConfig._raw = None
+        BaseConfig._resolved = {}
+
+    @automation_logger(logger)
+    def test_typed_values(self):
+        allure.step("Verify typed conversion of config.cfg values.")
+        parser = BaseConfig.load_parser()
+        assert BaseConfig.UI_DELAY == float(parser.get("ARGS", "ui_delay"))
+        assert isinstance(BaseConfig.UI_DELAY, float)
+        assert isinstance(BaseConfig.POOL_SIZE, int)
+        assert isinstance(BaseConfig.PAGE_MAXIMIZE, bool)
+        assert BaseConfig.API_RETRY_STATUSES == [int(status) for status in
+                                                 parser.get("API", "retry_statuses").split(",")]
+        assert BaseConfig.SERVER_BROWSERS and all(isinstance(name, str) for name in BaseConfig.SERVER_BROWSERS)
+
+        logger.info(F"============ TEST CASE {test_case} / 1 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_environment_override(self, monkeypatch):
+        allure.step("Verify environment variables override config.cfg.")
+        monkeypatch.setenv("AUTOMATION_ARGS_UI_DELAY", "7.5")
+        monkeypatch.setenv("AUTOMATION_PAGE_MAXIMIZE", "off")
+        self.reload()
+        assert BaseConfig.UI_DELAY == 7.5
+        assert BaseConfig.PAGE_MAXIMIZE is False
+        monkeypatch.setenv("AUTOMATION_PAGE_MAXIMIZE", "maybe")
+        self.reload()
+        with pytest.raises(ValueError):
+            BaseConfig.PAGE_MAXIMIZE
+
+        logger.info(F"============ TEST CASE {test_case} / 2 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_overlay_precedence(self, monkeypatch):
+        allure.step("Verify overlays override environment variables.")
+        monkeypatch.setenv("AUTOMATION_ARGS_UI_DELAY", "7.5")
+        self.reload()
+        assert BaseConfig.UI_DELAY == 7.5
+        BaseConfig.overlay(UI_DELAY=1.25)
+        assert BaseConfig.UI_DELAY == 1.25
+        with pytest.raises(AttributeError):
+            BaseConfig.overlay(NO_SUCH_OPTION=1)
+
+        logger.info(F"============ TEST CASE {test_case} / 3 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_snapshot_round_trip(self, monkeypatch):
+        allure.step("Verify snapshot carries environment and overlay values.")
+        monkeypatch.setenv("AUTOMATION_POOL_POOL_SIZE", "5")
+        self.reload()
+        BaseConfig.overlay(UI_DELAY=1.25)
+        snapshot = json.loads(json.dumps(BaseConfig.snapshot()))
+        monkeypatch.delenv("AUTOMATION_POOL_POOL_SIZE")
+        BaseConfig._overlays = {}
+        self.reload()
+        assert BaseConfig.POOL_SIZE == BaseConfig.load_parser().getint("POOL", "pool_size")
+        BaseConfig.load_snapshot(snapshot)
+        assert BaseConfig.POOL_SIZE == 5
+        assert BaseConfig.UI_DELAY == 1.25
+        assert BaseConfig.BASE_URL == BaseConfig.load_parser().get("BASE_URL", "base_url")
+
+        logger.info(F"============ TEST CASE {test_case} / 4 PASSED ===========")
@@ -0,0 +1,146 @@
+import threading
+import allure
+import pytest
+from selenium.common.exceptions import WebDriverException
+from base.automation_error import AutomationError
+from base.drivers.driver_pool import DriverPool
+from base.logger import automation_logger, logger
+
+test_case = "TestDriverPool"
+
+
+class FakeSwitchTo(object):
+
+    def window(self, handle):
+        pass
+
+
+class FakeDriver(object):
+
+    def __init__(self, browser_name):
+        self.browser_name = browser_name
+        self.alive = True
+        self.quit_calls = 0
+        self.switch_to = FakeSwitchTo()
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise WebDriverException("invalid session id")
+        return ["main"]
+
+    def execute_script(self, script, *args):
+        return None
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class FakeFactory(object):
+
+    def __init__(self):
+        self.drivers = []
+        self._lock = threading.Lock()
+
+    def __call__(self, browser_name, **options):
+        driver = FakeDriver(browser_name)
+        with self._lock:
+            self.drivers.append(driver)
+        return driver
+
+
+@allure.testcase(test_case)
+@allure.severity(allure.severity_level.NORMAL)
+@allure.description("""
+    Framework Test with a stand-in driver factory.
+    1. Check that a released session is lent again.
+    2. Check that a dead idle session is recycled on lease.
+    3. Check that a session is recycled after max_uses leases.
+    4. Check that lease fails after lease_timeout when the pool is full.
+    5. Check that stats stay consistent under concurrent leases and warm up.
+    """)
+@pytest.mark.framework
+class TestDriverPool(object):
+
+    @pytest.fixture()
+    def factory(self):
+        return FakeFactory()
+
+    @automation_logger(logger)
+    def test_lease_release_reuse(self, factory):
+        allure.step("Verify a released session is reused.")
+        pool = DriverPool(factory, size=2, max_uses=10, lease_timeout=1)
+        driver = pool.lease("Chrome")
+        pool.release(driver)
+        assert pool.lease("chrome") is driver
+        assert len(factory.drivers) == 1
+        report = pool.stats.report()
+        assert (report["leases"], report["hits"], report["misses"], report["spawned"]) == (2, 1, 1, 1)
+
+        logger.info(F"============ TEST CASE {test_case} / 1 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_dead_session_recycled(self, factory):
+        allure.step("Verify a dead idle session is replaced by a new one.")
+        pool = DriverPool(factory, size=1, max_uses=10, lease_timeout=1)
+        driver = pool.lease("Chrome")
+        pool.release(driver)
+        driver.alive = False
+        replacement = pool.lease("Chrome")
+        assert replacement is not driver and driver.quit_calls == 1
+        assert pool.stats.recycled == 1 and pool.stats.spawned == 2
+
+        logger.info(F"============ TEST CASE {test_case} / 2 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_recycle_after_max_uses(self, factory):
+        allure.step("Verify a session is quit after max_uses leases.")
+        pool = DriverPool(factory, size=1, max_uses=2, lease_timeout=1)
+        first = pool.lease("Chrome")
+        pool.release(first)
+        assert pool.lease("Chrome") is first
+        pool.release(first)
+        assert first.quit_calls == 1 and pool.stats.recycled == 1
+        assert pool.lease("Chrome") is not first
+
+        logger.info(F"============ TEST CASE {test_case} / 3 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_lease_timeout(self, factory):
+        allure.step("Verify lease gives up when every session is leased.")
+        pool = DriverPool(factory, size=1, max_uses=10, lease_timeout=0.2)
+        pool.lease("Chrome")
+        with pytest.raises(AutomationError):
+            pool.lease("Chrome")
+        assert len(factory.drivers) == 1
+
+        logger.info(F"============ TEST CASE {test_case} / 4 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_concurrent_stats(self, factory):
+        allure.step("Verify stats of concurrent leases add up.")
+        pool = DriverPool(factory, size=4, max_uses=1000, lease_timeout=5)
+        pool.warm_up("Chrome", background=True)
+
+        def worker():
+            for _ in range(25):
+                pool.release(pool.lease("Chrome"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report = pool.shutdown()
+        assert report["leases"] == 200
+        assert report["hits"] + report["misses"] == 200
+        assert report["spawned"] == len(factory.drivers) <= 4
+        assert all(driver.quit_calls == 1 for driver in factory.drivers)
+
+        logger.info(F"============ TEST CASE {test_case} / 5 PASSED ===========")
@@ -0,0 +1,95 @@
+import sqlite3
+import allure
+import pytest
+from config_definitions import BaseConfig
+from base.logger import automation_logger, logger
+from base.utils.duration_store import DurationStore
+
+test_case = "TestDurationStore"
+
+
+def result(nodeid, call, outcome="passed", browser=None):
+    return {"nodeid": nodeid, "browser": browser, "outcome": outcome, "setup": 0.0, "call": call, "teardown": 0.0,
+            "worker": None}
+
+
+@allure.testcase(test_case)
+@allure.severity(allure.severity_level.NORMAL)
+@allure.description("""
+    Framework Test against a temporary database.
+    1. Check that a regression needs sigma, min_ratio, min_seconds and min_samples all exceeded.
+    2. Check that runs beyond keep_runs are pruned together with their results.
+    3. Check slowest, fastest and fail-fast ordering.
+    """)
+@pytest.mark.framework
+class TestDurationStore(object):
+
+    @pytest.fixture()
+    def store(self, tmpdir):
+        overlays = dict(BaseConfig._overlays)
+        BaseConfig.overlay(DURATIONS_WINDOW=20, DURATIONS_KEEP_RUNS=200, DURATIONS_MIN_SAMPLES=5,
+                           DURATIONS_SIGMA=3.0, DURATIONS_MIN_RATIO=0.2, DURATIONS_MIN_SECONDS=0.5)
+        yield DurationStore(str(tmpdir.join("durations.sqlite3")))
+        BaseConfig._overlays = overlays
+        BaseConfig._resolved = {}
+
+    @automation_logger(logger)
+    def test_regression_thresholds(self, store):
+        allure.step("Verify every threshold has to be exceeded.")
+        history = {"steady": [1.0, 1.1, 0.9, 1.0, 1.0], "noisy": [1.0, 3.0, 1.0, 3.0, 1.0], "long": [10.0] * 5,
+                   "quick": [0.1] * 5, "young": [1.0] * 4}
+        for run in range(5):
+            store.record_run([result(nodeid, calls[run]) for nodeid, calls in history.items() if run < len(calls)],
+                             started=run)
+        candidates = [
+            result("steady", 2.0),  # regressed
+            result("noisy", 4.0),  # within 3 sigma of a noisy history
+            result("long", 11.0),  # +1s, but under min_ratio of the mean
+            result("quick", 0.9),  # zero stdev, over min_ratio and min_seconds
+            result("young", 10.0),  # under min_samples
+        ]
+        regressions = store.regressions(candidates)
+        assert [regression.nodeid for regression in regressions] == ["steady", "quick"]
+        assert regressions[0].samples == 5 and regressions[0].mean == pytest.approx(1.0)
+        assert not store.regressions([result("steady", 1.4)])  # over sigma and min_ratio, under min_seconds
+        assert not store.regressions([result("steady", 5.0, "failed")])
+
+        logger.info(F"============ TEST CASE {test_case} / 1 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_keep_runs_pruning(self, store):
+        allure.step("Verify old runs are pruned with their results.")
+        BaseConfig.overlay(DURATIONS_KEEP_RUNS=3)
+        run_ids = [store.record_run([result("a", 1.0), result("b", 2.0)], started=run) for run in range(5)]
+        connection = sqlite3.connect(store.db_file)
+        try:
+            runs = [row[0] for row in connection.execute("SELECT id FROM runs ORDER BY id")]
+            result_runs = {row[0] for row in connection.execute("SELECT run_id FROM results")}
+            results = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        finally:
+            connection.close()
+        assert runs == run_ids[-3:]
+        assert result_runs == set(run_ids[-3:]) and results == 6
+        assert store.stats()["a"].samples == 3
+
+        logger.info(F"============ TEST CASE {test_case} / 2 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_ordering(self, store):
+        allure.step("Verify duration and fail-fast ordering.")
+        for run in range(4):
+            store.record_run([result("slow", 5.0), result("quick", 0.1),
+                              result("flaky", 1.0, "failed" if run % 2 else "passed"),
+                              result("broken", 2.0, "error"), result("skipped", 0.0, "skipped")], started=run)
+        nodeids = ["new", "slow", "skipped", "quick", "flaky", "broken"]
+        default = store.expected_duration("new")
+        assert default == store.expected_duration("skipped") == pytest.approx((5.0 + 0.1 + 1.0 + 2.0) / 4)
+        assert sorted(nodeids, key=store.sort_key("slowest"))[:2] == ["slow", "new"]
+        assert sorted(nodeids, key=store.sort_key("fastest"))[:2] == ["quick", "flaky"]
+        assert sorted(nodeids, key=store.sort_key("fail-fast")) == ["broken", "flaky", "quick", "new", "skipped",
+                                                                    "slow"]
+        assert sorted(nodeids, key=store.sort_key("none")) == nodeids
+        with pytest.raises(ValueError):
+            store.sort_key("random")
+
+        logger.info(F"============ TEST CASE {test_case} / 3 PASSED ===========")
@@ -0,0 +1,135 @@
+import allure
+import pytest
+from base.instruments.browser import Browser, FIND_MANY_SCRIPT, SNAPSHOT_SCRIPT
+from base.instruments.locator import Locator, LocatorTemplate
+from base.logger import automation_logger, logger
+
+test_case = "TestFindMany"
+
+BOARD_CELL = LocatorTemplate("//*[@class='board-row'][{0}]/button[{1}]", name="board cell")
+
+
+class FakeElement(object):
+
+    def __init__(self, text, visible=True, **attributes):
+        self.text = text
+        self.visible = visible
+        self.attributes = attributes
+
+
+class FakeDriver(object):
+    """
+    Stand-in driver with a page of elements by their [kind, value] script locator, records every script call.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.scripts = []
+        self.lookups = 0
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        found = {name: self.page.get(tuple(pair)) for name, pair in args[0].items()}
+        if script == FIND_MANY_SCRIPT:
+            return found
+        return {name: None if element is None else {
+            "text": element.text, "visible": element.visible, "enabled": True,
+            "attributes": {attribute: element.attributes.get(attribute) for attribute in args[1]}}
+            for name, element in found.items()}
+
+    def find_element(self, by, value):
+        self.lookups += 1
+        return FakeElement("looked up")
+
+
+@allure.testcase(test_case)
+@allure.severity(allure.severity_level.NORMAL)
+@allure.description("""
+    Framework Test with a stand-in driver.
+    1. Check that all cells of a 9 cell board are found in one round trip and remembered by their locators.
+    2. Check that names of elements not found map to None.
+    3. Check that xpath and css expressible locators are translated for the page script.
+    4. Check that snapshot returns text, attributes and visibility of every element in one round trip.
+    """)
+@pytest.mark.framework
+class TestFindMany(object):
+
+    @pytest.fixture()
+    def board(self):
+        cells = {(row, col): FakeElement("") for row in range(1, 4) for col in range(1, 4)}
+        driver = FakeDriver({("xpath", str(BOARD_CELL(*cell))): element for cell, element in cells.items()})
+        return driver, cells
+
+    @automation_logger(logger)
+    def test_board_in_one_round_trip(self, board):
+        allure.step("Verify a 9 cell board is resolved with one script call.")
+        driver, cells = board
+        locators = {"{0}{1}".format(*cell): BOARD_CELL(*cell) for cell in cells}
+        found = Browser.find_many(driver, locators)
+        assert len(driver.scripts) == 1
+        assert driver.scripts[0][0] == FIND_MANY_SCRIPT
+        assert found == {"{0}{1}".format(*cell): element for cell, element in cells.items()}
+        assert Browser.find_element(driver, BOARD_CELL(2, 2)) is cells[(2, 2)]
+        assert driver.lookups == 0
+
+        logger.info(F"============ TEST CASE {test_case} / 1 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_missing_elements(self, board):
+        allure.step("Verify names of missing elements map to None.")
+        driver, cells = board
+        found = Browser.find_many(driver, {"11": BOARD_CELL(1, 1), "44": BOARD_CELL(4, 4),
+                                           "status": "//*[@class='status']"})
+        assert found == {"11": cells[(1, 1)], "44": None, "status": None}
+        assert len(driver.scripts) == 1
+
+        logger.info(F"============ TEST CASE {test_case} / 2 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_locator_translation(self):
+        allure.step("Verify xpath and css locators are translated to script pairs.")
+        driver = FakeDriver({})
+        Browser.find_many(driver, {
+            "xpath": "//button",
+            "locator": Locator("//div", name="div"),
+            "id": ("id", "1st:cell"),
+            "quoted id": ("id", "it's"),
+            "id locator": Locator("board", by="id"),
+            "name": ("name", "player"),
+            "class": ("class_name", "square"),
+            "tag": ("tag name", "button"),
+            "css": ("css_selector", "div.game > button"),
+        })
+        assert driver.scripts[0][1][0] == {
+            "xpath": ["xpath", "//button"],
+            "locator": ["xpath", "//div"],
+            "id": ["css", "[id='1st:cell']"],
+            "quoted id": ["css", "[id='it\\'s']"],
+            "id locator": ["css", "[id='board']"],
+            "name": ["css", "[name='player']"],
+            "class": ["css", ".square"],
+            "tag": ["css", "button"],
+            "css": ["css", "div.game > button"],
+        }
+        with pytest.raises(ValueError):
+            Browser.find_many(driver, {"link": ("link_text", "Home")})
+        assert len(driver.scripts) == 1
+
+        logger.info(F"============ TEST CASE {test_case} / 3 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_snapshot(self):
+        allure.step("Verify snapshot reads text, attributes and visibility.")
+        driver = FakeDriver({("xpath", "//*[@class='status']"): FakeElement("Next player: X"),
+                             ("css", "[id='hint']"): FakeElement("", visible=False, title="hint", role=None)})
+        state = Browser.snapshot(driver, {"status": "//*[@class='status']", "hint": ("id", "hint"),
+                                          "missing": ("css_selector", ".missing")}, attributes=("title", "role"))
+        assert len(driver.scripts) == 1
+        assert driver.scripts[0][0] == SNAPSHOT_SCRIPT
+        assert driver.scripts[0][1][1] == ["title", "role"]
+        assert state["status"]["text"] == "Next player: X" and state["status"]["visible"]
+        assert state["hint"]["attributes"] == {"title": "hint", "role": None}
+        assert not state["hint"]["visible"]
+        assert state["missing"] is None
+
+        logger.info(F"============ TEST CASE {test_case} / 4 PASSED ===========")
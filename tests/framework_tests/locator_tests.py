@@ -0,0 +1,80 @@
+import allure
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from base.instruments.browser import Browser
+from base.instruments.locator import Locator
+from base.logger import automation_logger, logger
+
+test_case = "TestLocator"
+
+
+class FakeElement(object):
+
+    def __init__(self, text):
+        self.text = text
+        self.stale = False
+
+    def get_attribute(self, attribute):
+        if self.stale:
+            raise StaleElementReferenceException("element is not attached to the page document")
+        return self.text
+
+
+class FakeDriver(object):
+
+    def __init__(self):
+        self.lookups = 0
+
+    def find_element(self, by, value):
+        self.lookups += 1
+        return FakeElement("render {0}".format(self.lookups))
+
+
+@allure.testcase(test_case)
+@allure.severity(allure.severity_level.NORMAL)
+@allure.description("""
+    Framework Test with a stand-in driver.
+    1. Check that the element of a Locator is looked up once per page state.
+    2. Check that a remembered element that turned stale is looked up again.
+    3. Check that navigation forgets remembered elements.
+    """)
+@pytest.mark.framework
+class TestLocator(object):
+
+    @pytest.fixture()
+    def driver(self):
+        return FakeDriver()
+
+    @automation_logger(logger)
+    def test_memoized_lookup(self, driver):
+        allure.step("Verify repeated lookups do not reach the driver.")
+        locator = Locator("//button", name="button")
+        first = Browser.find_element(driver, locator)
+        assert Browser.find_element(driver, locator) is first
+        assert Browser.get_attribute_from_locator(driver, locator, "innerHTML") == "render 1"
+        assert driver.lookups == 1
+
+        logger.info(F"============ TEST CASE {test_case} / 1 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_stale_element_looked_up_again(self, driver):
+        allure.step("Verify a stale remembered element is replaced by a new lookup.")
+        locator = Locator("//button", name="button")
+        Browser.find_element(driver, locator).stale = True
+        assert Browser.get_attribute_from_locator(driver, locator, "innerHTML") == "render 2"
+        assert driver.lookups == 2
+        assert Browser.find_element(driver, locator).text == "render 2"
+        assert driver.lookups == 2
+
+        logger.info(F"============ TEST CASE {test_case} / 2 PASSED ===========")
+
+    @automation_logger(logger)
+    def test_navigation_forgets(self, driver):
+        allure.step("Verify navigation invalidates remembered elements.")
+        locator = Locator("//button", name="button")
+        first = Browser.find_element(driver, locator)
+        Locator.navigated(driver)
+        assert Browser.find_element(driver, locator) is not first
+        assert driver.lookups == 2
+
+        logger.info(F"============ TEST CASE {test_case} / 3 PASSED ===========")
@@ -1,23 +1,90 @@
 from config_definitions import BaseConfig
+from base.automation_error import AutomationError
 from base.instruments.browser import Browser
 from base.logger import automation_logger, logger
 from tests.ui_tests.ui_tests_base.locators import base_page_locators
 
+# Reads cell texts of every board row and the status line in one call.
+BOARD_STATE_SCRIPT = """
+function all(xpath, context) {
+    var found = document.evaluate(xpath, context || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < found.snapshotLength; i++) { nodes.push(found.snapshotItem(i)); }
+    return nodes;
+}
+var board = all(arguments[0]).map(function (row) {
+    return all('./button', row).map(function (cell) { return cell.textContent.trim(); });
+});
+var status = all(arguments[1]);
+return {board: board, status: status.length ? status[0].textContent.trim() : null};
+"""
+
+WINNING_LINES = [[(row, 0), (row, 1), (row, 2)] for row in range(3)] + \
+                [[(0, col), (1, col), (2, col)] for col in range(3)] + \
+                [[(0, 0), (1, 1), (2, 2)], [(0, 2), (1, 1), (2, 0)]]
+
 
 class BasePage(Browser):
 
     def __init__(self):
         super(Browser, self).__init__()
         self.base_url = BaseConfig.BASE_URL
-        self.ui_delay = float(BaseConfig.UI_DELAY)
+        self.ui_delay = BaseConfig.UI_DELAY
         self.locators = base_page_locators
+        self.readiness = BaseConfig.PAGE_READINESS
 
     @automation_logger(logger)
     def open_base_page(self, driver):
         try:
-            self.go_to_url(driver, self.base_url)
-            return self.wait_url_contains(driver, self.base_url, self.ui_delay)
+            ready = self.go_to_url(driver, self.base_url, self.readiness)
+            return ready and self.base_url in self.get_cur_url(driver)
         except Exception as e:
             logger.error("{0} open_home_page failed with error: {1}".format(e.__class__.__name__,
                                                                             e.__cause__), e)
             return False
+
+    @automation_logger(logger)
+    def read_board(self, driver):
+        """
+        Read the whole game state with one DOM read.
+        :param driver: web_driver instance.
+        :return: dict with board - 3x3 list of "X", "O" or "" (row by row), status - status line text,
+        next_player - "X", "O" or None, winner - "X", "O" or None.
+        """
+        state = driver.execute_script(BOARD_STATE_SCRIPT, self.locators.BOARD_ROWS, self.locators.STATUS)
+        status = state["status"] or ""
+        prefix, _, player = status.partition(":")
+        player = player.strip() or None
+        state["next_player"] = player if prefix.strip() == "Next player" else None
+        state["winner"] = player if prefix.strip() == "Winner" else self.line_winner(state["board"])
+        return state
+
+    @staticmethod
+    def line_winner(board):
+        """
+        :param board: 3x3 list of cell values.
+        :return: player owning a full row, column or diagonal, None otherwise.
+        """
+        for line in WINNING_LINES:
+            values = {board[row][col] if row < len(board) and col < len(board[row]) else "" for row, col in line}
+            if len(values) == 1 and "" not in values:
+                return values.pop()
+        return None
+
+    @automation_logger(logger)
+    def play_moves(self, driver, moves):
+        """
+        Click board cells in order, all cells resolved in one round trip.
+        :param driver: web_driver instance.
+        :param moves: list of (row, column) pairs counted from 1.
+        :raise AutomationError: if a board cell is not found, before any move is played.
+        """
+        locators = {"{0}{1}".format(*move): self.locators.BOARD_CELL(*move) for move in moves}
+        cells = self.find_many(driver, locators)
+        missing = [move for move in moves if cells.get("{0}{1}".format(*move)) is None]
+        if missing:
+            error = "Board cell {0} not found: {1}".format(missing[0], self.locators.BOARD_CELL(*missing[0]))
+            logger.error(error)
+            raise AutomationError(error)
+        for move in moves:
+            self.click_on_element(cells["{0}{1}".format(*move)])
@@ -1,3 +1,8 @@
-TITLE = "//div[contains(text(),'Next player: X')]"
-NEW_GAME = "//*[@class='button button--new-game']"
-BOARD_ROWS = "//*[@class='board-row']"
+from base.instruments.locator import Locator, LocatorTemplate
+
+TITLE = Locator("//div[contains(text(),'Next player: X')]", name="title")
+NEW_GAME = Locator("//*[@class='button button--new-game']", name="new game")
+BOARD_ROWS = Locator("//*[@class='board-row']", name="board rows")
+BOARD_CELL = LocatorTemplate(BOARD_ROWS + "[{0}]/button[{1}]", name="board cell")
+STATUS = Locator("//div[starts-with(normalize-space(text()),'Next player') or "
+                 "starts-with(normalize-space(text()),'Winner')]", name="status")